@@ -0,0 +1,59 @@
+# benchmarks/bench_config.py
+
+import json
+
+import pytest
+
+from core import api_manager, data_store
+from core.config_store import JsonStore
+from core.exchanges import SUPPORTED_EXCHANGES
+
+SUBACCOUNTS = 1000
+
+
+def _api_keys(count=SUBACCOUNTS):
+    keys = {}
+    for i in range(count):
+        exchange = SUPPORTED_EXCHANGES[i % len(SUPPORTED_EXCHANGES)]
+        keys.setdefault(exchange, {})[f"Sub{i}"] = {"api_key": f"key-{i:064d}", "api_secret": f"secret-{i:064d}"}
+    return keys
+
+
+@pytest.fixture
+def config_dir(workdir):
+    data_store.ensure_config_dir()
+    with open(data_store.API_KEYS_FILE, "w") as f:
+        json.dump(_api_keys(), f, indent=2)
+    return workdir
+
+
+def bench_load_api_keys_cold(qtrade_bench, config_dir):
+    """Parse api_keys.json with 1k subaccounts (what the first load_api_keys() of a run costs)."""
+    def load():
+        return JsonStore(data_store.API_KEYS_FILE).load()
+
+    assert sum(map(len, qtrade_bench(load).values())) == SUBACCOUNTS
+
+
+def bench_load_api_keys_warm(qtrade_bench, config_dir):
+    """Every later load_api_keys() is served from the shared in-memory store."""
+    api_manager.load_api_keys()
+    assert qtrade_bench(api_manager.load_api_keys)
+
+
+def bench_get_api_credentials(qtrade_bench, config_dir):
+    api_manager.load_api_keys()
+    assert qtrade_bench(api_manager.get_api_credentials, "Binance", "Sub2")
+
+
+def bench_update_api_credentials(qtrade_bench, config_dir):
+    """Edit one subaccount; the file write itself is deferred and coalesced."""
+    assert qtrade_bench(api_manager.update_api_credentials, "Binance", "Sub2", " new-key ", " new-secret ") is None
+    assert api_manager.get_api_credentials("Binance", "Sub2")["api_key"] == "new-key"
+
+
+def bench_save_api_keys_to_disk(qtrade_bench, config_dir):
+    """Full write path with 1k subaccounts: serialize, temp file, fsync, rename."""
+    store = JsonStore(data_store.API_KEYS_FILE, write_delay=0)
+    store.load()
+    qtrade_bench(store.save)
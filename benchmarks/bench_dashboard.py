@@ -0,0 +1,110 @@
+# benchmarks/bench_dashboard.py
+
+import random
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from core.columns import BalanceColumns  # noqa: E402
+from core.exchanges import SUPPORTED_EXCHANGES  # noqa: E402
+
+ROWS = 10_000
+ASSETS = ["BTC", "ETH", "SOL", "USDT", "DOGE", "XRP", "ADA", "LINK", "DOT", "AVAX"]
+
+
+def _balances(seed, rows=ROWS):
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        account, asset = divmod(i, len(ASSETS))
+        data.append({
+            "exchange": SUPPORTED_EXCHANGES[account % len(SUPPORTED_EXCHANGES)],
+            "subaccount": f"Sub{account}",
+            "asset": ASSETS[asset],
+            "amount": rng.uniform(0, 5),
+            # A third of the rows are dust so the filter has something to hide
+            "usd_value": rng.uniform(0, 1) if i % 3 == 0 else rng.uniform(1, 50_000),
+        })
+    return BalanceColumns.from_rows(data)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def dashboard(app, workdir):
+    from ui.dashboard import DashboardTab
+
+    # An empty config directory means the initial refresh has no accounts to fetch
+    tab = DashboardTab()
+    tab.resize(1000, 700)
+    tab.show()
+    app.processEvents()
+    yield tab
+    tab.close()
+    tab.deleteLater()
+    app.processEvents()
+
+
+def bench_update_table_initial_load(qtrade_bench, dashboard, app):
+    """10k rows into an empty table."""
+    balances = _balances(1)
+
+    def reset():
+        dashboard.balances = BalanceColumns()
+        dashboard.update_table()
+        dashboard.balances = balances
+        app.processEvents()
+
+    def load():
+        dashboard.update_table()
+        app.processEvents()
+
+    qtrade_bench.pedantic(load, setup=reset, rounds=10)
+    assert dashboard.model.rowCount() == ROWS
+
+
+def bench_update_table_all_values_changed(qtrade_bench, dashboard, app):
+    """Same 10k rows, every value different (a full refresh with moving prices)."""
+    snapshots = [_balances(1), _balances(2)]
+    dashboard.balances = snapshots[0]
+    dashboard.update_table()
+    turn = [0]
+
+    def update():
+        turn[0] ^= 1
+        dashboard.balances = snapshots[turn[0]]
+        dashboard.update_table()
+        app.processEvents()
+
+    qtrade_bench(update)
+    assert dashboard.model.rowCount() == ROWS
+
+
+def bench_update_table_unchanged(qtrade_bench, dashboard, app):
+    """Same 10k rows and values: should cost close to nothing."""
+    dashboard.balances = _balances(1)
+    dashboard.update_table()
+    app.processEvents()
+
+    def update():
+        dashboard.update_table()
+        app.processEvents()
+
+    qtrade_bench(update)
+
+
+def bench_toggle_dust_filter(qtrade_bench, dashboard, app):
+    dashboard.balances = _balances(1)
+    dashboard.update_table()
+
+    def toggle():
+        dashboard.dust_filter.setChecked(not dashboard.dust_filter.isChecked())
+        app.processEvents()
+
+    qtrade_bench(toggle)
@@ -0,0 +1,81 @@
+# benchmarks/bench_price_fetcher.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from core.price_fetcher import COINGECKO_IDS, PriceFetcher
+
+
+class _StubCoinGecko(BaseHTTPRequestHandler):
+    """Answers /api/v3/simple/price like CoinGecko, with a made-up price per coin."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API behind requests' pool
+    disable_nagle_algorithm = True  # Headers and body go out separately; don't measure delayed ACKs
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        ids = query.get("ids", [""])[0].split(",")
+        quotes = query.get("vs_currencies", ["usd"])[0].split(",")
+        body = json.dumps({
+            coin: {quote: 100.0 + len(coin) for quote in quotes} for coin in ids if coin
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubCoinGecko)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/v3"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(stub_server, unlimited_rate_limiter, workdir):
+    fetcher = PriceFetcher(base_url=stub_server, rate_limiter=unlimited_rate_limiter)
+    yield fetcher
+    fetcher.http.close()
+
+
+def bench_get_price_cache_hit(qtrade_bench, fetcher):
+    fetcher.get_price("BTC")
+    assert qtrade_bench(fetcher.get_price, "BTC") > 0
+
+
+def bench_get_price_cache_miss(qtrade_bench, fetcher):
+    def miss():
+        fetcher.cache.clear()
+        return fetcher.get_price("BTC")
+
+    assert qtrade_bench(miss) > 0
+
+
+def bench_get_prices_batch_cache_hit(qtrade_bench, fetcher):
+    bases = list(COINGECKO_IDS)
+    fetcher.get_prices(bases)
+    prices = qtrade_bench(fetcher.get_prices, bases)
+    assert all(prices.values())
+
+
+def bench_get_prices_batch_cache_miss(qtrade_bench, fetcher):
+    bases = list(COINGECKO_IDS)
+
+    def miss():
+        fetcher.cache.clear()
+        return fetcher.get_prices(bases)
+
+    qtrade_bench.extra_info["pairs"] = len(bases)
+    prices = qtrade_bench(miss)
+    assert all(prices.values())
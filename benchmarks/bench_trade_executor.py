@@ -0,0 +1,64 @@
+# benchmarks/bench_trade_executor.py
+
+import pytest
+
+from core.models import TradeRequest
+from core.sim_exchange import SimulatedExchange
+from core.trade_executor import TradeExecutor
+from core.trade_journal import TradeJournal
+
+BUY = TradeRequest("Binance", "Main", "BTC/USDT", "Buy", 0.01, "Market")
+SELL = TradeRequest("Binance", "Main", "BTC/USDT", "Sell", 0.01, "Market")
+
+
+def _executor(workdir, rate_limiter, latency=0.0):
+    exchange = SimulatedExchange("Binance", latency=latency, seed=1)
+    journal = TradeJournal(str(workdir / "trades.db"))
+    return TradeExecutor(journal=journal, rate_limiter=rate_limiter, adapters=lambda name: exchange)
+
+
+@pytest.fixture
+def executor(workdir, unlimited_rate_limiter):
+    executor = _executor(workdir, unlimited_rate_limiter)
+    yield executor
+    executor.shutdown()
+    executor.journal.close()
+
+
+def bench_execute_trade(qtrade_bench, executor):
+    """One synchronous order against a zero-latency simulated exchange: the app's own overhead."""
+    def trade():
+        # Alternate sides so the book and balances stay put
+        return executor.execute_trade(BUY if len(executor.fills) % 2 == 0 else SELL)
+
+    fill = qtrade_bench(trade)
+    assert fill.status == "filled"
+
+
+def bench_execute_and_journal(qtrade_bench, executor):
+    """Order plus its journal record (queued to the SQLite writer thread)."""
+    def trade():
+        return executor._execute_and_record(BUY if len(executor.fills) % 2 == 0 else SELL)
+
+    assert qtrade_bench(trade).status == "filled"
+
+
+@pytest.mark.parametrize("orders", [100])
+def bench_submit_trades_concurrent(qtrade_bench, workdir, unlimited_rate_limiter, orders):
+    """Throughput of the worker pool: 100 orders over 10 subaccounts with 1 ms exchange latency each."""
+    executor = _executor(workdir, unlimited_rate_limiter, latency=0.001)
+    trades = [
+        TradeRequest("Binance", f"Sub{i % 10}", "ETH/USDT", "Buy" if i % 2 else "Sell", 0.1, "Market")
+        for i in range(orders)
+    ]
+
+    def run():
+        return [future.result() for future in executor.submit_trades(trades)]
+
+    qtrade_bench.extra_info["orders"] = orders
+    try:
+        fills = qtrade_bench.pedantic(run, rounds=20)
+    finally:
+        executor.shutdown()
+        executor.journal.close()
+    assert len(fills) == orders
@@ -0,0 +1,83 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files (the newest two in benchmarks/results by default):
+
+    python benchmarks/compare.py [BASELINE.json [CURRENT.json]] [--threshold PERCENT]
+
+Exits with status 1 when a threshold is given and any median got slower by more than it.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def find_latest(results_dir=RESULTS_DIR, count=1):
+    """Return the newest result file (or the newest `count` files, oldest first)."""
+    paths = sorted(glob.glob(os.path.join(results_dir, "*.json")), key=os.path.getmtime)
+    if count == 1:
+        return paths[-1] if paths else None
+    return paths[-count:]
+
+
+def compare(baseline, current):
+    """Return one row per benchmark: name, both medians and the change in percent (positive = slower)."""
+    before = {b["fullname"]: b["stats"] for b in baseline["benchmarks"]}
+    rows = []
+    for bench in current["benchmarks"]:
+        old = before.get(bench["fullname"])
+        new = bench["stats"]["median"]
+        change = None
+        if old is not None and old["median"]:
+            change = (new / old["median"] - 1) * 100
+        rows.append({"name": bench["fullname"], "before": old["median"] if old else None,
+                     "after": new, "change": change})
+    return rows
+
+
+def format_comparison(rows, threshold=None):
+    lines = [f"{'benchmark':<70} {'before':>12} {'after':>12} {'change':>9}"]
+    for row in rows:
+        before = "--" if row["before"] is None else f"{row['before'] * 1e6:,.1f} us"
+        change = "new" if row["change"] is None else f"{row['change']:+.1f}%"
+        flag = ""
+        if threshold is not None and row["change"] is not None and row["change"] > threshold:
+            flag = "  << slower"
+        lines.append(f"{row['name'][-70:]:<70} {before:>12} {row['after'] * 1e6:>9,.1f} us {change:>9}{flag}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("files", nargs="*", help="baseline and current results (default: the newest two)")
+    parser.add_argument("--threshold", type=float, default=None, metavar="PERCENT",
+                        help="exit with status 1 if any median is slower by more than PERCENT")
+    args = parser.parse_args(argv)
+
+    files = args.files
+    if len(files) < 2:
+        latest = find_latest(count=2)
+        files = (files + [p for p in latest if p not in files])[:2] if files else latest
+    if len(files) < 2:
+        print("[Benchmarks] Need two result files to compare.")
+        return 2
+
+    with open(files[0]) as f:
+        baseline = json.load(f)
+    with open(files[1]) as f:
+        current = json.load(f)
+    print(f"{os.path.basename(files[0])} -> {os.path.basename(files[1])}")
+    rows = compare(baseline, current)
+    for line in format_comparison(rows, args.threshold):
+        print(line)
+    if args.threshold is not None and any(r["change"] is not None and r["change"] > args.threshold for r in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# benchmarks/conftest.py
+
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Qt must never try to open a display while benchmarking
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+sys.path.insert(0, os.path.dirname(__file__))
+from compare import compare, find_latest, format_comparison  # noqa: E402
+
+from core.config_store import flush_all  # noqa: E402
+from core.rate_limiter import RateLimiter  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--qtrade-bench-json", default=None,
+                    help="write results here (default: benchmarks/results/<time>_<commit>.json)")
+    group.addoption("--qtrade-bench-max-time", type=float, default=1.0,
+                    help="seconds to spend measuring each benchmark (default 1.0)")
+    group.addoption("--qtrade-bench-compare", default=None, metavar="PATH|latest",
+                    help="compare against an earlier results file, or the newest one in benchmarks/results")
+    group.addoption("--qtrade-bench-fail-threshold", type=float, default=None, metavar="PERCENT",
+                    help="with --qtrade-bench-compare, fail the run if any median got slower by more than PERCENT")
+
+
+class Benchmark:
+    """
+    Times a callable the way pytest-benchmark does: it is first calibrated so one round
+    takes long enough to measure, then run for rounds until max_time is spent. Per-call
+    statistics (seconds) are kept for the JSON report.
+    """
+
+    MIN_ROUND_TIME = 0.005
+    MIN_ROUNDS = 5
+
+    def __init__(self, node, max_time):
+        self.name = node.name
+        self.fullname = node.nodeid
+        self.group = node.module.__name__
+        self.max_time = max_time
+        self.extra_info = {}
+        self.stats = None
+
+    def __call__(self, fn, *args, **kwargs):
+        iterations = self._calibrate(fn, args, kwargs)
+        times = []
+        deadline = time.perf_counter() + self.max_time
+        while len(times) < self.MIN_ROUNDS or time.perf_counter() < deadline:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*args, **kwargs)
+            times.append((time.perf_counter() - start) / iterations)
+        self._finish(times, iterations)
+        return result
+
+    def pedantic(self, fn, args=(), kwargs=None, setup=None, rounds=10, iterations=1):
+        """Fixed rounds; setup() runs untimed before each round (e.g. to reset state)."""
+        kwargs = kwargs or {}
+        times = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*args, **kwargs)
+            times.append((time.perf_counter() - start) / iterations)
+        self._finish(times, iterations)
+        return result
+
+    def _calibrate(self, fn, args, kwargs):
+        iterations = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.MIN_ROUND_TIME or iterations >= 1_000_000:
+                return iterations
+            iterations = max(iterations * 2, int(iterations * self.MIN_ROUND_TIME / max(elapsed, 1e-9)))
+
+    def _finish(self, times, iterations):
+        mean = statistics.fmean(times)
+        self.stats = {
+            "min": min(times),
+            "max": max(times),
+            "mean": mean,
+            "median": statistics.median(times),
+            "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "rounds": len(times),
+            "iterations": iterations,
+            "ops": 1 / mean if mean else math.inf,
+        }
+
+    def to_dict(self):
+        return {"name": self.name, "fullname": self.fullname, "group": self.group,
+                "stats": self.stats, "extra_info": self.extra_info}
+
+
+_results = []
+
+
+# Named apart from pytest-benchmark's `benchmark` fixture and --benchmark-* flags, so
+# having that plugin installed never changes what these benchmarks run.
+@pytest.fixture
+def qtrade_bench(request):
+    bench = Benchmark(request.node, request.config.getoption("--qtrade-bench-max-time"))
+    yield bench
+    if bench.stats is not None:
+        _results.append(bench)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory so config/, data/ and cache/ never touch the real ones."""
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    flush_all()  # Delayed config writes must land here, before the old cwd is restored
+
+
+@pytest.fixture
+def unlimited_rate_limiter():
+    """Measure the code, not the exchanges' published request budgets."""
+    return RateLimiter(limits={}, default_limit=(10 ** 9, 1e9), key_limit=None)
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=BENCH_DIR, capture_output=True, text=True,
+                              timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def _report(now):
+    return {
+        "machine_info": {
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "release": platform.release(),
+            "python_version": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "commit_info": {
+            "id": _git("rev-parse", "HEAD"),
+            "branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        },
+        "datetime": now.isoformat(),
+        "benchmarks": [bench.to_dict() for bench in _results],
+    }
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    config = session.config
+    now = datetime.datetime.now(datetime.timezone.utc)
+    report = _report(now)
+
+    baseline_path = config.getoption("--qtrade-bench-compare")
+    if baseline_path == "latest":
+        baseline_path = find_latest(RESULTS_DIR)
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        config._bench_comparison = (baseline_path, compare(baseline, report))
+
+    path = config.getoption("--qtrade-bench-json")
+    if path is None:
+        commit = report["commit_info"]["id"][:10] or "unknown"
+        suffix = "-dirty" if report["commit_info"]["dirty"] else ""
+        path = os.path.join(RESULTS_DIR, f"{now:%Y%m%d-%H%M%S}_{commit}{suffix}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    config._bench_saved = path
+
+    threshold = config.getoption("--qtrade-bench-fail-threshold")
+    comparison = getattr(config, "_bench_comparison", None)
+    if threshold is not None and comparison is not None:
+        if any(row["change"] is not None and row["change"] > threshold for row in comparison[1]):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("benchmarks (per call)")
+    write(f"{'name':<48} {'median':>12} {'mean':>12} {'stddev':>12} {'ops/s':>14} {'rounds':>7}")
+    for bench in sorted(_results, key=lambda b: b.fullname):
+        s = bench.stats
+        write(f"{bench.name[:48]:<48} {_fmt(s['median']):>12} {_fmt(s['mean']):>12} "
+              f"{_fmt(s['stddev']):>12} {s['ops']:>14,.1f} {s['rounds']:>7}")
+    comparison = getattr(config, "_bench_comparison", None)
+    if comparison is not None:
+        terminalreporter.section(f"compared with {os.path.basename(comparison[0])}")
+        for line in format_comparison(comparison[1], config.getoption("--qtrade-bench-fail-threshold")):
+            write(line)
+    if getattr(config, "_bench_saved", None):
+        write(f"Saved {config._bench_saved}")
+
+
+def _fmt(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds >= 1 / scale:
+            return f"{seconds * scale:.3f} {unit}"
+    return f"{seconds * 1e9:.1f} ns"
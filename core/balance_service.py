@@ -0,0 +1,252 @@
+# core/balance_service.py
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from core.data_store import copy_api_keys
+from core.exchanges import get_adapter
+from core.metrics import get_metrics
+from core.price_fetcher import PriceFetcher
+from core.rate_limiter import PRIORITY_BALANCE, get_rate_limiter
+
+STABLECOINS = {"USD", "USDT", "USDC", "DAI", "FDUSD"}
+
+
+class BalanceBackend:
+    """Source of raw balances for one exchange subaccount."""
+
+    def fetch_balances(self, exchange, subaccount, credentials, timeout=None) -> dict:
+        """
+        Return {asset: amount} for the given subaccount.
+        timeout is how many seconds the caller will still wait; give up (raise) after that.
+        """
+        raise NotImplementedError
+
+
+class FakeBalanceBackend(BalanceBackend):
+    """
+    Offline backend for development and tests.
+    Balances are derived from the exchange/subaccount names, so every run returns the same data,
+    unless explicit balances are given. latency simulates a slow API; failing accounts raise.
+    """
+
+    ASSETS = ["BTC", "ETH", "SOL", "USDT", "DOGE", "XRP", "ADA", "LINK"]
+
+    def __init__(self, balances=None, latency=0.0, failing=()):
+        self.balances = balances or {}
+        self.latency = latency
+        self.failing = set(failing)
+
+    def fetch_balances(self, exchange, subaccount, credentials, timeout=None):
+        if self.latency:
+            latency = self.latency(exchange, subaccount) if callable(self.latency) else self.latency
+            if timeout is not None and latency > timeout:
+                time.sleep(max(0.0, timeout))
+                raise TimeoutError(f"{exchange} ({subaccount}) did not answer within {timeout:.1f}s")
+            time.sleep(latency)
+        if (exchange, subaccount) in self.failing:
+            raise ConnectionError(f"{exchange} ({subaccount}) did not respond")
+        if (exchange, subaccount) in self.balances:
+            return dict(self.balances[(exchange, subaccount)])
+
+        rng = random.Random(f"{exchange}:{subaccount}")
+        assets = rng.sample(self.ASSETS, rng.randint(2, 5))
+        return {asset: round(rng.uniform(0.001, 5.0), 6) for asset in assets}
+
+
+class AdapterBalanceBackend(BalanceBackend):
+    """Reads balances through each exchange's registered ExchangeAdapter."""
+
+    def __init__(self, adapters=None):
+        self.adapters = adapters or get_adapter
+
+    def fetch_balances(self, exchange, subaccount, credentials, timeout=None):
+        return self.adapters(exchange).fetch_balances(subaccount, credentials, timeout=timeout)
+
+
+class BalanceAggregator:
+    """
+    Fans balance requests out to every configured subaccount concurrently and streams
+    each account's rows to on_result as soon as it answers.
+    At most max_per_exchange requests run against the same exchange at once; the rest wait
+    in a per-exchange queue rather than on a pool thread, so one busy exchange never delays
+    the others. Each account is emitted as soon as it answers, then emitted again with values
+    once the price lookup for its assets returns; lookups run on their own pool, are shared by
+    the whole refresh and never ask twice for an asset. Every request and lookup gets the
+    refresh's deadline; accounts that have not answered by then are reported to on_error.
+    """
+
+    def __init__(self, backend=None, price_fetcher=None, max_per_exchange=2, timeout=10.0,
+                 max_workers=16, quote="usd", rate_limiter=None):
+        self.backend = backend or AdapterBalanceBackend()
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        self.max_per_exchange = max_per_exchange
+        self.timeout = timeout
+        self.quote = quote
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="BalanceAggregator")
+        # Price lookups get their own threads so they never queue behind slow accounts
+        self._price_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="BalancePrices")
+        self._running = {}  # exchange -> requests in flight
+        self._waiting = {}  # exchange -> deque of (future, args) not started yet
+        self._slots_lock = threading.Lock()
+
+    def accounts(self):
+        """Return [(exchange, subaccount, credentials)] for everything in api_keys.json."""
+        return [
+            (exchange, subaccount, creds)
+            for exchange, subaccounts in copy_api_keys().items()
+            for subaccount, creds in subaccounts.items()
+        ]
+
+    def refresh(self, accounts=None, on_result=None, on_error=None):
+        """
+        Start a refresh and return a Future that resolves to every row fetched.
+        on_result(exchange, subaccount, rows) and on_error(exchange, subaccount, exc)
+        are called from a background thread as each account finishes.
+        """
+        accounts = self.accounts() if accounts is None else accounts
+        deadline = time.monotonic() + self.timeout
+        futures = {
+            self._submit(exchange, (exchange, subaccount, creds, deadline)): (exchange, subaccount)
+            for exchange, subaccount, creds in accounts
+        }
+        done = Future()
+        threading.Thread(
+            target=self._collect, args=(futures, deadline, on_result, on_error, done),
+            name="BalanceAggregatorCollect", daemon=True,
+        ).start()
+        return done
+
+    def shutdown(self, wait=True):
+        with self._slots_lock:
+            queued = [future for jobs in self._waiting.values() for future, _ in jobs]
+            self._waiting.clear()
+        for future in queued:
+            future.cancel()
+        self._pool.shutdown(wait=wait)
+        self._price_pool.shutdown(wait=wait)
+
+    def _collect(self, futures, deadline, on_result, on_error, done):
+        latest = {}  # (exchange, subaccount) -> (amounts, rows last emitted)
+        prices = {}  # asset -> price, shared by every account in this refresh
+        in_flight = {}  # asset -> price lookup Future
+        lookups = {}  # price lookup Future -> (assets it prices, accounts to re-emit once it returns)
+        pending = set(futures)
+        while pending or lookups:
+            finished, _ = wait(pending | set(lookups), timeout=max(0.0, deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+            if not finished:
+                break
+            for future in finished:
+                if future in lookups:
+                    # Prices are in: re-emit every account that was shown without them
+                    assets, accounts = lookups.pop(future)
+                    self._store_prices(prices, assets, future)
+                    for account in accounts:
+                        self._emit(latest, account, latest[account][0], prices, on_result)
+                    continue
+                pending.discard(future)
+                exchange, subaccount = futures[future]
+                try:
+                    amounts = future.result()
+                except Exception as e:
+                    self._notify(on_error, exchange, subaccount, e)
+                    continue
+                # Show the account right away; unpriced assets count as 0 until their lookup returns
+                self._emit(latest, (exchange, subaccount), amounts, prices, on_result)
+                self._lookup(prices, in_flight, lookups, (exchange, subaccount), amounts, deadline)
+        for future in pending:
+            # Queued requests never start; running ones give up at the same deadline
+            exchange, subaccount = futures[future]
+            self._notify(on_error, exchange, subaccount, TimeoutError(f"No answer within {self.timeout}s"))
+        if lookups:
+            print(f"[BalanceAggregator] Prices not ready within {self.timeout}s; "
+                  f"{sum(len(accounts) for _, accounts in lookups.values())} account(s) keep unpriced values")
+        done.set_result([row for _, rows in latest.values() for row in rows])
+
+    def _emit(self, latest, account, amounts, prices, on_result):
+        rows = self._rows(*account, amounts, prices)
+        latest[account] = (amounts, rows)
+        self._notify(on_result, *account, rows)
+
+    def _lookup(self, prices, in_flight, lookups, account, amounts, deadline):
+        """Look up the account's unpriced assets on the price pool, batched with nothing already in flight."""
+        unpriced = [asset for asset in amounts if asset.upper() not in STABLECOINS and asset not in prices]
+        to_price = [asset for asset in unpriced if asset not in in_flight]
+        if to_price:
+            future = self._price_pool.submit(self.price_fetcher.get_prices, to_price, [self.quote],
+                                             timeout=max(0.0, deadline - time.monotonic()))
+            in_flight.update((asset, future) for asset in to_price)
+            lookups[future] = (to_price, [])
+        for future in {in_flight[asset] for asset in unpriced}:
+            lookups[future][1].append(account)
+
+    def _store_prices(self, prices, assets, future):
+        try:
+            fetched = future.result()
+        except Exception as e:
+            print(f"[BalanceAggregator] Price lookup failed: {e}")
+            fetched = {}
+        prices.update((asset, fetched.get((asset, self.quote), 0.0)) for asset in assets)
+
+    def _fetch_account(self, exchange, subaccount, credentials, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self.rate_limiter.acquire(exchange, key=subaccount, priority=PRIORITY_BALANCE,
+                                                           timeout=remaining):
+            raise TimeoutError(f"No answer within {self.timeout}s")
+        with get_metrics().timer("balance_fetch_seconds", exchange=exchange):
+            return self.backend.fetch_balances(exchange, subaccount, credentials,
+                                               timeout=deadline - time.monotonic())
+
+    def _rows(self, exchange, subaccount, amounts, prices):
+        return [
+            {
+                "exchange": exchange,
+                "subaccount": subaccount,
+                "asset": asset,
+                "amount": amount,
+                "usd_value": amount * (1.0 if asset.upper() in STABLECOINS else prices.get(asset, 0.0)),
+            }
+            for asset, amount in amounts.items()
+        ]
+
+    # --- Per-exchange concurrency ----------------------------------------
+
+    def _submit(self, exchange, args):
+        future = Future()
+        with self._slots_lock:
+            if self._running.get(exchange, 0) >= self.max_per_exchange:
+                self._waiting.setdefault(exchange, deque()).append((future, args))
+                return future
+            self._running[exchange] = self._running.get(exchange, 0) + 1
+        self._pool.submit(self._run, exchange, future, args)
+        return future
+
+    def _run(self, exchange, future, args):
+        # Work through the exchange's queue on this thread while there is any; the slot stays taken
+        while future is not None:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._fetch_account(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+            with self._slots_lock:
+                queue = self._waiting.get(exchange)
+                if queue:
+                    future, args = queue.popleft()
+                else:
+                    self._running[exchange] -= 1
+                    future = None
+
+    @staticmethod
+    def _notify(callback, *args):
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"[BalanceAggregator] Callback failed: {e}")
@@ -0,0 +1,88 @@
+# core/basket.py
+
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.models import Fill, TradeRequest
+from core.order_validation import OrderValidationError, get_rule_cache, validate_trade
+
+MIRROR = "mirror"  # Every account trades the full amount
+SPLIT = "split"  # The amount is divided equally between the accounts
+
+
+@dataclass(frozen=True, slots=True)
+class BasketOrder:
+    """One trading intent fanned out over several (exchange, subaccount) accounts."""
+    symbol: str
+    side: str
+    order_type: str
+    amount: float
+    accounts: tuple  # ((exchange, subaccount), ...)
+    price: Optional[float] = None
+    mode: str = MIRROR
+
+
+def expand_basket(basket: BasketOrder, rule_cache=None, reference_price=None):
+    """Turn a basket into validated TradeRequests, one per account, rounded to each exchange's rules."""
+    if not basket.accounts:
+        raise OrderValidationError("Choose at least one account for the basket.")
+    if basket.mode not in (MIRROR, SPLIT):
+        raise OrderValidationError(f"Unknown basket mode {basket.mode!r}.")
+    rule_cache = rule_cache or get_rule_cache()
+    amount = basket.amount if basket.mode == MIRROR else basket.amount / len(basket.accounts)
+
+    trades = []
+    for exchange, subaccount in basket.accounts:
+        trade = TradeRequest(exchange, subaccount, basket.symbol, basket.side, amount, basket.order_type, basket.price)
+        try:
+            trades.append(validate_trade(trade, rule_cache.get(exchange, basket.symbol), reference_price))
+        except OrderValidationError as e:
+            raise OrderValidationError(f"{exchange} ({subaccount}): {e}") from None
+    return trades
+
+
+@dataclass
+class BasketResult:
+    """Fills and failures of every leg of a basket, with aggregate figures."""
+    fills: list = field(default_factory=list)  # [Fill]
+    errors: list = field(default_factory=list)  # [(TradeRequest, Exception)]
+
+    @property
+    def legs(self):
+        return len(self.fills) + len(self.errors)
+
+    @property
+    def filled_amount(self):
+        return math.fsum(f.amount for f in self.fills)
+
+    @property
+    def average_price(self):
+        filled = self.filled_amount
+        if not filled:
+            return None
+        return math.fsum(f.amount * f.price for f in self.fills if f.amount) / filled
+
+    def count(self, status):
+        return sum(1 for f in self.fills if f.status == status)
+
+    def summary(self):
+        """One-line description, e.g. "0.3 filled @ 60,012 (3/3 filled)"."""
+        parts = []
+        average = self.average_price
+        if average is not None:
+            parts.append(f"{self.filled_amount:g} filled @ {average:,.8g}")
+        counts = [f"{self.count('filled')}/{self.legs} filled"]
+        for status in ("partially_filled", "open", "rejected"):
+            if self.count(status):
+                counts.append(f"{self.count(status)} {status.replace('_', ' ')}")
+        if self.errors:
+            counts.append(f"{len(self.errors)} failed")
+        parts.append(f"({', '.join(counts)})")
+        return " ".join(parts)
+
+    def add(self, fill: Fill = None, trade: TradeRequest = None, error=None):
+        if fill is not None:
+            self.fills.append(fill)
+        else:
+            self.errors.append((trade, error))
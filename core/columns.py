@@ -0,0 +1,184 @@
+# core/columns.py
+
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+
+class BalanceColumns:
+    """
+    Column-oriented balance table.
+    Numbers live in typed arrays (8 bytes per value, no per-row objects) and the
+    repeated exchange/subaccount/asset strings are interned. Filters and totals
+    run as C-level passes over the arrays (map/compress/fsum) instead of Python loops.
+    """
+
+    __slots__ = ("exchange", "subaccount", "asset", "amount", "usd_value", "_index")
+
+    def __init__(self):
+        self.exchange = []
+        self.subaccount = []
+        self.asset = []
+        self.amount = array('d')
+        self.usd_value = array('d')
+        self._index = {}  # (exchange, subaccount, asset) -> row
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from dicts with exchange/subaccount/asset/usd_value (and optionally amount)."""
+        columns = cls()
+        for row in rows:
+            columns.upsert(row["exchange"], row["subaccount"], row["asset"],
+                           row["usd_value"], row.get("amount", 0.0))
+        return columns
+
+    def __len__(self):
+        return len(self.usd_value)
+
+    def __iter__(self):
+        """Yield rows as dicts (for callers that want records rather than columns)."""
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def key(self, row):
+        return (self.exchange[row], self.subaccount[row], self.asset[row])
+
+    def keys(self):
+        return list(self._index)
+
+    def find(self, key):
+        return self._index.get(key)
+
+    def record(self, row):
+        return {
+            "exchange": self.exchange[row],
+            "subaccount": self.subaccount[row],
+            "asset": self.asset[row],
+            "amount": self.amount[row],
+            "usd_value": self.usd_value[row],
+        }
+
+    def upsert(self, exchange, subaccount, asset, usd_value, amount=0.0):
+        """Insert or update a row; returns (row, previous_usd_value or None)."""
+        key = (exchange, subaccount, asset)
+        row = self._index.get(key)
+        if row is not None:
+            previous = self.usd_value[row]
+            self.usd_value[row] = usd_value
+            self.amount[row] = amount
+            return row, previous
+        row = len(self.usd_value)
+        self.exchange.append(sys.intern(exchange))
+        self.subaccount.append(sys.intern(subaccount))
+        self.asset.append(sys.intern(asset))
+        self.amount.append(amount)
+        self.usd_value.append(usd_value)
+        self._index[key] = row
+        return row, None
+
+    def remove_rows(self, rows):
+        """Drop the given row numbers; later rows shift up."""
+        drop = set(rows)
+        if not drop:
+            return
+        keep = bytes(i not in drop for i in range(len(self)))
+        self.exchange = list(compress(self.exchange, keep))
+        self.subaccount = list(compress(self.subaccount, keep))
+        self.asset = list(compress(self.asset, keep))
+        self.amount = array('d', compress(self.amount, keep))
+        self.usd_value = array('d', compress(self.usd_value, keep))
+        self._index = {self.key(i): i for i in range(len(self))}
+
+    def mask_at_least(self, threshold):
+        """Return a bytes mask with 1 for every row whose USD value is >= threshold."""
+        return bytes(map(float(threshold).__le__, self.usd_value))
+
+    def total(self, min_value=None):
+        """Sum of USD values, optionally only over rows worth at least min_value."""
+        if min_value is None:
+            return math.fsum(self.usd_value)
+        return math.fsum(compress(self.usd_value, self.mask_at_least(min_value)))
+
+    def select(self, mask):
+        """Yield row dicts for rows where mask is truthy."""
+        for row in compress(range(len(self)), mask):
+            yield self.record(row)
+
+    def accounts_mask(self, accounts):
+        """Return a bytes mask with 1 for rows belonging to any (exchange, subaccount) in accounts."""
+        accounts = set(accounts)
+        return bytes(map(accounts.__contains__, zip(self.exchange, self.subaccount)))
+
+
+class TickSeries:
+    """
+    Append-only price ticks for one symbol, stored as two parallel double arrays.
+    Keeps at most maxlen ticks; old ones are trimmed in chunks so appends stay O(1) amortized.
+    """
+
+    __slots__ = ("timestamps", "prices", "maxlen")
+
+    def __init__(self, maxlen=None):
+        self.timestamps = array('d')
+        self.prices = array('d')
+        self.maxlen = maxlen
+
+    def __len__(self):
+        return len(self.prices)
+
+    def append(self, timestamp, price):
+        self.timestamps.append(timestamp)
+        self.prices.append(price)
+        if self.maxlen and len(self.prices) >= 2 * self.maxlen:
+            del self.timestamps[:-self.maxlen]
+            del self.prices[:-self.maxlen]
+
+    def last(self):
+        if not self.prices:
+            return None
+        return self.timestamps[-1], self.prices[-1]
+
+    def window(self, start=None, end=None):
+        """Return (timestamps, prices) arrays for ticks with start <= timestamp <= end."""
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+        return self.timestamps[lo:hi], self.prices[lo:hi]
+
+    def stats(self, start=None, end=None):
+        """Return {"open", "high", "low", "close", "count"} for a time window, or None if empty."""
+        _, prices = self.window(start, end)
+        if not prices:
+            return None
+        return {"open": prices[0], "high": max(prices), "low": min(prices), "close": prices[-1], "count": len(prices)}
+
+
+SIDE_CODES = {"Buy": 1, "Sell": -1}
+
+
+class FillSeries:
+    """Columnar fill history: timestamps, prices and signed amounts in arrays, symbols interned."""
+
+    __slots__ = ("timestamps", "prices", "amounts", "symbols", "accounts")
+
+    def __init__(self):
+        self.timestamps = array('d')
+        self.prices = array('d')
+        self.amounts = array('d')  # Positive for buys, negative for sells
+        self.symbols = []
+        self.accounts = []  # (exchange, subaccount)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, fill):
+        self.timestamps.append(fill.timestamp)
+        self.prices.append(fill.price if fill.price is not None else math.nan)
+        self.amounts.append(SIDE_CODES.get(fill.side, 0) * fill.amount)
+        self.symbols.append(sys.intern(fill.symbol))
+        self.accounts.append((sys.intern(fill.exchange), sys.intern(fill.subaccount)))
+
+    def net_position(self, symbol):
+        """Signed sum of filled amounts for a symbol."""
+        return math.fsum(compress(self.amounts, map(symbol.__eq__, self.symbols)))
@@ -0,0 +1,135 @@
+# core/config_store.py
+
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+class JsonStore:
+    """
+    In-memory view of one JSON config file.
+    The file is parsed once; load() hands out the same live dict to every caller, which is
+    read-only outside edit(): changes are made inside edit() (or passed to save()) under the
+    store lock, and threads other than the GUI thread read through snapshot().
+    Saving only marks the store dirty; the file is serialized and written once by flush()
+    on a timer thread after a short delay, so a burst of saves costs one write. Writes go to
+    a temp file that is then renamed over the original, so a crash never leaves a truncated
+    file behind.
+    """
+
+    def __init__(self, path, indent=2, write_delay=0.5):
+        self.path = path
+        self.indent = indent
+        self.write_delay = write_delay
+        self._data = None
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()  # Keeps writes in the order they were serialized
+
+    def load(self):
+        with self._lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def snapshot(self, *keys):
+        """Deep copy of the data (or of the value under the nested keys; None if missing), taken under the lock."""
+        with self._lock:
+            value = self.load()
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            return copy.deepcopy(value)
+
+    @contextmanager
+    def edit(self):
+        """Hold the store lock while changing the live dict, then save it."""
+        with self._lock:
+            yield self.load()
+        self.save()
+
+    def reload(self):
+        """Drop the in-memory copy and parse the file again."""
+        self.flush()
+        with self._lock:
+            self._data = self._read()
+            return self._data
+
+    def save(self, data=None):
+        """Persist the store; passing a dict replaces the stored contents with it."""
+        with self._lock:
+            if data is not None and data is not self._data:
+                self.load()
+                self._data.clear()
+                self._data.update(data)
+            self._dirty = True
+            if self.write_delay > 0 and self._timer is None:
+                self._timer = threading.Timer(self.write_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if self.write_delay <= 0:
+            self.flush()
+
+    def flush(self):
+        """Write the data now if it changed since the last write. Never call it holding the store lock."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                payload = json.dumps(self._data, indent=self.indent)
+            self._write(payload)
+
+    def _read(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[ConfigStore] Failed to read {self.path}: {e}")
+        return {}
+
+    def _write(self, payload):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ConfigStore] Failed to write {self.path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, indent=2):
+    """Return the process-wide store for a config file."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = JsonStore(path, indent=indent)
+        return _stores[key]
+
+
+def flush_all():
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+atexit.register(flush_all)
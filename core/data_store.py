@@ -1,6 +1,7 @@
-import json
 import os
 
+from core.config_store import get_store
+
 CONFIG_DIR = "config"
 USER_PREFS_FILE = os.path.join(CONFIG_DIR, "user_prefs.json")
 API_KEYS_FILE = os.path.join(CONFIG_DIR, "api_keys.json")
@@ -8,29 +9,26 @@ API_KEYS_FILE = os.path.join(CONFIG_DIR, "api_keys.json")
 def ensure_config_dir():
     os.makedirs(CONFIG_DIR, exist_ok=True)
 
+# Both files are loaded once and shared process-wide; the dicts returned here are live and
+# only read on the GUI thread. API keys are changed through api_manager (edit_api_keys holds
+# the store lock) and worker threads read copies through copy_api_keys.
 def load_user_prefs():
-    ensure_config_dir()
-    if os.path.exists(USER_PREFS_FILE):
-        with open(USER_PREFS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    return get_store(USER_PREFS_FILE).load()
 
-def save_user_prefs(prefs):
-    ensure_config_dir()
-    with open(USER_PREFS_FILE, 'w') as f:
-        json.dump(prefs, f, indent=4)
+def save_user_prefs(prefs=None):
+    get_store(USER_PREFS_FILE).save(prefs)
 
 def load_api_keys():
-    ensure_config_dir()
-    if os.path.exists(API_KEYS_FILE):
-        with open(API_KEYS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_api_keys(keys):
-    ensure_config_dir()
-    with open(API_KEYS_FILE, 'w') as f:
-        json.dump(keys, f, indent=4)
+    return get_store(API_KEYS_FILE).load()
+
+def save_api_keys(keys=None):
+    get_store(API_KEYS_FILE).save(keys)
+
+def edit_api_keys():
+    return get_store(API_KEYS_FILE).edit()
+
+def copy_api_keys(*keys):
+    return get_store(API_KEYS_FILE).snapshot(*keys)
 
 # ✅ Add this missing function
 def load_enabled_exchanges():
@@ -0,0 +1,88 @@
+# core/exchanges.py
+
+import threading
+
+from core.models import Fill, TradeRequest
+
+SUPPORTED_EXCHANGES = [
+    "Bybit", "Kraken", "Binance", "KuCoin", "Coinbase", "MEXC",
+    "Bitget", "Crypto.com", "Hyperliquid"
+]
+
+
+class ExchangeAdapter:
+    """
+    Everything the app needs from one exchange.
+    Calls are blocking and are made from worker threads (TradeExecutor, BalanceAggregator),
+    never from the GUI thread.
+    """
+
+    name = None
+    supports_batch = False  # True when place_orders() maps to a native batch endpoint
+
+    def place_order(self, trade: TradeRequest, credentials=None) -> Fill:
+        """Send an order; the returned Fill carries what filled right away and the order id."""
+        raise NotImplementedError
+
+    def place_orders(self, trades, credentials=None):
+        """Send several orders for one subaccount; adapters with a batch endpoint override this."""
+        return [self.place_order(trade, credentials) for trade in trades]
+
+    def cancel_order(self, subaccount, symbol, order_id, credentials=None) -> bool:
+        """Cancel a resting order; returns False if it was already filled or unknown."""
+        raise NotImplementedError
+
+    def fetch_balances(self, subaccount, credentials=None, timeout=None) -> dict:
+        """Return {asset: amount} for a subaccount; give up (raise) after timeout seconds."""
+        raise NotImplementedError
+
+    def load_markets(self):
+        """Return [MarketInfo] for every tradable symbol."""
+        raise NotImplementedError
+
+    def stream(self, symbols, callback):
+        """
+        Push trade prices for symbols as callback(exchange, symbol, price, timestamp).
+        Returns a function that stops the stream.
+        """
+        raise NotImplementedError
+
+
+_factories = {}  # name -> callable(name) -> ExchangeAdapter
+_adapters = {}
+_lock = threading.Lock()
+
+
+def register_adapter(name, factory):
+    """Use factory(name) to build the adapter for an exchange; replaces any earlier registration."""
+    with _lock:
+        _factories[name] = factory
+        _adapters.pop(name, None)
+
+
+def _default_factory(name):
+    # No live REST adapters ship yet; every supported exchange trades against the simulator
+    from core.sim_exchange import SimulatedExchange
+    return SimulatedExchange(name)
+
+
+def is_supported(name):
+    """True if an adapter is registered for the exchange."""
+    with _lock:
+        return name in _factories
+
+
+def get_adapter(name) -> ExchangeAdapter:
+    """Return the process-wide adapter for an exchange, building it on first use."""
+    with _lock:
+        adapter = _adapters.get(name)
+        if adapter is None:
+            factory = _factories.get(name)
+            if factory is None:
+                raise KeyError(f"Unsupported exchange: {name}")
+            adapter = _adapters[name] = factory(name)
+        return adapter
+
+
+for _name in SUPPORTED_EXCHANGES:
+    register_adapter(_name, _default_factory)
@@ -0,0 +1,494 @@
+# core/headless.py
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from core.balance_service import BalanceAggregator
+from core.basket import MIRROR, BasketOrder, expand_basket
+from core.columns import BalanceColumns
+from core.exchanges import is_supported
+from core.log_config import setup_logging, shutdown_logging
+from core.market_cache import get_market_cache
+from core.metrics import get_metrics, start_exporters_from_env
+from core.order_validation import OrderValidationError, build_trade_request, get_rule_cache
+from core.price_feed import PriceFeed
+from core.trade_executor import TradeExecutor
+
+SHUTDOWN_GRACE = 10.0  # seconds in-flight requests get to finish after a shutdown request
+
+
+class RequestError(ValueError):
+    """A request was malformed (missing field, unknown exchange); reported back to the client."""
+
+
+def _fields(request, *names):
+    """Return the named request fields, raising RequestError for the first one missing."""
+    for name in names:
+        if name not in request:
+            raise RequestError(f"Missing field {name!r}.")
+    return [request[name] for name in names] if len(names) > 1 else request[names[0]]
+
+
+def _exchange(name):
+    if not is_supported(name):
+        raise RequestError(f"Unknown exchange {name!r}.")
+    return name
+
+class HeadlessEngine:
+    """
+    The app's core pipeline without Qt: price feed, balance aggregation and the trade executor,
+    driven from an asyncio loop. Requests are JSON objects with an "op" and an optional "id"
+    that is echoed in the reply; handle() returns the reply dict. Blocking work stays on the
+    executors' worker pools and is awaited through their Futures, so slow exchanges never
+    stall other requests.
+    """
+
+    def __init__(self, executor=None, price_feed=None, aggregator=None, rule_cache=None, cache=None):
+        self.executor = executor or TradeExecutor()
+        self.price_feed = price_feed or PriceFeed()
+        self.aggregator = aggregator or BalanceAggregator()
+        self.rule_cache = rule_cache or get_rule_cache()
+        self.cache = cache or get_market_cache()
+        # Start from the last saved snapshot; replies say how old each account's rows are
+        rows, as_of = self.cache.balances()
+        self.balances = BalanceColumns.from_rows(rows)
+        self.as_of = dict(as_of)  # (exchange, subaccount) -> when its rows were fetched
+        self.stale = dict(as_of)  # Accounts whose rows the latest refresh didn't confirm
+        self.refreshed_at = None
+        self.failed_accounts = []
+        self.clients = set()
+        self.stopped = None  # asyncio.Event, created on the running loop
+        self._loop = None
+        self._refreshing = None
+        self._ops = {
+            "ping": self.op_ping,
+            "order": self.op_order,
+            "basket": self.op_basket,
+            "cancel": self.op_cancel,
+            "balances": self.op_balances,
+            "price": self.op_price,
+            "subscribe": self.op_subscribe,
+            "unsubscribe": self.op_unsubscribe,
+            "positions": self.op_positions,
+            "candles": self.op_candles,
+            "metrics": self.op_metrics,
+            "shutdown": self.op_shutdown,
+        }
+
+    # --- Lifecycle -------------------------------------------------------
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        self.price_feed.add_listener(self._on_tick)
+        self.price_feed.start()
+
+    async def stop(self):
+        self.price_feed.remove_listener(self._on_tick)
+        # Joining the feed thread and draining the order pool block; keep the loop free meanwhile.
+        # Balance reads still in flight are simply abandoned.
+        self.aggregator.shutdown(wait=False)
+        await asyncio.to_thread(self.price_feed.stop)
+        await asyncio.to_thread(self.executor.shutdown)
+
+    async def refresh_periodically(self, interval):
+        while not self.stopped.is_set():
+            try:
+                await self.refresh_balances()
+            except Exception as e:
+                print(f"[Headless] Balance refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self.stopped.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh_balances(self):
+        """Refresh every account; concurrent callers share one refresh."""
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._refresh_balances())
+        task = self._refreshing
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and self._refreshing is task:
+                self._refreshing = None
+
+    async def _refresh_balances(self):
+        failed = []
+        rows = await asyncio.wrap_future(self.aggregator.refresh(
+            on_error=lambda ex, sub, e: failed.append((ex, sub, str(e))),
+        ))
+        # Same rule as the dashboard: keep the previous rows of accounts that didn't answer
+        # and keep the time those rows were really fetched
+        now = time.time()
+        accounts = {(ex, sub) for ex, sub, _ in failed}
+        kept = list(self.balances.select(self.balances.accounts_mask(accounts)))
+        self.stale = {(r["exchange"], r["subaccount"]): self.as_of.get((r["exchange"], r["subaccount"]), now)
+                      for r in kept}
+        self.as_of = {(r["exchange"], r["subaccount"]): now for r in rows}
+        self.as_of.update(self.stale)
+        self.balances = BalanceColumns.from_rows(rows + kept)
+        self.refreshed_at = now
+        self.cache.save_balances(self.balances, now, as_of=self.stale)
+        self.failed_accounts = failed
+        self.broadcast({"event": "balances", "total": self.balances.total(), "rows": len(self.balances),
+                        "failed": len(failed)})
+        return self.balances
+
+    # --- Clients ---------------------------------------------------------
+
+    def broadcast(self, message):
+        for client in list(self.clients):
+            client.send(message)
+
+    def _on_tick(self, exchange, symbol, price, timestamp):
+        # Runs on the feed thread
+        self._loop.call_soon_threadsafe(self._publish_tick, exchange, symbol, price, timestamp)
+
+    def _publish_tick(self, exchange, symbol, price, timestamp):
+        key = (exchange, symbol)
+        for client in list(self.clients):
+            if key in client.subscriptions:
+                client.send_tick(key, {"event": "price", "exchange": exchange, "symbol": symbol,
+                                       "price": price, "ts": timestamp})
+
+    async def handle(self, request, client=None):
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Requests must be JSON objects."}
+        reply = {"id": request["id"]} if "id" in request else {}
+        handler = self._ops.get(request.get("op"))
+        if handler is None:
+            reply.update(ok=False, error=f"Unknown op {request.get('op')!r}.")
+            return reply
+        try:
+            result = await handler(request, client)
+        except (OrderValidationError, TypeError, ValueError) as e:
+            reply.update(ok=False, error=str(e))
+        except Exception as e:
+            print(f"[Headless] {request.get('op')} failed: {e}")
+            reply.update(ok=False, error=str(e))
+        else:
+            reply.update(ok=True, **(result or {}))
+        return reply
+
+    # --- Operations ------------------------------------------------------
+
+    async def op_ping(self, request, client):
+        return {"time": time.time()}
+
+    def _reference_price(self, exchange, symbol):
+        latest = self.price_feed.latest(exchange, symbol)
+        return latest[0] if latest else None
+
+    async def op_order(self, request, client):
+        exchange, subaccount, symbol, side, amount = _fields(request, "exchange", "subaccount", "symbol",
+                                                              "side", "amount")
+        _exchange(exchange)
+        order_type = request.get("order_type", "Market")
+        trade = build_trade_request(
+            exchange, subaccount, symbol, side, order_type, amount, request.get("price"),
+            rules=self.rule_cache.get(exchange, symbol),
+            reference_price=self._reference_price(exchange, symbol),
+        )
+        fill = await asyncio.wrap_future(self.executor.submit_trade(trade))
+        return {"fill": fill.to_dict()}
+
+    async def op_basket(self, request, client):
+        accounts, symbol, side, amount = _fields(request, "accounts", "symbol", "side", "amount")
+        basket = BasketOrder(
+            symbol=symbol,
+            side=side,
+            order_type=request.get("order_type", "Market"),
+            amount=float(amount),
+            accounts=tuple((_exchange(ex), sub) for ex, sub in accounts),
+            price=float(request["price"]) if request.get("price") is not None else None,
+            mode=request.get("mode", MIRROR),
+        )
+        exchange = basket.accounts[0][0] if basket.accounts else None
+        trades = expand_basket(basket, self.rule_cache, self._reference_price(exchange, basket.symbol))
+        result = await asyncio.wrap_future(self.executor.submit_basket(trades))
+        return {
+            "summary": result.summary(),
+            "filled_amount": result.filled_amount,
+            "average_price": result.average_price,
+            "fills": [fill.to_dict() for fill in result.fills],
+            "errors": [{"exchange": t.exchange, "subaccount": t.subaccount, "error": str(e)}
+                       for t, e in result.errors],
+        }
+
+    async def op_cancel(self, request, client):
+        exchange, subaccount, symbol, order_id = _fields(request, "exchange", "subaccount", "symbol", "order_id")
+        future = self.executor.cancel_order(_exchange(exchange), subaccount, symbol, order_id)
+        return {"cancelled": await asyncio.wrap_future(future)}
+
+    async def op_balances(self, request, client):
+        """Cached balances; "refresh": true fetches them first. "min_value" hides dust."""
+        if request.get("refresh") or (self.refreshed_at is None and not self.as_of):
+            await self.refresh_balances()
+        min_value = request.get("min_value")
+        balances = self.balances
+        rows = list(balances) if min_value is None else list(balances.select(balances.mask_at_least(min_value)))
+        return {
+            "total": balances.total(min_value),
+            "as_of": min(self.as_of.values(), default=None),
+            "stale": [{"exchange": ex, "subaccount": sub, "as_of": ts} for (ex, sub), ts in sorted(self.stale.items())],
+            "rows": rows,
+            "failed": [{"exchange": ex, "subaccount": sub, "error": error} for ex, sub, error in self.failed_accounts],
+        }
+
+    async def op_price(self, request, client):
+        """Last price; "live" is false when it comes from an earlier run's cache."""
+        known = self.price_feed.last_known(*_fields(request, "exchange", "symbol"))
+        if known is None:
+            return {"price": None, "ts": None, "live": False}
+        return {"price": known[0], "ts": known[1], "live": known[2]}
+
+    async def op_candles(self, request, client):
+        exchange, symbol = _fields(request, "exchange", "symbol")
+        candles = await asyncio.to_thread(self.cache.candles, exchange, symbol, request.get("since"))
+        keys = ("start", "open", "high", "low", "close", "ticks")
+        return {"interval": self.cache.candle_interval, "candles": [dict(zip(keys, c)) for c in candles]}
+
+    async def op_subscribe(self, request, client):
+        exchange, symbol = _fields(request, "exchange", "symbol")
+        if not self.price_feed.subscribe(_exchange(exchange), symbol):
+            raise ValueError(f"No price stream for {exchange}.")
+        if client is not None:
+            client.subscriptions.add((exchange, symbol))
+        return {}
+
+    async def op_unsubscribe(self, request, client):
+        key = tuple(_fields(request, "exchange", "symbol"))
+        if client is not None:
+            client.subscriptions.discard(key)
+        if not any(key in c.subscriptions for c in self.clients):
+            self.price_feed.unsubscribe(*key)
+        return {}
+
+    async def op_positions(self, request, client):
+        fills = self.executor.fills
+        symbols = [request["symbol"]] if request.get("symbol") else sorted(set(fills.symbols))
+        return {"positions": {symbol: fills.net_position(symbol) for symbol in symbols}}
+
+    async def op_metrics(self, request, client):
+        return {"metrics": get_metrics().snapshot()}
+
+    async def op_shutdown(self, request, client):
+        self.stopped.set()
+        return {}
+
+
+class LineClient:
+    """
+    One JSON-lines connection. Replies and events are written as they are produced;
+    price ticks that arrive within the same loop iteration are coalesced to the latest per symbol.
+    """
+
+    def __init__(self, write, drain=None):
+        self.subscriptions = set()
+        self._write = write
+        self._drain = drain
+        self._pending_ticks = {}  # (exchange, symbol) -> latest tick message
+        self._flush_scheduled = False
+        self._tasks = set()
+
+    def send(self, message):
+        try:
+            self._write((json.dumps(message, default=str) + "\n").encode())
+        except (OSError, RuntimeError) as e:
+            print(f"[Headless] Could not write to client: {e}")
+
+    def send_tick(self, key, message):
+        self._pending_ticks[key] = message
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_ticks)
+
+    def _flush_ticks(self):
+        self._flush_scheduled = False
+        ticks, self._pending_ticks = self._pending_ticks, {}
+        for message in ticks.values():
+            self.send(message)
+
+    async def serve(self, engine, lines):
+        """Handle every request from the async line iterator; requests run concurrently."""
+        engine.clients.add(self)
+        try:
+            async for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    self.send({"ok": False, "error": f"Invalid JSON: {e}"})
+                    continue
+                task = asyncio.ensure_future(self._answer(engine, request))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            await self.finish()
+        finally:
+            engine.clients.discard(self)
+            for key in list(self.subscriptions):
+                self.subscriptions.discard(key)
+                if not any(key in c.subscriptions for c in engine.clients):
+                    engine.price_feed.unsubscribe(*key)
+
+    async def finish(self, timeout=None):
+        """Wait for requests already received to be answered."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+    async def _answer(self, engine, request):
+        self.send(await engine.handle(request, self))
+        if self._drain is not None:
+            try:
+                await self._drain()
+            except (ConnectionError, RuntimeError):
+                pass
+
+
+async def _stdin_lines(stream):
+    # A daemon thread reads stdin so plain files, pipes and terminals all work (on Windows too),
+    # and a blocked read never holds up shutdown.
+    loop = asyncio.get_running_loop()
+    lines = asyncio.Queue()
+
+    def read():
+        try:
+            for line in iter(stream.readline, ""):
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            loop.call_soon_threadsafe(lines.put_nowait, None)
+        except RuntimeError:
+            pass  # The loop closed first (shutdown requested)
+
+    threading.Thread(target=read, name="HeadlessStdin", daemon=True).start()
+    while (line := await lines.get()) is not None:
+        yield line
+
+
+async def _stream_lines(reader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        yield line.decode(errors="replace")
+
+
+async def serve_stdio(engine, stdin=None, stdout=None):
+    """Read requests from stdin, write replies and events to stdout; ends at EOF or shutdown."""
+    stdin = stdin or sys.stdin
+    out = stdout or sys.stdout.buffer
+    lock = threading.Lock()
+
+    def write(data):
+        with lock:
+            out.write(data)
+            out.flush()
+
+    client = LineClient(write)
+    session = asyncio.ensure_future(client.serve(engine, _stdin_lines(stdin)))
+    stopped = asyncio.ensure_future(engine.stopped.wait())
+    await asyncio.wait({session, stopped}, return_when=asyncio.FIRST_COMPLETED)
+    stopped.cancel()
+    if not session.done():
+        await client.finish(SHUTDOWN_GRACE)
+        session.cancel()
+
+
+async def serve_unix(engine, path):
+    """Accept any number of JSON-lines clients on a Unix socket until shutdown."""
+    async def on_connect(reader, writer):
+        client = LineClient(writer.write, writer.drain)
+        try:
+            await client.serve(engine, _stream_lines(reader))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(path):
+        os.remove(path)  # Stale socket from an earlier run
+    server = await asyncio.start_unix_server(on_connect, path=path)
+    os.chmod(path, 0o600)  # Orders can be placed through it: owner only
+    print(f"[Headless] Listening on {path}")
+    try:
+        await engine.stopped.wait()
+        await asyncio.gather(*(client.finish(SHUTDOWN_GRACE) for client in list(engine.clients)))
+    finally:
+        server.close()
+        await server.wait_closed()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+async def run(args, engine=None, stdout=None):
+    engine = engine or HeadlessEngine()
+    await engine.start()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, engine.stopped.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+
+    for key in args.subscribe:
+        exchange, _, symbol = key.partition(":")
+        engine.price_feed.subscribe(exchange, symbol)
+    refresher = None
+    if args.balance_interval > 0:
+        refresher = asyncio.ensure_future(engine.refresh_periodically(args.balance_interval))
+
+    try:
+        if args.socket:
+            await serve_unix(engine, args.socket)
+        else:
+            await serve_stdio(engine, stdout=stdout)
+    finally:
+        engine.stopped.set()
+        if refresher is not None:
+            refresher.cancel()
+            await asyncio.gather(refresher, return_exceptions=True)
+        await engine.stop()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="quicktrade --headless",
+        description="Run QuickTrade without the GUI, taking JSON-lines requests on stdin or a Unix socket.",
+    )
+    parser.add_argument("--socket", help="listen on this Unix socket path instead of stdin/stdout")
+    parser.add_argument("--balance-interval", type=float, default=0.0, metavar="SECONDS",
+                        help="refresh balances every SECONDS and push a balances event (0 = only on request)")
+    parser.add_argument("--subscribe", action="append", default=[], metavar="EXCHANGE:SYMBOL",
+                        help="stream a symbol from startup, e.g. Binance:BTC/USDT (repeatable)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for `quicktrade --headless`; argv excludes the program name and the flag."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.socket and not hasattr(asyncio, "start_unix_server"):
+        print("[Headless] Unix sockets are not available on this platform; use stdin instead.")
+        return 2
+    setup_logging()
+    stop_exporters = start_exporters_from_env()
+    stdout = sys.stdout
+    if not args.socket:
+        # stdout carries the protocol; status prints from core modules go to stderr
+        sys.stdout = sys.stderr
+    try:
+        asyncio.run(run(args, stdout=stdout.buffer))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout = stdout
+        stop_exporters()
+        shutdown_logging()
+    return 0
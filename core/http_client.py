@@ -0,0 +1,84 @@
+# core/http_client.py
+
+import threading
+from concurrent.futures import Future
+
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+# 429/418 are not retried here: they reach the caller, which hands Retry-After to RateLimiter.penalize
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Thin wrapper around a pooled requests.Session.
+    Connections are kept alive between calls, every request carries a timeout,
+    and idempotent requests are retried on server errors with exponential backoff,
+    capped at backoff_max seconds between attempts.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=3, backoff_factor=0.5, backoff_max=2.0,
+                 pool_connections=10, pool_maxsize=20, session=None):
+        # requests/urllib3 take tens of milliseconds to import; pay for that on first use, not at startup
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            backoff_max=backoff_max,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=False,  # A throttled caller waits in the rate limiter, not in here
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        return self.session.get(url, params=params, timeout=timeout or self.timeout, **kwargs)
+
+    def get_json(self, url, params=None, timeout=None, **kwargs):
+        response = self.get(url, params=params, timeout=timeout, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent lookups of the same key into one in-flight fetch.
+    A caller claims the keys it needs: keys nobody is fetching become its own
+    to fetch, keys already in flight come back as Futures to wait on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future
+
+    def claim(self, keys):
+        """Return (owned_keys, {key: Future}) for keys this caller must fetch or wait for."""
+        owned, waiting = [], {}
+        with self._lock:
+            for key in keys:
+                future = self._in_flight.get(key)
+                if future is None:
+                    self._in_flight[key] = Future()
+                    owned.append(key)
+                else:
+                    waiting[key] = future
+        return owned, waiting
+
+    def resolve(self, keys, results):
+        """Publish results for owned keys; keys missing from results resolve to None."""
+        with self._lock:
+            futures = [(key, self._in_flight.pop(key, None)) for key in keys]
+        for key, future in futures:
+            if future is not None:
+                future.set_result(results.get(key))
@@ -0,0 +1,122 @@
+# core/log_config.py
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_DIR = os.path.join(os.path.expanduser("~"), "QuickTradeLogs")
+LOG_FILE = "quicktrade.log"
+JSON_LOG_FILE = "quicktrade.jsonl"
+ROOT_LOGGER = "quicktrade"  # Everything the app logs lives under this name; the root logger is left alone
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+def get_logger(name):
+    """Return a logger under the app's namespace, e.g. get_logger("trade") -> "quicktrade.trade"."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, plus any `extra` fields.
+    Extra values with a to_dict() method (e.g. a Fill) are converted here, on the listener thread.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=_json_default)
+
+
+def _json_default(value):
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else str(value)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on the queue as they are. The stock QueueHandler renders msg % args and
+    tracebacks in prepare(), on the calling thread; here that waits for the listener.
+    The queue never leaves the process, so nothing needs to be picklable, but objects passed
+    as log arguments must not be changed after the call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+
+
+def setup_logging(log_dir=LOG_DIR, level=None, json_lines=None, max_bytes=10 * 1024 * 1024,
+                  backup_count=5, rotate_when=None, console=False):
+    """
+    Route the app's loggers through a queue to a background writer thread.
+    Callers only pay for putting a record on the queue; formatting and disk I/O happen
+    on the QueueListener's thread. The file rotates by size (max_bytes), or by time when
+    rotate_when is given (e.g. "midnight"). json_lines switches to one JSON object per line.
+    level and json_lines default to the QUICKTRADE_LOG_LEVEL / QUICKTRADE_LOG_JSON env vars.
+    Safe to call more than once; later calls replace the earlier setup.
+    """
+    global _listener
+    shutdown_logging()
+
+    if level is None:
+        level = os.environ.get("QUICKTRADE_LOG_LEVEL", "INFO").upper()
+    if json_lines is None:
+        json_lines = os.environ.get("QUICKTRADE_LOG_JSON", "") not in ("", "0")
+
+    os.makedirs(log_dir, exist_ok=True)
+    path = os.path.join(log_dir, JSON_LOG_FILE if json_lines else LOG_FILE)
+    if rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding="utf-8", delay=True)
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    formatter = JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    app_logger = logging.getLogger(ROOT_LOGGER)
+    app_logger.setLevel(level)
+    app_logger.propagate = False
+    for handler in list(app_logger.handlers):
+        app_logger.removeHandler(handler)
+    app_logger.addHandler(DeferredQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Stop the writer thread after it has written everything queued so far."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
@@ -0,0 +1,299 @@
+# core/market_cache.py
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_FILE = os.path.join("cache", "market_data.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    source TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    price REAL NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (source, symbol)
+);
+CREATE TABLE IF NOT EXISTS candles (
+    exchange TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    start REAL NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    ticks INTEGER NOT NULL,
+    PRIMARY KEY (exchange, symbol, interval, start)
+);
+CREATE INDEX IF NOT EXISTS candles_start ON candles (start);
+CREATE TABLE IF NOT EXISTS markets (
+    exchange TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    markets TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balances (
+    exchange TEXT NOT NULL,
+    subaccount TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    amount REAL NOT NULL,
+    usd_value REAL NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (exchange, subaccount, asset)
+);
+"""
+
+UPSERT_PRICE = "INSERT OR REPLACE INTO prices (source, symbol, price, ts) VALUES (?, ?, ?, ?)"
+UPSERT_CANDLE = (
+    "INSERT OR REPLACE INTO candles (exchange, symbol, interval, start, open, high, low, close, ticks)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+INSERT_BALANCE = (
+    "INSERT OR REPLACE INTO balances (exchange, subaccount, asset, amount, usd_value, ts)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class MarketDataCache:
+    """
+    Last-known market data on disk, so a restart can show something at once instead of a
+    blank screen and a burst of API calls: prices per (source, symbol), candles built from
+    streamed ticks, market metadata per exchange and the last balance snapshot.
+    Every entry carries the time it was observed; callers decide what is too old to use as
+    fresh. Writes only update memory; a writer thread stores the latest value per key every
+    flush_interval seconds, so a fast tick stream costs one row write per symbol per flush.
+    The database runs in WAL mode, so reads never wait for the writer.
+    """
+
+    def __init__(self, path=CACHE_FILE, flush_interval=2.0, candle_interval=60, max_candles=1440):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.candle_interval = candle_interval  # seconds per candle
+        self.max_candles = max_candles  # per symbol; older candles are pruned
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._read_conn = self._connect()
+        self._read_conn.executescript(SCHEMA)
+        self._read_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._prices = {}  # (source, symbol) -> (price, ts), not yet written
+        self._candles = {}  # (exchange, symbol) -> [start, open, high, low, close, ticks], still forming
+        self._dirty_candles = {}  # (exchange, symbol, start) -> candle row, not yet written
+        self._writes = []  # (sql, [params]) for whole-table replacements
+        self._balances = None  # Latest balance snapshot rows, kept so reads never wait for a write
+        self._balances_dirty = False
+        self._write_lock = threading.Lock()  # One batch at a time, committed in the order taken
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="MarketDataCache", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # It's a cache: losing the last second is fine
+        return conn
+
+    # --- Writing ---------------------------------------------------------
+
+    def put_price(self, source, symbol, price, ts=None):
+        with self._lock:
+            self._prices[(source, symbol)] = (price, time.time() if ts is None else ts)
+
+    def put_prices(self, source, prices, ts=None):
+        """Store {symbol: price} observed at ts (default now)."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            for symbol, price in prices.items():
+                self._prices[(source, symbol)] = (price, ts)
+
+    def record_tick(self, exchange, symbol, price, ts):
+        """Store a streamed trade price and fold it into the symbol's current candle."""
+        start = ts - ts % self.candle_interval
+        key = (exchange, symbol)
+        with self._lock:
+            self._prices[key] = (price, ts)
+            candle = self._candles.get(key)
+            if candle is None or candle[0] != start:
+                if candle is not None:
+                    self._dirty_candles[(exchange, symbol, candle[0])] = candle
+                candle = self._candles[key] = [start, price, price, price, price, 0]
+            candle[2] = max(candle[2], price)
+            candle[3] = min(candle[3], price)
+            candle[4] = price
+            candle[5] += 1
+            self._dirty_candles[(exchange, symbol, start)] = candle
+
+    def save_markets(self, exchange, markets, fetched_at):
+        """Store an exchange's market list (a list of JSON-serializable dicts)."""
+        self._queue_write(("INSERT OR REPLACE INTO markets (exchange, fetched_at, markets) VALUES (?, ?, ?)",
+                           [(exchange, fetched_at, json.dumps(markets))]))
+
+    def save_balances(self, rows, ts=None, as_of=None):
+        """
+        Replace the balance snapshot with rows of exchange/subaccount/asset/amount/usd_value.
+        Rows are stamped with ts (default now), except accounts given their own time in
+        as_of {(exchange, subaccount): ts}, e.g. older rows kept for an account that failed.
+        """
+        ts = time.time() if ts is None else ts
+        as_of = as_of or {}
+        snapshot = [(r["exchange"], r["subaccount"], r["asset"], r.get("amount", 0.0), r["usd_value"],
+                     as_of.get((r["exchange"], r["subaccount"]), ts)) for r in rows]
+        with self._lock:
+            self._balances = snapshot
+            self._balances_dirty = True
+        self._wake.set()
+
+    def _queue_write(self, *writes):
+        # Writes queued together land in the same transaction
+        with self._lock:
+            self._writes.extend(writes)
+        self._wake.set()
+
+    def flush(self):
+        """Write everything pending now (from the calling thread)."""
+        self._write_pending(self._read_conn, self._read_lock)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+
+    def _write_loop(self):
+        conn = self._connect()
+        lock = threading.Lock()
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_pending(conn, lock)
+        self._write_pending(conn, lock)
+        conn.close()
+
+    def _write_pending(self, conn, conn_lock):
+        # Held from taking the batch until it is committed: flush() returns only once everything
+        # queued before it is on disk, and batches never commit out of order.
+        with self._write_lock:
+            self._commit_pending(conn, conn_lock)
+
+    def _commit_pending(self, conn, conn_lock):
+        with self._lock:
+            prices, self._prices = self._prices, {}
+            candles = [(ex, sym, self.candle_interval, *candle)
+                       for (ex, sym, _), candle in self._dirty_candles.items()]
+            self._dirty_candles = {}
+            writes, self._writes = self._writes, []
+            balances = self._balances if self._balances_dirty else None
+            self._balances_dirty = False
+        if balances is not None:
+            writes.append(("DELETE FROM balances", [()]))
+            writes.append((INSERT_BALANCE, balances))
+        if not (prices or candles or writes):
+            return
+        cutoff = time.time() - self.candle_interval * self.max_candles
+        try:
+            with conn_lock, conn:
+                if prices:
+                    conn.executemany(UPSERT_PRICE, [(src, sym, p, ts) for (src, sym), (p, ts) in prices.items()])
+                if candles:
+                    conn.executemany(UPSERT_CANDLE, candles)
+                    conn.execute("DELETE FROM candles WHERE start < ?", (cutoff,))
+                for sql, params in writes:
+                    conn.executemany(sql, params)
+        except sqlite3.Error as e:
+            print(f"[MarketDataCache] Failed to write to {self.path}: {e}")
+
+    # --- Reading ---------------------------------------------------------
+
+    def _query(self, sql, params=()):
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def prices(self, source=None):
+        """Return {(source, symbol): (price, ts)}, including values not written yet."""
+        if source is None:
+            rows = self._query("SELECT source, symbol, price, ts FROM prices")
+        else:
+            rows = self._query("SELECT source, symbol, price, ts FROM prices WHERE source = ?", (source,))
+        result = {(src, sym): (price, ts) for src, sym, price, ts in rows}
+        with self._lock:
+            result.update((k, v) for k, v in self._prices.items() if source is None or k[0] == source)
+        return result
+
+    def price(self, source, symbol):
+        """Return (price, ts) for the last value seen, or None."""
+        with self._lock:
+            pending = self._prices.get((source, symbol))
+        if pending is not None:
+            return pending
+        rows = self._query("SELECT price, ts FROM prices WHERE source = ? AND symbol = ?", (source, symbol))
+        return rows[0] if rows else None
+
+    def candles(self, exchange, symbol, since=None):
+        """Return [(start, open, high, low, close, ticks)] oldest first, including the one still forming."""
+        rows = self._query(
+            "SELECT start, open, high, low, close, ticks FROM candles"
+            " WHERE exchange = ? AND symbol = ? AND interval = ? AND start >= ? ORDER BY start",
+            (exchange, symbol, self.candle_interval, since or 0),
+        )
+        by_start = {row[0]: tuple(row) for row in rows}
+        with self._lock:
+            for (ex, sym, start), candle in self._dirty_candles.items():
+                if ex == exchange and sym == symbol and start >= (since or 0):
+                    by_start[start] = tuple(candle)
+        return [by_start[start] for start in sorted(by_start)]
+
+    def load_markets(self, exchange):
+        """Return (markets, fetched_at) as last written by save_markets(), or None."""
+        rows = self._query("SELECT markets, fetched_at FROM markets WHERE exchange = ?", (exchange,))
+        if not rows:
+            return None
+        try:
+            return json.loads(rows[0][0]), rows[0][1]
+        except ValueError as e:
+            print(f"[MarketDataCache] Ignoring unreadable markets for {exchange}: {e}")
+            return None
+
+    def balances(self):
+        """Return (rows, as_of) of the last balance snapshot, as_of being {(exchange, subaccount): ts}."""
+        with self._lock:
+            rows = self._balances  # Saved by this process, written or not
+        if rows is None:
+            rows = self._query("SELECT exchange, subaccount, asset, amount, usd_value, ts FROM balances")
+        as_of = {}
+        for ex, sub, _, _, _, ts in rows:
+            as_of[(ex, sub)] = min(ts, as_of.get((ex, sub), ts))
+        return ([{"exchange": ex, "subaccount": sub, "asset": asset, "amount": amount, "usd_value": value}
+                 for ex, sub, asset, amount, value, _ in rows], as_of)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_market_cache():
+    """Return the process-wide MarketDataCache; it is flushed and closed at exit."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MarketDataCache()
+            atexit.register(_cache.close)
+        return _cache
+
+
+def format_age(ts, now=None):
+    """Short human description of how old a timestamp is, e.g. "42s ago", "5m ago", "3h ago"."""
+    age = max(0.0, (time.time() if now is None else now) - ts)
+    for limit, unit, size in ((60, "s", 1), (3600, "m", 60), (86400, "h", 3600)):
+        if age < limit:
+            return f"{int(age // size)}{unit} ago"
+    return f"{int(age // 86400)}d ago"
@@ -0,0 +1,286 @@
+# core/market_catalog.py
+
+import threading
+import time
+from bisect import bisect_left
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from core.http_client import HttpClient
+from core.market_cache import get_market_cache
+
+CACHE_MAX_AGE = 24 * 3600  # seconds
+DEFAULT_SYMBOLS = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+
+
+@dataclass
+class MarketInfo:
+    symbol: str  # "BASE/QUOTE"
+    base: str
+    quote: str
+    tick_size: Optional[float] = None
+    lot_size: Optional[float] = None
+    min_notional: Optional[float] = None
+
+
+def make_market(base, quote, tick_size=None, lot_size=None, min_notional=None):
+    """Build a MarketInfo from exchange fields; sizes may be strings, and blanks mean "no rule"."""
+    def number(value):
+        return float(value) if value not in (None, "") else None
+
+    return MarketInfo(f"{base}/{quote}", base, quote, number(tick_size), number(lot_size), number(min_notional))
+
+
+# --- Exchange loaders -------------------------------------------------------
+
+def load_binance(http):
+    data = http.get_json("https://api.binance.com/api/v3/exchangeInfo")
+    markets = []
+    for s in data["symbols"]:
+        if s.get("status") != "TRADING":
+            continue
+        filters = {f["filterType"]: f for f in s.get("filters", [])}
+        notional = filters.get("NOTIONAL") or filters.get("MIN_NOTIONAL") or {}
+        markets.append(make_market(
+            s["baseAsset"], s["quoteAsset"],
+            filters.get("PRICE_FILTER", {}).get("tickSize"),
+            filters.get("LOT_SIZE", {}).get("stepSize"),
+            notional.get("minNotional"),
+        ))
+    return markets
+
+
+def load_bybit(http):
+    data = http.get_json("https://api.bybit.com/v5/market/instruments-info", params={"category": "spot"})
+    return [
+        make_market(
+            s["baseCoin"], s["quoteCoin"],
+            s.get("priceFilter", {}).get("tickSize"),
+            s.get("lotSizeFilter", {}).get("basePrecision"),
+            s.get("lotSizeFilter", {}).get("minOrderAmt"),
+        )
+        for s in data["result"]["list"]
+        if s.get("status") == "Trading"
+    ]
+
+
+KRAKEN_ASSETS = {"XBT": "BTC", "XDG": "DOGE"}
+
+
+def load_kraken(http):
+    data = http.get_json("https://api.kraken.com/0/public/AssetPairs")
+    markets = []
+    for pair in data["result"].values():
+        if "wsname" not in pair or pair.get("status", "online") != "online":
+            continue
+        base, quote = (KRAKEN_ASSETS.get(a, a) for a in pair["wsname"].split("/"))
+        lot = 10 ** -pair["lot_decimals"] if "lot_decimals" in pair else None
+        markets.append(make_market(base, quote, pair.get("tick_size"), lot, pair.get("costmin")))
+    return markets
+
+
+def load_coinbase(http):
+    data = http.get_json("https://api.exchange.coinbase.com/products")
+    return [
+        make_market(p["base_currency"], p["quote_currency"], p.get("quote_increment"),
+                p.get("base_increment"), p.get("min_market_funds"))
+        for p in data
+        if p.get("status") == "online" and not p.get("trading_disabled")
+    ]
+
+
+def load_kucoin(http):
+    data = http.get_json("https://api.kucoin.com/api/v2/symbols")
+    return [
+        make_market(s["baseCurrency"], s["quoteCurrency"], s.get("priceIncrement"),
+                s.get("baseIncrement"), s.get("minFunds"))
+        for s in data["data"]
+        if s.get("enableTrading")
+    ]
+
+
+MARKET_LOADERS = {
+    "Binance": load_binance,
+    "Bybit": load_bybit,
+    "Kraken": load_kraken,
+    "Coinbase": load_coinbase,
+    "KuCoin": load_kucoin,
+}
+
+
+# --- Search index -----------------------------------------------------------
+
+def _normalize(text):
+    return "".join(ch for ch in text.upper() if ch.isalnum())
+
+
+class SymbolIndex:
+    """
+    Incremental-search index over a symbol list.
+    Prefix matches come from a binary search over the sorted normalized symbols;
+    substring and then subsequence ("fuzzy") matches fill up the rest of the results.
+    """
+
+    def __init__(self, symbols):
+        self.entries = sorted((_normalize(symbol), symbol) for symbol in symbols)
+        self.keys = [key for key, _ in self.entries]
+
+    def search(self, text, limit=50):
+        query = _normalize(text)
+        if not query:
+            return [symbol for _, symbol in self.entries[:limit]]
+
+        results = []
+        seen = set()
+        start = bisect_left(self.keys, query)
+        for key, symbol in islice(self.entries, start, None):
+            if not key.startswith(query) or len(results) >= limit:
+                break
+            results.append(symbol)
+            seen.add(symbol)
+
+        if len(results) < limit:
+            for key, symbol in self.entries:
+                if symbol not in seen and query in key:
+                    results.append(symbol)
+                    seen.add(symbol)
+                    if len(results) >= limit:
+                        return results
+
+        if len(results) < limit:
+            for key, symbol in self.entries:
+                if symbol not in seen and self._is_subsequence(query, key):
+                    results.append(symbol)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    @staticmethod
+    def _is_subsequence(query, key):
+        chars = iter(key)
+        return all(ch in chars for ch in query)
+
+
+# --- Catalog ----------------------------------------------------------------
+
+class MarketCatalog:
+    """
+    Per-exchange symbol lists with tick/lot sizes.
+    Reads come from memory, backed by the on-disk MarketDataCache; refresh() re-downloads the
+    list from the exchange and refresh_async() does so on a background thread.
+    """
+
+    def __init__(self, http=None, max_age=CACHE_MAX_AGE, loaders=None, store=None):
+        self._http = http
+        self._store = store
+        self.max_age = max_age
+        self.loaders = MARKET_LOADERS if loaders is None else loaders
+        self._markets = {}  # exchange -> {symbol: MarketInfo}
+        self._indexes = {}
+        self._fetched_at = {}
+        self._refreshing = {}  # exchange -> Future, so concurrent refreshes share one download
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="MarketCatalog")
+
+    @property
+    def http(self):
+        if self._http is None:
+            self._http = HttpClient()
+        return self._http
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_market_cache()
+        return self._store
+
+    def markets(self, exchange):
+        """Return {symbol: MarketInfo}; falls back to the disk cache, then to DEFAULT_SYMBOLS."""
+        markets = self._markets.get(exchange)
+        if markets is None:
+            # Read and index outside the lock so other exchanges' lookups never wait on SQLite
+            built = self._build(*self._read_cache(exchange))
+            with self._lock:
+                if exchange not in self._markets:  # Unless a refresh or another reader got there first
+                    self._install(exchange, *built)
+                markets = self._markets[exchange]
+        return markets
+
+    def symbols(self, exchange):
+        return list(self.markets(exchange))
+
+    def market(self, exchange, symbol):
+        return self.markets(exchange).get(symbol)
+
+    def search(self, exchange, text, limit=50):
+        self.markets(exchange)
+        return self._indexes[exchange].search(text, limit)
+
+    def is_loaded(self, exchange):
+        """True once a real market list (downloaded now or earlier) is known, not just DEFAULT_SYMBOLS."""
+        self.markets(exchange)
+        return self._fetched_at.get(exchange, 0) > 0
+
+    def needs_refresh(self, exchange):
+        self.markets(exchange)
+        return exchange in self.loaders and time.time() - self._fetched_at.get(exchange, 0) > self.max_age
+
+    def refresh(self, exchange):
+        """Download the exchange's market list, update the cache and return the number of markets."""
+        loader = self.loaders.get(exchange)
+        if loader is None:
+            return len(self.markets(exchange))
+        markets = loader(self.http)
+        fetched_at = time.time()
+        built = self._build(markets, fetched_at)
+        with self._lock:
+            self._install(exchange, *built)
+        self._write_cache(exchange, markets, fetched_at)
+        return len(markets)
+
+    def refresh_async(self, exchange):
+        """Refresh on a background thread; returns a Future with the market count."""
+        with self._lock:
+            future = self._refreshing.get(exchange)
+            if future is None or future.done():
+                future = self._pool.submit(self.refresh, exchange)
+                self._refreshing[exchange] = future
+            return future
+
+    @staticmethod
+    def _build(markets, fetched_at):
+        by_symbol = {m.symbol: m for m in sorted(markets, key=lambda m: m.symbol)}
+        return by_symbol, SymbolIndex(by_symbol), fetched_at
+
+    def _install(self, exchange, markets, index, fetched_at):
+        # Markets go in last: readers that find them never look up a missing index
+        self._indexes[exchange] = index
+        self._fetched_at[exchange] = fetched_at
+        self._markets[exchange] = markets
+
+    def _read_cache(self, exchange):
+        cached = self.store.load_markets(exchange)
+        if cached is not None:
+            try:
+                return [MarketInfo(**m) for m in cached[0]], cached[1]
+            except TypeError as e:
+                print(f"[MarketCatalog] Ignoring unreadable cached markets for {exchange}: {e}")
+        return [make_market(*symbol.split("/")) for symbol in DEFAULT_SYMBOLS], 0
+
+    def _write_cache(self, exchange, markets, fetched_at):
+        self.store.save_markets(exchange, [asdict(m) for m in markets], fetched_at)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_market_catalog():
+    """Return the process-wide MarketCatalog."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = MarketCatalog()
+        return _catalog
@@ -0,0 +1,145 @@
+# core/matching_engine.py
+
+import itertools
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class Order:
+    """A resting or incoming order. price is None for market orders."""
+
+    __slots__ = ("order_id", "owner", "side", "price", "amount", "remaining", "seq")
+
+    def __init__(self, order_id, owner, side, price, amount, seq=0):
+        self.order_id = order_id
+        self.owner = owner
+        self.side = side  # "Buy" or "Sell"
+        self.price = price
+        self.amount = amount
+        self.remaining = amount
+        self.seq = seq
+
+
+class Execution:
+    """One match between an incoming (taker) and a resting (maker) order."""
+
+    __slots__ = ("taker", "maker", "price", "amount")
+
+    def __init__(self, taker, maker, price, amount):
+        self.taker = taker
+        self.maker = maker
+        self.price = price
+        self.amount = amount
+
+
+class _Side:
+    """Price levels of one side: sorted prices, each with a FIFO queue of orders."""
+
+    def __init__(self, descending):
+        self.descending = descending  # True for bids
+        self.prices = []  # Always ascending
+        self.levels = {}  # price -> deque[Order]
+
+    def best_price(self):
+        if not self.prices:
+            return None
+        return self.prices[-1] if self.descending else self.prices[0]
+
+    def worst_price(self):
+        if not self.prices:
+            return None
+        return self.prices[0] if self.descending else self.prices[-1]
+
+    def add(self, order):
+        # Orders are keyed by price level: joining an existing level is an O(1) deque append.
+        # Only a new level touches the sorted array, via insort (binary search + list insert,
+        # a memmove that is O(levels) but cheap at any realistic book depth).
+        queue = self.levels.get(order.price)
+        if queue is None:
+            queue = self.levels[order.price] = deque()
+            insort(self.prices, order.price)
+        queue.append(order)
+
+    def remove_level(self, price):
+        del self.levels[price]
+        del self.prices[bisect_left(self.prices, price)]
+
+    def depth(self, n):
+        prices = self.prices[-n:][::-1] if self.descending else self.prices[:n]
+        return [(price, sum(o.remaining for o in self.levels[price])) for price in prices]
+
+    def __len__(self):
+        return len(self.prices)
+
+
+class MatchingEngine:
+    """
+    Price-time-priority order book for one symbol.
+    Incoming orders match against the best opposite levels, oldest order first within a level.
+    Limit orders rest whatever does not fill; market orders are immediate-or-cancel.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = _Side(descending=True)
+        self.asks = _Side(descending=False)
+        self.orders = {}  # order_id -> resting Order
+        self.last_price = None
+        self.lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def submit(self, order):
+        """Match an order and rest any limit remainder; returns the list of Executions."""
+        with self.lock:
+            order.seq = next(self._seq)
+            executions = self._match(order)
+            if order.remaining > 0 and order.price is not None:
+                (self.bids if order.side == "Buy" else self.asks).add(order)
+                self.orders[order.order_id] = order
+            return executions
+
+    def cancel(self, order_id):
+        """Remove a resting order; returns it, or None if it already filled or never rested."""
+        with self.lock:
+            order = self.orders.pop(order_id, None)
+            if order is None:
+                return None
+            side = self.bids if order.side == "Buy" else self.asks
+            queue = side.levels[order.price]
+            queue.remove(order)
+            if not queue:
+                side.remove_level(order.price)
+            return order
+
+    def best_bid(self):
+        return self.bids.best_price()
+
+    def best_ask(self):
+        return self.asks.best_price()
+
+    def depth(self, n=10):
+        with self.lock:
+            return {"bids": self.bids.depth(n), "asks": self.asks.depth(n)}
+
+    def _match(self, order):
+        book = self.asks if order.side == "Buy" else self.bids
+        executions = []
+        while order.remaining > 0 and book.prices:
+            price = book.best_price()
+            if order.price is not None and (price > order.price if order.side == "Buy" else price < order.price):
+                break
+            queue = book.levels[price]
+            while queue and order.remaining > 0:
+                maker = queue[0]
+                amount = min(order.remaining, maker.remaining)
+                order.remaining -= amount
+                maker.remaining -= amount
+                executions.append(Execution(order, maker, price, amount))
+                if maker.remaining <= 0:
+                    queue.popleft()
+                    self.orders.pop(maker.order_id, None)
+            if not queue:
+                book.remove_level(price)
+            self.last_price = price
+        return executions
@@ -0,0 +1,255 @@
+# core/metrics.py
+
+import functools
+import os
+import tempfile
+import threading
+import time
+
+SUB_BUCKET_BITS = 7  # 128 linear sub-buckets per power of two: values are kept within ~1%
+
+
+class Histogram:
+    """
+    HDR-style latency histogram.
+    Values (seconds) are stored as integer microseconds in log-linear buckets, so memory stays
+    small and constant no matter how many samples are recorded, and any percentile can be
+    read back with about 1% relative error.
+    """
+
+    def __init__(self):
+        self.counts = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index(micros):
+        shift = max(0, micros.bit_length() - SUB_BUCKET_BITS)
+        return (shift << SUB_BUCKET_BITS) | (micros >> shift)
+
+    @staticmethod
+    def _value(index):
+        shift = index >> SUB_BUCKET_BITS
+        mantissa = index & ((1 << SUB_BUCKET_BITS) - 1)
+        # Midpoint of the bucket's range
+        return ((mantissa << shift) + ((1 << shift) - 1) / 2) / 1e6
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1e6))
+        index = self._index(micros)
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.min = seconds if self.min is None else min(self.min, seconds)
+            self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, p):
+        """Value below which p percent of the samples fall, or None if nothing was recorded."""
+        return self.percentiles([p])[0]
+
+    def percentiles(self, ps):
+        with self._lock:
+            if not self.count:
+                return [None] * len(ps)
+            buckets = sorted(self.counts.items())
+            count, low, high = self.count, self.min, self.max
+        results = []
+        for p in ps:
+            target = max(1, -(-count * p // 100))  # ceil(count * p / 100)
+            seen = 0
+            for index, bucket_count in buckets:
+                seen += bucket_count
+                if seen >= target:
+                    results.append(min(max(self._value(index), low), high))
+                    break
+        return results
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+            self.count = 0
+            self.total = 0.0
+            self.min = self.max = None
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Named latency histograms, each optionally split by labels (e.g. exchange="Binance").
+    Use timer() as a context manager, timed() as a decorator, or record() for
+    durations measured elsewhere.
+    """
+
+    QUANTILES = (50, 90, 99, 99.9)
+
+    def __init__(self):
+        self._histograms = {}  # (name, ((label, value), ...)) -> Histogram
+        self._lock = threading.Lock()
+
+    def histogram(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        return histogram
+
+    def record(self, name, seconds, **labels):
+        self.histogram(name, **labels).record(seconds)
+
+    def timer(self, name, **labels):
+        return _Timer(self.histogram(name, **labels))
+
+    def timed(self, name, **labels):
+        def decorator(fn):
+            histogram = self.histogram(name, **labels)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with _Timer(histogram):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+    def snapshot(self):
+        """Return [{"name", "labels", "count", "mean", "max", "p50", "p90", "p99", "p99.9"}], sorted by name."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+        rows = []
+        for (name, labels), histogram in items:
+            row = {"name": name, "labels": dict(labels), "count": histogram.count,
+                   "mean": histogram.mean(), "max": histogram.max}
+            for q, value in zip(self.QUANTILES, histogram.percentiles(self.QUANTILES)):
+                row[f"p{q:g}"] = value
+            rows.append(row)
+        return rows
+
+    def prometheus_text(self):
+        """Render every histogram as a Prometheus summary (quantiles, _sum and _count)."""
+        lines = []
+        typed = set()
+        for row in self.snapshot():
+            name = f"quicktrade_{row['name']}"
+            if name not in typed:
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            labels = [f'{k}="{_escape(v)}"' for k, v in sorted(row["labels"].items())]
+            for q in self.QUANTILES:
+                value = row[f"p{q:g}"]
+                if value is not None:
+                    quantile = 'quantile="%g"' % (q / 100)
+                    lines.append(f"{name}{{{','.join(labels + [quantile])}}} {value:.6f}")
+            suffix = f"{{{','.join(labels)}}}" if labels else ""
+            histogram = self.histogram(row["name"], **row["labels"])
+            lines.append(f"{name}_sum{suffix} {histogram.total:.6f}")
+            lines.append(f"{name}_count{suffix} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write prometheus_text() to path atomically (for node_exporter's textfile collector)."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".prom", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[Metrics] Failed to write {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Expose /metrics over HTTP on a daemon thread; returns the server (call shutdown() to stop)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+        return server
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Return the process-wide Metrics registry."""
+    return _metrics
+
+
+def start_exporters_from_env():
+    """
+    Start optional exporters: QUICKTRADE_METRICS_PORT serves /metrics on localhost,
+    QUICKTRADE_METRICS_FILE is rewritten every 15 seconds. Returns a function that stops them.
+    """
+    stops = []
+    port = os.environ.get("QUICKTRADE_METRICS_PORT")
+    if port:
+        try:
+            server = _metrics.serve(int(port))
+            stops.append(server.shutdown)
+        except (OSError, ValueError) as e:
+            print(f"[Metrics] Could not serve metrics on port {port}: {e}")
+    path = os.environ.get("QUICKTRADE_METRICS_FILE")
+    if path:
+        stopped = threading.Event()
+
+        def write_periodically():
+            while not stopped.wait(15):
+                _metrics.dump(path)
+            _metrics.dump(path)
+
+        threading.Thread(target=write_periodically, name="MetricsDump", daemon=True).start()
+        stops.append(stopped.set)
+
+    def stop():
+        for fn in stops:
+            fn()
+    return stop
@@ -1,8 +1,13 @@
 # core/models.py
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from typing import Optional
 
-@dataclass
+# Orders and fills are immutable and slotted: no per-instance __dict__, and a
+# record can be handed between threads without copying.
+
+
+@dataclass(frozen=True, slots=True)
 class TradeRequest:
     exchange: str
     subaccount: str
@@ -10,4 +15,35 @@ class TradeRequest:
     side: str  # "Buy" or "Sell"
     amount: float
     order_type: str  # "Market" or "Limit"
-    price: float = None
+    price: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Fill:
+    status: str
+    exchange: str
+    subaccount: str
+    symbol: str
+    side: str
+    order_type: str
+    amount: float
+    price: Optional[float]  # None for market orders without a reported price
+    timestamp: float
+    order_id: Optional[str] = None  # Set while part of the order rests on the book
+
+    @classmethod
+    def from_trade(cls, trade: TradeRequest, status="filled", price=None, amount=None, timestamp=0.0):
+        return cls(
+            status=status,
+            exchange=trade.exchange,
+            subaccount=trade.subaccount,
+            symbol=trade.symbol,
+            side=trade.side,
+            order_type=trade.order_type,
+            amount=trade.amount if amount is None else amount,
+            price=trade.price if price is None else price,
+            timestamp=timestamp,
+        )
+
+    def to_dict(self):
+        return asdict(self)
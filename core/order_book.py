@@ -0,0 +1,200 @@
+# core/order_book.py
+
+import json
+import threading
+from bisect import bisect_left
+
+
+class SequenceGapError(Exception):
+    """A delta arrived out of order; the book needs a fresh snapshot."""
+
+
+class BookSide:
+    """
+    One side of an L2 book: a sorted array of price levels plus a price -> size map.
+    Size updates to an existing level are O(1) dict writes and the best level is always at one
+    end of the array. Adding or removing a level is a binary search plus list.insert/del, which
+    shifts the levels after it: O(n), but a single memmove that stays around a microsecond up
+    to about a thousand levels (deeper than exchanges publish), cheaper in practice than the
+    per-node overhead of a pure-Python balanced tree.
+    """
+
+    def __init__(self, descending):
+        self.descending = descending  # True for bids
+        self.prices = []  # Always ascending
+        self.sizes = {}
+
+    def clear(self):
+        self.prices.clear()
+        self.sizes.clear()
+
+    def set(self, price, size):
+        if size <= 0:
+            if self.sizes.pop(price, None) is not None:
+                del self.prices[bisect_left(self.prices, price)]
+            return
+        if price not in self.sizes:
+            i = bisect_left(self.prices, price)
+            self.prices.insert(i, price)
+        self.sizes[price] = size
+
+    def best(self):
+        if not self.prices:
+            return None
+        price = self.prices[-1] if self.descending else self.prices[0]
+        return price, self.sizes[price]
+
+    def levels(self):
+        """Iterate (price, size) from the best level outwards."""
+        prices = reversed(self.prices) if self.descending else self.prices
+        for price in prices:
+            yield price, self.sizes[price]
+
+    def top(self, n):
+        prices = self.prices[-n:][::-1] if self.descending else self.prices[:n]
+        return [(price, self.sizes[price]) for price in prices]
+
+    def __len__(self):
+        return len(self.prices)
+
+
+class OrderBook:
+    """L2 order book for one (exchange, symbol), built from a snapshot and kept current with deltas."""
+
+    def __init__(self, exchange, symbol):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.sequence = None
+        self.synced = False
+        self.lock = threading.RLock()  # Feed threads write while the UI reads
+
+    def apply_snapshot(self, bids, asks, sequence=None):
+        with self.lock:
+            self._apply_snapshot(bids, asks, sequence)
+
+    def apply_delta(self, bids=(), asks=(), sequence=None):
+        """Apply level updates; a size of 0 removes the level. Raises SequenceGapError on a gap."""
+        with self.lock:
+            return self._apply_delta(bids, asks, sequence)
+
+    def _apply_snapshot(self, bids, asks, sequence):
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in bids:
+            self.bids.set(float(price), float(size))
+        for price, size in asks:
+            self.asks.set(float(price), float(size))
+        self.sequence = sequence
+        self.synced = True
+
+    def _apply_delta(self, bids, asks, sequence):
+        if not self.synced:
+            return False
+        if sequence is not None and self.sequence is not None:
+            if sequence <= self.sequence:
+                return False  # Already applied
+            if sequence != self.sequence + 1:
+                self.synced = False
+                raise SequenceGapError(
+                    f"{self.exchange} {self.symbol}: expected sequence {self.sequence + 1}, got {sequence}"
+                )
+        for price, size in bids:
+            self.bids.set(float(price), float(size))
+        for price, size in asks:
+            self.asks.set(float(price), float(size))
+        if sequence is not None:
+            self.sequence = sequence
+        return True
+
+    def best_bid(self):
+        with self.lock:
+            return self.bids.best()
+
+    def best_ask(self):
+        with self.lock:
+            return self.asks.best()
+
+    def mid_price(self):
+        with self.lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        with self.lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def depth(self, n=10):
+        """Return the top n levels per side as {"bids": [(price, size)], "asks": [...]}."""
+        with self.lock:
+            return {"bids": self.bids.top(n), "asks": self.asks.top(n)}
+
+    def vwap(self, side, size):
+        """
+        Estimate the fill of a market order of `size` walking the book.
+        side is "Buy" (consumes asks) or "Sell" (consumes bids).
+        Returns (average_price, filled_size); filled_size < size means the book ran out.
+        """
+        levels = self.asks if side == "Buy" else self.bids
+        remaining = size
+        cost = 0.0
+        with self.lock:
+            for price, available in levels.levels():
+                take = min(remaining, available)
+                cost += take * price
+                remaining -= take
+                if remaining <= 0:
+                    break
+        filled = size - max(remaining, 0.0)
+        return (cost / filled if filled else None), filled
+
+
+class OrderBookManager:
+    """
+    Holds every order book by (exchange, symbol) and applies feed messages to them.
+    Messages are dicts: {"type": "snapshot"|"delta", "exchange", "symbol", "bids", "asks", "sequence"}.
+    """
+
+    def __init__(self):
+        self.books = {}
+        self._lock = threading.Lock()
+
+    def get(self, exchange, symbol):
+        return self.books.get((exchange, symbol))
+
+    def book(self, exchange, symbol):
+        with self._lock:
+            key = (exchange, symbol)
+            if key not in self.books:
+                self.books[key] = OrderBook(exchange, symbol)
+            return self.books[key]
+
+    def apply(self, message):
+        """Apply one message; returns False when a delta was dropped (stale, or the book needs a snapshot)."""
+        book = self.book(message["exchange"], message["symbol"])
+        bids = message.get("bids", ())
+        asks = message.get("asks", ())
+        if message["type"] == "snapshot":
+            book.apply_snapshot(bids, asks, message.get("sequence"))
+            return True
+        try:
+            return book.apply_delta(bids, asks, message.get("sequence"))
+        except SequenceGapError as e:
+            print(f"[OrderBook] {e}; waiting for a new snapshot")
+            return False
+
+    def replay(self, path):
+        """Apply a recorded JSON-lines file of snapshot/delta messages; returns the number applied."""
+        applied = 0
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and self.apply(json.loads(line)):
+                    applied += 1
+        return applied
@@ -0,0 +1,168 @@
+# core/order_validation.py
+
+import math
+import threading
+from dataclasses import replace
+from decimal import Decimal
+
+from core.market_catalog import get_market_catalog
+from core.models import TradeRequest
+
+SIDES = ("Buy", "Sell")
+ORDER_TYPES = ("Market", "Limit")
+
+
+class OrderValidationError(ValueError):
+    """An order was rejected locally before reaching the exchange."""
+
+
+def _decimals(step):
+    """Number of decimal places needed to represent multiples of step exactly."""
+    if not step:
+        return None
+    # repr() is the shortest string that round-trips, so 0.125 gives 3 places and 5 gives 0
+    return max(0, -Decimal(repr(step)).normalize().as_tuple().exponent)
+
+
+class MarketRules:
+    """
+    Precomputed trading rules for one symbol.
+    Everything that can be derived ahead of time (step sizes, rounding precision)
+    is done here once, so checking an order is a handful of float operations.
+    """
+
+    __slots__ = ("tick_size", "lot_size", "min_notional", "_price_digits", "_amount_digits")
+
+    def __init__(self, tick_size=None, lot_size=None, min_notional=None):
+        self.tick_size = tick_size or None
+        self.lot_size = lot_size or None
+        self.min_notional = min_notional or None
+        self._price_digits = _decimals(self.tick_size)
+        self._amount_digits = _decimals(self.lot_size)
+
+    @classmethod
+    def from_market(cls, market):
+        return cls(market.tick_size, market.lot_size, market.min_notional)
+
+    def round_price(self, price, side):
+        """Snap to the tick grid, never in the trader's disfavour (buys round down, sells up)."""
+        if self.tick_size is None:
+            return price
+        steps = price / self.tick_size
+        steps = math.floor(steps + 1e-9) if side == "Buy" else math.ceil(steps - 1e-9)
+        return round(steps * self.tick_size, self._price_digits)
+
+    def round_amount(self, amount):
+        """Round down to a whole number of lots so we never send more than was typed."""
+        if self.lot_size is None:
+            return amount
+        return round(math.floor(amount / self.lot_size + 1e-9) * self.lot_size, self._amount_digits)
+
+
+NO_RULES = MarketRules()
+
+
+def parse_number(text, field, missing_message=None):
+    """Parse a user-entered number; raises OrderValidationError unless it is finite and positive."""
+    if text is None or isinstance(text, str):
+        text = (text or "").strip().replace(",", "")
+        if not text:
+            raise OrderValidationError(missing_message or f"Please enter the {field}.")
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        raise OrderValidationError(f"{field.capitalize()} must be a number.") from None
+    if not math.isfinite(value) or value <= 0:
+        raise OrderValidationError(f"{field.capitalize()} must be greater than zero.")
+    return value
+
+
+def validate_trade(trade: TradeRequest, rules: MarketRules = None, reference_price=None) -> TradeRequest:
+    """
+    Check a trade against the symbol's rules and return a copy with price and amount rounded.
+    reference_price (e.g. the last traded price) lets market orders be checked against min notional.
+    """
+    rules = rules or NO_RULES
+    if trade.side not in SIDES:
+        raise OrderValidationError(f"Unknown side {trade.side!r}.")
+    if trade.order_type not in ORDER_TYPES:
+        raise OrderValidationError(f"Unknown order type {trade.order_type!r}.")
+
+    amount = rules.round_amount(trade.amount)
+    if amount <= 0:
+        raise OrderValidationError(f"Amount is below the lot size of {rules.lot_size:g}.")
+
+    price = None
+    if trade.order_type == "Limit":
+        if trade.price is None or trade.price <= 0:
+            raise OrderValidationError("Limit orders need a price greater than zero.")
+        price = rules.round_price(trade.price, trade.side)
+        if price <= 0:
+            raise OrderValidationError(f"Price is below the tick size of {rules.tick_size:g}.")
+
+    notional_price = price if price is not None else reference_price
+    if rules.min_notional is not None and notional_price:
+        notional = amount * notional_price
+        if notional < rules.min_notional:
+            raise OrderValidationError(
+                f"Order value {notional:,.8g} is below the minimum of {rules.min_notional:g} {trade.symbol.split('/')[-1]}."
+            )
+
+    if amount == trade.amount and price == trade.price:
+        return trade
+    return replace(trade, amount=amount, price=price)
+
+
+def build_trade_request(exchange, subaccount, symbol, side, order_type, amount_text, price_text=None,
+                        rules=None, reference_price=None) -> TradeRequest:
+    """Parse raw form input into a validated, normalized TradeRequest."""
+    amount = parse_number(amount_text, "amount", "Please enter an amount.")
+    price = None
+    if order_type == "Limit":
+        price = parse_number(price_text, "price", "Please enter a price for limit orders.")
+    trade = TradeRequest(
+        exchange=exchange,
+        subaccount=subaccount,
+        symbol=symbol,
+        side=side,
+        amount=amount,
+        order_type=order_type,
+        price=price,
+    )
+    return validate_trade(trade, rules, reference_price)
+
+
+class RuleCache:
+    """MarketRules per (exchange, symbol), rebuilt only when the catalog's market entry changes."""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or get_market_catalog()
+        self._rules = {}  # (exchange, symbol) -> (MarketInfo, MarketRules)
+        self._lock = threading.Lock()
+
+    def get(self, exchange, symbol):
+        """Rules for the symbol; unknown symbols are an error once the exchange's market list is loaded."""
+        market = self.catalog.market(exchange, symbol)
+        if market is None:
+            if self.catalog.is_loaded(exchange):
+                raise OrderValidationError(f"Unknown market {symbol!r} on {exchange}.")
+            return NO_RULES
+        key = (exchange, symbol)
+        cached = self._rules.get(key)
+        if cached is not None and cached[0] is market:
+            return cached[1]
+        rules = MarketRules.from_market(market)
+        with self._lock:
+            self._rules[key] = (market, rules)
+        return rules
+
+
+_rule_cache = None
+
+
+def get_rule_cache():
+    """Return the process-wide RuleCache."""
+    global _rule_cache
+    if _rule_cache is None:
+        _rule_cache = RuleCache()
+    return _rule_cache
@@ -0,0 +1,394 @@
+# core/price_feed.py
+
+import asyncio
+import json
+import threading
+import time
+
+from core.columns import TickSeries
+from core.data_store import load_enabled_exchanges
+from core.market_cache import get_market_cache
+
+
+class TickerProtocol:
+    """
+    Describes how to talk to one exchange's public ticker WebSocket.
+    Symbols are passed in the app's "BASE/QUOTE" form and converted here.
+    """
+
+    url = None
+
+    def __init__(self, url=None):
+        if url:
+            self.url = url
+        self._by_native = {}
+
+    def native_symbol(self, symbol):
+        base, quote = symbol.split("/")
+        return f"{base}{quote}"
+
+    def messages(self, symbols, subscribe=True):
+        """Return the JSON messages that (un)subscribe the given symbols."""
+        raise NotImplementedError
+
+    def parse(self, message):
+        """Return a list of (symbol, price) updates found in a decoded message."""
+        raise NotImplementedError
+
+    def remember(self, symbols):
+        natives = []
+        for symbol in symbols:
+            native = self.native_symbol(symbol)
+            self._by_native[native] = symbol
+            natives.append(native)
+        return natives
+
+    def app_symbol(self, native):
+        return self._by_native.get(native)
+
+
+class BinanceTicker(TickerProtocol):
+    url = "wss://stream.binance.com:9443/ws"
+
+    def native_symbol(self, symbol):
+        return super().native_symbol(symbol).lower()
+
+    def messages(self, symbols, subscribe=True):
+        params = [f"{native}@ticker" for native in self.remember(symbols)]
+        return [{"method": "SUBSCRIBE" if subscribe else "UNSUBSCRIBE", "params": params, "id": int(time.time())}]
+
+    def parse(self, message):
+        if message.get("e") != "24hrTicker":
+            return []
+        symbol = self.app_symbol(message["s"].lower())
+        return [(symbol, float(message["c"]))] if symbol else []
+
+
+class BybitTicker(TickerProtocol):
+    url = "wss://stream.bybit.com/v5/public/spot"
+
+    def messages(self, symbols, subscribe=True):
+        args = [f"tickers.{native}" for native in self.remember(symbols)]
+        return [{"op": "subscribe" if subscribe else "unsubscribe", "args": args}]
+
+    def parse(self, message):
+        if not str(message.get("topic", "")).startswith("tickers."):
+            return []
+        data = message.get("data", {})
+        symbol = self.app_symbol(data.get("symbol"))
+        return [(symbol, float(data["lastPrice"]))] if symbol and "lastPrice" in data else []
+
+
+class KrakenTicker(TickerProtocol):
+    url = "wss://ws.kraken.com/v2"
+
+    def native_symbol(self, symbol):
+        return symbol
+
+    def messages(self, symbols, subscribe=True):
+        return [{
+            "method": "subscribe" if subscribe else "unsubscribe",
+            "params": {"channel": "ticker", "symbol": self.remember(symbols)},
+        }]
+
+    def parse(self, message):
+        if message.get("channel") != "ticker":
+            return []
+        updates = []
+        for item in message.get("data", []):
+            symbol = self.app_symbol(item.get("symbol"))
+            if symbol and "last" in item:
+                updates.append((symbol, float(item["last"])))
+        return updates
+
+
+class CoinbaseTicker(TickerProtocol):
+    url = "wss://ws-feed.exchange.coinbase.com"
+
+    def native_symbol(self, symbol):
+        return symbol.replace("/", "-")
+
+    def messages(self, symbols, subscribe=True):
+        return [{
+            "type": "subscribe" if subscribe else "unsubscribe",
+            "product_ids": self.remember(symbols),
+            "channels": ["ticker"],
+        }]
+
+    def parse(self, message):
+        if message.get("type") != "ticker":
+            return []
+        symbol = self.app_symbol(message.get("product_id"))
+        return [(symbol, float(message["price"]))] if symbol else []
+
+
+class BitgetTicker(TickerProtocol):
+    url = "wss://ws.bitget.com/v2/ws/public"
+
+    def messages(self, symbols, subscribe=True):
+        args = [{"instType": "SPOT", "channel": "ticker", "instId": native} for native in self.remember(symbols)]
+        return [{"op": "subscribe" if subscribe else "unsubscribe", "args": args}]
+
+    def parse(self, message):
+        if message.get("arg", {}).get("channel") != "ticker":
+            return []
+        updates = []
+        for item in message.get("data", []):
+            symbol = self.app_symbol(item.get("instId"))
+            if symbol and "lastPr" in item:
+                updates.append((symbol, float(item["lastPr"])))
+        return updates
+
+
+class HyperliquidTicker(TickerProtocol):
+    """Hyperliquid publishes all mid prices on one channel; quotes are always USD(C)."""
+
+    url = "wss://api.hyperliquid.xyz/ws"
+
+    def native_symbol(self, symbol):
+        return symbol.split("/")[0]
+
+    def messages(self, symbols, subscribe=True):
+        self.remember(symbols)
+        return [{"method": "subscribe" if subscribe else "unsubscribe", "subscription": {"type": "allMids"}}]
+
+    def parse(self, message):
+        if message.get("channel") != "allMids":
+            return []
+        updates = []
+        for coin, price in message.get("data", {}).get("mids", {}).items():
+            symbol = self.app_symbol(coin)
+            if symbol:
+                updates.append((symbol, float(price)))
+        return updates
+
+
+TICKER_PROTOCOLS = {
+    "Binance": BinanceTicker,
+    "Bybit": BybitTicker,
+    "Kraken": KrakenTicker,
+    "Coinbase": CoinbaseTicker,
+    "Bitget": BitgetTicker,
+    "Hyperliquid": HyperliquidTicker,
+}
+
+
+class PriceFeed:
+    """
+    Keeps one persistent ticker WebSocket per exchange on a background asyncio loop.
+    The latest price per (exchange, symbol) is held in memory and every update is
+    pushed to listeners as callback(exchange, symbol, price, timestamp).
+    Listeners run on the feed thread; UI code must marshal them onto its own thread.
+    Tick history is kept per symbol in array-backed TickSeries (history_limit ticks each, 0 disables).
+    Every tick is also handed to the on-disk MarketDataCache, so the next run starts from
+    last-known prices (see last_known()) and recent candles.
+    Unless exchanges or protocols are given, the enabled exchanges are read from settings
+    on each subscribe() to an exchange without a connection yet, so one enabled later
+    starts streaming without a restart.
+    """
+
+    def __init__(self, exchanges=None, protocols=None, reconnect_min=1.0, reconnect_max=30.0,
+                 history_limit=100_000, cache=None):
+        self.fixed_exchanges = protocols is not None or exchanges is not None
+        if protocols is None:
+            exchanges = load_enabled_exchanges() if exchanges is None else exchanges
+            protocols = {ex: TICKER_PROTOCOLS[ex]() for ex in exchanges if ex in TICKER_PROTOCOLS}
+        self.protocols = protocols
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+
+        self.latest_prices = {}  # (exchange, symbol) -> (price, timestamp)
+        self._cache = cache
+        self.history_limit = history_limit
+        self.history = {}  # (exchange, symbol) -> TickSeries
+        self._symbols = {ex: set() for ex in protocols}
+        self._listeners = []
+        self._sockets = {}
+        self._started = set()  # Exchanges with a connection task on the current loop
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._running = False
+
+    # --- Lifecycle -------------------------------------------------------
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="PriceFeed", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        if not self._running:
+            return
+        self._running = False
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._cancel_all)
+            self._thread.join(timeout)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._started = set()
+        with self._lock:
+            protocols = list(self.protocols.items())
+        for exchange, protocol in protocols:
+            self._start_exchange(exchange, protocol)
+        self._loop.run_forever()  # Until _cancel_all() has wound every connection down
+        self._loop.close()
+
+    def _start_exchange(self, exchange, protocol):
+        # On the feed loop; an exchange added while start() was running may be scheduled twice
+        if exchange not in self._started:
+            self._started.add(exchange)
+            self._loop.create_task(self._run_exchange(exchange, protocol))
+
+    def _cancel_all(self):
+        tasks = asyncio.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        asyncio.gather(*tasks, return_exceptions=True).add_done_callback(lambda _: self._loop.stop())
+
+    # --- Subscriptions ---------------------------------------------------
+
+    def subscribe(self, exchange, symbol):
+        """
+        Start streaming a symbol; it is resubscribed automatically after reconnects.
+        Returns False if the exchange has no ticker stream (or isn't enabled).
+        """
+        if exchange not in self.protocols and not self._add_exchange(exchange):
+            return False
+        with self._lock:
+            if symbol in self._symbols[exchange]:
+                return True
+            self._symbols[exchange].add(symbol)
+        self._send(exchange, [symbol], subscribe=True)
+        return True
+
+    def _add_exchange(self, exchange):
+        if self.fixed_exchanges or exchange not in TICKER_PROTOCOLS or exchange not in load_enabled_exchanges():
+            return False
+        with self._lock:
+            if exchange in self.protocols:
+                return True
+            protocol = self.protocols[exchange] = TICKER_PROTOCOLS[exchange]()
+            self._symbols[exchange] = set()
+            running = self._running
+        if running:
+            # Connects right away; the new symbol is sent once the socket is up
+            self._loop.call_soon_threadsafe(self._start_exchange, exchange, protocol)
+        return True
+
+    def unsubscribe(self, exchange, symbol):
+        with self._lock:
+            if symbol not in self._symbols.get(exchange, set()):
+                return
+            self._symbols[exchange].discard(symbol)
+        self._send(exchange, [symbol], subscribe=False)
+
+    def add_listener(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def latest(self, exchange, symbol):
+        """Return (price, timestamp) for the last tick seen, or None."""
+        return self.latest_prices.get((exchange, symbol))
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = get_market_cache()
+        return self._cache
+
+    def last_known(self, exchange, symbol):
+        """
+        Return (price, timestamp, live) for the newest price we know of: this session's last
+        tick (live=True), else the last one stored by an earlier run (live=False), else None.
+        """
+        latest = self.latest_prices.get((exchange, symbol))
+        if latest is not None:
+            return latest[0], latest[1], True
+        cached = self.cache.price(exchange, symbol)
+        if cached is not None:
+            return cached[0], cached[1], False
+        return None
+
+    def ticks(self, exchange, symbol):
+        """Return the TickSeries recorded for a symbol, or None."""
+        return self.history.get((exchange, symbol))
+
+    def _send(self, exchange, symbols, subscribe):
+        if not self._running or exchange not in self._sockets:
+            return  # Picked up on (re)connect
+        asyncio.run_coroutine_threadsafe(self._send_messages(exchange, symbols, subscribe), self._loop)
+
+    async def _send_messages(self, exchange, symbols, subscribe):
+        ws = self._sockets.get(exchange)
+        if ws is None:
+            return
+        for message in self.protocols[exchange].messages(symbols, subscribe=subscribe):
+            await ws.send(json.dumps(message))
+
+    # --- Connection handling ----------------------------------------------
+
+    async def _run_exchange(self, exchange, protocol):
+        import websockets  # Imported on the feed thread, off the startup path
+
+        delay = self.reconnect_min
+        while self._running:
+            try:
+                async with websockets.connect(protocol.url, ping_interval=20, ping_timeout=20) as ws:
+                    self._sockets[exchange] = ws
+                    delay = self.reconnect_min
+                    with self._lock:
+                        symbols = sorted(self._symbols[exchange])
+                    if symbols:
+                        await self._send_messages(exchange, symbols, subscribe=True)
+                    async for raw in ws:
+                        self._handle_message(exchange, protocol, raw)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"[PriceFeed] {exchange} connection error: {e}")
+            finally:
+                self._sockets.pop(exchange, None)
+
+            if not self._running:
+                break
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                break
+            delay = min(delay * 2, self.reconnect_max)
+
+    def _handle_message(self, exchange, protocol, raw):
+        try:
+            updates = protocol.parse(json.loads(raw))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"[PriceFeed] {exchange} sent an unreadable message: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            listeners = list(self._listeners)
+        cache = self.cache if updates else None
+        for symbol, price in updates:
+            key = (exchange, symbol)
+            self.latest_prices[key] = (price, now)
+            if self.history_limit:
+                series = self.history.get(key)
+                if series is None:
+                    series = self.history[key] = TickSeries(self.history_limit)
+                series.append(now, price)
+            cache.record_tick(exchange, symbol, price, now)
+            for callback in listeners:
+                try:
+                    callback(exchange, symbol, price, now)
+                except Exception as e:
+                    print(f"[PriceFeed] Listener failed: {e}")
@@ -1,35 +1,158 @@
-# price fetcher logic placeholder
-# price_fetcher.py
+# core/price_fetcher.py
 
-import requests
 import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from core.http_client import HttpClient, SingleFlight
+from core.log_config import get_logger
+from core.market_cache import get_market_cache
+from core.metrics import get_metrics
+from core.rate_limiter import PRIORITY_PRICE, get_rate_limiter, retry_after_seconds
+from core.ttl_cache import TTLCache
+
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+RATE_LIMIT_SCOPE = "CoinGecko"
+
+logger = get_logger("price_fetcher")
+
+# Exchange tickers differ from CoinGecko coin ids; anything not listed is passed through lowercased.
+COINGECKO_IDS = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "SOL": "solana",
+    "BNB": "binancecoin",
+    "XRP": "ripple",
+    "ADA": "cardano",
+    "DOGE": "dogecoin",
+    "DOT": "polkadot",
+    "AVAX": "avalanche-2",
+    "MATIC": "matic-network",
+    "LINK": "chainlink",
+    "LTC": "litecoin",
+    "TRX": "tron",
+    "HYPE": "hyperliquid",
+    "USDT": "tether",
+    "USDC": "usd-coin",
+}
+
 
 class PriceFetcher:
-    def __init__(self):
-        self.cache = {}
-        self.cache_duration = 60  # seconds
-        self.last_fetch_time = {}
+    def __init__(self, cache_duration=60, max_cache_size=2048, max_ids_per_request=250,
+                 base_url=COINGECKO_API_URL, http=None, rate_limiter=None, store=None):
+        self.cache_duration = cache_duration  # seconds
+        self.cache = TTLCache(maxsize=max_cache_size, ttl=cache_duration)
+        self.max_ids_per_request = max_ids_per_request
+        self.price_url = f"{base_url.rstrip('/')}/simple/price"
+        self._http = http
+        self.in_flight = SingleFlight()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._store = store  # MarketDataCache; prices survive restarts there
+        self._seeded = False
+
+    @property
+    def http(self):
+        if self._http is None:
+            self._http = HttpClient()
+        return self._http
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_market_cache()
+        return self._store
+
+    def _seed_from_store(self):
+        # Prices fetched by a previous run less than cache_duration ago are still fresh:
+        # serve them instead of refetching everything right after a restart.
+        self._seeded = True
+        now = time.time()
+        for (_, key), (price, ts) in self.store.prices(RATE_LIMIT_SCOPE).items():
+            remaining = self.cache_duration - (now - ts)
+            if remaining > 0:
+                self.cache.set(key, price, ttl=remaining)
 
     def get_price(self, base: str, quote: str = "usd") -> float:
         """
         Fetches the price of a crypto asset in the desired quote currency.
         Uses a simple cache to avoid API rate-limiting issues.
         """
-        symbol = f"{base.lower()}_{quote.lower()}"
-
-        current_time = time.time()
-        if symbol in self.cache and current_time - self.last_fetch_time[symbol] < self.cache_duration:
-            return self.cache[symbol]
-
-        try:
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={base.lower()}&vs_currencies={quote.lower()}"
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            price = data[base.lower()][quote.lower()]
-            self.cache[symbol] = price
-            self.last_fetch_time[symbol] = current_time
-            return price
-        except Exception as e:
-            print(f"[PriceFetcher] Failed to fetch price for {base}/{quote}: {e}")
-            return 0.0
+        return self.get_prices([base], [quote])[(base, quote)]
+
+    def get_prices(self, bases, quotes=("usd",), timeout=None) -> dict:
+        """
+        Fetches prices for every (base, quote) combination in as few requests as possible.
+        Returns {(base, quote): price}; pairs that could not be fetched map to 0.0.
+        timeout bounds each wait (rate limit, request, another caller's fetch) instead of the
+        HTTP client's own timeout and retries.
+        """
+        if not self._seeded:
+            self._seed_from_store()
+        pairs = [(base, quote) for base in bases for quote in quotes]
+        keys = {pair: self._cache_key(*pair) for pair in pairs}
+        cached = self.cache.get_many(keys.values())
+
+        missing = [pair for pair in pairs if keys[pair] not in cached]
+        if missing:
+            # Only fetch what no other caller is already fetching; share their results for the rest.
+            owned, waiting = self.in_flight.claim({keys[pair] for pair in missing})
+            if owned:
+                owned = set(owned)
+                fetched = {}
+                try:
+                    fetched = self._fetch([pair for pair in missing if keys[pair] in owned], timeout)
+                finally:
+                    self.in_flight.resolve(owned, fetched)
+                cached.update(fetched)
+            for key, future in waiting.items():
+                try:
+                    price = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    continue
+                if price is not None:
+                    cached[key] = price
+
+        return {pair: cached.get(keys[pair], 0.0) for pair in pairs}
+
+    def _fetch(self, pairs, timeout=None) -> dict:
+        """Fetch the given pairs from CoinGecko, cache the results and return {cache_key: price}."""
+        ids = sorted({self.coin_id(base) for base, _ in pairs})
+        vs_currencies = ",".join(sorted({quote.lower() for _, quote in pairs}))
+        prices = {}
+
+        for start in range(0, len(ids), self.max_ids_per_request):
+            chunk = ids[start:start + self.max_ids_per_request]
+            if not self.rate_limiter.acquire(RATE_LIMIT_SCOPE, priority=PRIORITY_PRICE, timeout=timeout):
+                logger.warning("Rate limited, skipped prices for %s", ",".join(chunk))
+                continue
+            try:
+                with get_metrics().timer("price_fetch_seconds", exchange=RATE_LIMIT_SCOPE):
+                    data = self.http.get_json(
+                        self.price_url,
+                        params={"ids": ",".join(chunk), "vs_currencies": vs_currencies},
+                        timeout=timeout,
+                    )
+            except Exception as e:
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None:
+                    self.rate_limiter.penalize(RATE_LIMIT_SCOPE, retry_after)
+                logger.warning("Failed to fetch prices for %s: %s", ",".join(chunk), e)
+                continue
+
+            # Cache everything the response carried, not only what was asked for.
+            for coin_id, quoted in data.items():
+                for quote, price in quoted.items():
+                    key = self._cache_key(coin_id, quote)
+                    self.cache.set(key, price)
+                    prices[key] = price
+
+        if prices:
+            self.store.put_prices(RATE_LIMIT_SCOPE, prices)
+        return prices
+
+    @staticmethod
+    def coin_id(base: str) -> str:
+        return COINGECKO_IDS.get(base.upper(), base.lower())
+
+    @classmethod
+    def _cache_key(cls, base: str, quote: str) -> str:
+        return f"{cls.coin_id(base)}_{quote.lower()}"
@@ -0,0 +1,215 @@
+# core/rate_limiter.py
+
+import heapq
+import itertools
+import threading
+import time
+
+from core.log_config import get_logger
+
+logger = get_logger("rate_limiter")
+
+# Priority lanes: lower numbers are served first.
+PRIORITY_ORDER = 0
+PRIORITY_BALANCE = 1
+PRIORITY_PRICE = 2
+
+# (burst, sustained requests-or-weight per second). Deliberately below the published limits:
+# being throttled costs a little latency, being banned costs the trading day.
+EXCHANGE_LIMITS = {
+    "Binance": (100, 80.0),  # 6000 weight / minute per IP
+    "Bybit": (50, 20.0),
+    "OKX": (20, 10.0),
+    "Kraken": (15, 0.5),  # Decaying call counter on starter tier
+    "Coinbase": (15, 8.0),
+    "KuCoin": (30, 10.0),
+    "Bitget": (20, 10.0),
+    "Hyperliquid": (20, 15.0),  # 1200 weight / minute
+    "CoinGecko": (5, 0.4),  # Free tier, ~30 calls / minute
+}
+DEFAULT_EXCHANGE_LIMIT = (10, 5.0)
+DEFAULT_KEY_LIMIT = (20, 5.0)  # Per API key, on top of the exchange-wide limit
+
+
+class TokenBucket:
+    """Classic token bucket: holds up to `burst` tokens and refills at `rate` tokens per second."""
+
+    __slots__ = ("burst", "rate", "tokens", "updated", "blocked_until")
+
+    def __init__(self, burst, rate, now):
+        self.burst = float(burst)
+        self.rate = float(rate)
+        self.tokens = float(burst)
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def time_until(self, weight, now):
+        """Seconds until `weight` tokens are available (0 if they are now)."""
+        wait = max(0.0, self.blocked_until - now)
+        missing = weight - self.tokens
+        if missing > 0:
+            wait = max(wait, missing / self.rate)
+        return wait
+
+    def take(self, weight):
+        self.tokens -= weight
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "weight", "key_bucket", "granted")
+
+    def __init__(self, priority, seq, weight, key_bucket):
+        self.priority = priority
+        self.seq = seq
+        self.weight = weight
+        self.key_bucket = key_bucket
+        self.granted = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _ExchangeLane:
+    """Shared bucket and waiting requests for one exchange."""
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.waiters = []  # Heap of _Waiter
+        self.cond = threading.Condition()
+
+
+class RateLimiter:
+    """
+    Weighted token-bucket scheduler per exchange and per API key.
+    acquire() blocks until the request may go out instead of failing. Waiting requests
+    are granted strictly by priority lane (orders, then balances, then prices) and FIFO
+    within a lane; a lower-priority request never takes exchange capacity that a
+    higher-priority one is waiting for. Requests blocked only by their own key's bucket
+    do not hold up other keys. Keys are per exchange: ("Bybit", "main") and
+    ("Binance", "main") are different API keys with separate buckets.
+    """
+
+    def __init__(self, limits=None, default_limit=DEFAULT_EXCHANGE_LIMIT, key_limit=DEFAULT_KEY_LIMIT,
+                 clock=time.monotonic):
+        self.limits = EXCHANGE_LIMITS if limits is None else limits
+        self.default_limit = default_limit
+        self.key_limit = key_limit
+        self.clock = clock
+        self._lanes = {}
+        self._key_buckets = {}  # (exchange, key) -> TokenBucket; guarded by the exchange's lane.cond
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def acquire(self, exchange, key=None, weight=1, priority=PRIORITY_PRICE, timeout=None):
+        """Wait for capacity; returns True once granted, or False if timeout (seconds) ran out first."""
+        lane = self._lane(exchange)
+        deadline = None if timeout is None else self.clock() + timeout
+        with lane.cond:
+            key_bucket = self._key_bucket(exchange, key) if key is not None and self.key_limit else None
+            weight = min(weight, lane.bucket.burst, key_bucket.burst if key_bucket else weight)
+            waiter = _Waiter(priority, next(self._seq), weight, key_bucket)
+            heapq.heappush(lane.waiters, waiter)
+            while True:
+                wait = self._grant(lane)
+                if waiter.granted:
+                    return True
+                if deadline is not None:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        lane.waiters.remove(waiter)
+                        heapq.heapify(lane.waiters)
+                        lane.cond.notify_all()  # Capacity we were first in line for may now suit someone else
+                        return False
+                    wait = remaining if wait is None else min(wait, remaining)
+                lane.cond.wait(wait)
+
+    def penalize(self, exchange, retry_after, key=None):
+        """Back off after the exchange throttled us: no requests go out for retry_after seconds."""
+        lane = self._lane(exchange)
+        with lane.cond:
+            now = self.clock()
+            bucket = self._key_bucket(exchange, key) if key is not None and self.key_limit else lane.bucket
+            bucket.refill(now)
+            bucket.tokens = 0.0
+            bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+        logger.warning("%s%s throttled; pausing %.1fs", exchange, f" ({key})" if key else "", retry_after)
+
+    def pending(self, exchange):
+        """Number of requests currently waiting for the exchange."""
+        lane = self._lanes.get(exchange)
+        return len(lane.waiters) if lane else 0
+
+    def _grant(self, lane):
+        """Grant every waiter that fits right now; return seconds until the next one might, or None."""
+        now = self.clock()
+        lane.bucket.refill(now)
+        for waiter in lane.waiters:
+            if waiter.key_bucket is not None:
+                waiter.key_bucket.refill(now)
+
+        granted = False
+        next_wait = None
+        for waiter in sorted(lane.waiters):
+            exchange_wait = lane.bucket.time_until(waiter.weight, now)
+            if exchange_wait > 0:
+                # Head of line on the shared bucket: nobody behind it may jump ahead
+                next_wait = exchange_wait if next_wait is None else min(next_wait, exchange_wait)
+                break
+            if waiter.key_bucket is not None:
+                key_wait = waiter.key_bucket.time_until(waiter.weight, now)
+                if key_wait > 0:
+                    next_wait = key_wait if next_wait is None else min(next_wait, key_wait)
+                    continue
+                waiter.key_bucket.take(waiter.weight)
+            lane.bucket.take(waiter.weight)
+            waiter.granted = True
+            granted = True
+
+        if granted:
+            lane.waiters = [w for w in lane.waiters if not w.granted]
+            heapq.heapify(lane.waiters)
+            lane.cond.notify_all()
+        return next_wait
+
+    def _lane(self, exchange):
+        with self._lock:
+            lane = self._lanes.get(exchange)
+            if lane is None:
+                burst, rate = self.limits.get(exchange, self.default_limit)
+                lane = self._lanes[exchange] = _ExchangeLane(TokenBucket(burst, rate, self.clock()))
+            return lane
+
+    def _key_bucket(self, exchange, key):
+        bucket = self._key_buckets.get((exchange, key))
+        if bucket is None:
+            bucket = self._key_buckets[(exchange, key)] = TokenBucket(*self.key_limit, self.clock())
+        return bucket
+
+
+def retry_after_seconds(error, default=30.0):
+    """Return the Retry-After delay if error is an HTTP 418/429 throttle response, else None."""
+    response = getattr(error, "response", None)
+    if response is None or getattr(response, "status_code", None) not in (418, 429):
+        return None
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide RateLimiter."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -0,0 +1,226 @@
+# core/sim_exchange.py
+
+import itertools
+import math
+import random
+import threading
+import time
+
+from core.balance_service import FakeBalanceBackend
+from core.exchanges import ExchangeAdapter
+from core.log_config import get_logger
+from core.market_catalog import make_market
+from core.matching_engine import MatchingEngine, Order
+from core.models import Fill, TradeRequest
+
+logger = get_logger("sim_exchange")
+
+MAKER = "__maker__"  # Owner of the simulated market maker's liquidity
+
+REFERENCE_PRICES = {
+    "BTC": 60000.0, "ETH": 3000.0, "SOL": 150.0, "BNB": 550.0, "XRP": 0.55, "ADA": 0.45,
+    "DOGE": 0.15, "DOT": 7.0, "AVAX": 35.0, "LINK": 15.0, "LTC": 80.0, "HYPE": 25.0,
+}
+DEFAULT_REFERENCE_PRICE = 100.0
+
+
+class SimulatedExchange(ExchangeAdapter):
+    """
+    Deterministic in-process exchange for offline use, demos and load tests.
+    Each symbol gets a MatchingEngine seeded with market-maker liquidity around a reference
+    price: `levels` price levels per side, each worth about `level_notional` in the quote
+    currency. Orders larger than the top of book walk several levels or fill partially,
+    and limit orders that don't cross rest on the book. Every call sleeps `latency`
+    seconds plus up to `jitter` drawn from a seeded RNG, so runs are reproducible.
+    Balances start from FakeBalanceBackend's seeded values and move with every fill.
+    """
+
+    supports_batch = True
+
+    def __init__(self, name="Simulated", latency=0.0, jitter=0.0, seed=None, reference_prices=None,
+                 levels=20, level_notional=25_000.0, level_step=0.0002, clock=time.time):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.reference_prices = REFERENCE_PRICES if reference_prices is None else reference_prices
+        self.levels = levels
+        self.level_notional = level_notional
+        self.level_step = level_step  # Gap between levels as a fraction of the price
+        self.clock = clock
+        self._rng = random.Random(name if seed is None else seed)
+        self._engines = {}
+        self._balances = {}  # subaccount -> {asset: amount}
+        self._seed_balances = FakeBalanceBackend()
+        self._listeners = []  # (symbols, callback)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # --- ExchangeAdapter -------------------------------------------------
+
+    def place_order(self, trade: TradeRequest, credentials=None) -> Fill:
+        self._delay()
+        return self._place(trade)
+
+    def place_orders(self, trades, credentials=None):
+        # One round trip for the whole batch, like a native batch endpoint
+        self._delay()
+        return [self._place(trade) for trade in trades]
+
+    def cancel_order(self, subaccount, symbol, order_id, credentials=None):
+        self._delay()
+        engine = self._engine(symbol)
+        order = engine.orders.get(order_id)
+        if order is None or order.owner != subaccount:
+            return False
+        return engine.cancel(order_id) is not None
+
+    def fetch_balances(self, subaccount, credentials=None, timeout=None):
+        self._delay(timeout)
+        with self._lock:
+            return dict(self._account(subaccount))
+
+    def load_markets(self):
+        markets = []
+        for base, price in sorted(self.reference_prices.items()):
+            magnitude = math.floor(math.log10(price))
+            markets.append(make_market(base, "USDT", 10.0 ** (magnitude - 4), 10.0 ** -(magnitude + 1), 5.0))
+        return markets
+
+    def stream(self, symbols, callback):
+        entry = (set(symbols), callback)
+        with self._lock:
+            self._listeners.append(entry)
+
+        def stop():
+            with self._lock:
+                if entry in self._listeners:
+                    self._listeners.remove(entry)
+
+        return stop
+
+    # --- Inspection ------------------------------------------------------
+
+    def engine(self, symbol) -> MatchingEngine:
+        return self._engine(symbol)
+
+    def open_orders(self, subaccount, symbol):
+        engine = self._engine(symbol)
+        with engine.lock:
+            return [o for o in engine.orders.values() if o.owner == subaccount]
+
+    # --- Internals -------------------------------------------------------
+
+    def _place(self, trade):
+        engine = self._engine(trade.symbol)
+        price = trade.price if trade.order_type == "Limit" else None
+        order = Order(f"{self.name[:3].upper()}-{next(self._ids)}", trade.subaccount, trade.side, price, trade.amount)
+        executions = engine.submit(order)
+
+        filled = order.amount - order.remaining
+        cost = math.fsum(e.price * e.amount for e in executions)
+        if order.remaining <= 0:
+            status = "filled"
+        elif filled > 0:
+            status = "partially_filled"
+        else:
+            status = "open" if price is not None else "rejected"
+
+        if executions:
+            self._settle(trade.symbol, executions)
+            self._replenish(engine, trade.symbol)
+        now = self.clock()
+        if executions:
+            self._publish(trade.symbol, executions[-1].price, now)
+
+        return Fill(
+            status=status,
+            exchange=trade.exchange,
+            subaccount=trade.subaccount,
+            symbol=trade.symbol,
+            side=trade.side,
+            order_type=trade.order_type,
+            amount=filled,
+            price=cost / filled if filled else None,
+            timestamp=now,
+            order_id=order.order_id if price is not None and order.remaining > 0 else None,
+        )
+
+    def _delay(self, timeout=None):
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._rng.uniform(0, self.jitter)
+        if timeout is not None and delay > timeout:
+            time.sleep(max(0.0, timeout))
+            raise TimeoutError(f"{self.name} did not answer within {timeout:.1f}s")
+        if delay > 0:
+            time.sleep(delay)
+
+    def _engine(self, symbol):
+        with self._lock:
+            engine = self._engines.get(symbol)
+            if engine is None:
+                engine = self._engines[symbol] = MatchingEngine(symbol)
+                self._replenish(engine, symbol)
+            return engine
+
+    def _replenish(self, engine, symbol):
+        """
+        Requote maker liquidity: keep a level one step either side of the last trade,
+        then top both sides back up to `levels` levels extending outward.
+        """
+        base = symbol.split("/")[0]
+        reference = self.reference_prices.get(base, DEFAULT_REFERENCE_PRICE)
+        tick = 10.0 ** (math.floor(math.log10(reference)) - 4)
+        digits = max(0, -math.floor(math.log10(tick)))
+        rng = random.Random(f"{self.name}:{symbol}:{len(engine.bids)}:{len(engine.asks)}:{engine.last_price}")
+        with engine.lock:
+            mid = engine.last_price or reference
+            step = max(tick, round(mid * self.level_step / tick) * tick)
+            for side, book, direction in (("Buy", engine.bids, -1), ("Sell", engine.asks, 1)):
+                inside = round(mid + direction * step, digits)
+                best = book.best_price()
+                if best is None or (best - inside) * direction > step / 2:
+                    self._add_maker(book, side, inside, rng)
+                while len(book) < self.levels:
+                    price = round(book.worst_price() + direction * step, digits)
+                    if price <= 0:
+                        break
+                    self._add_maker(book, side, price, rng)
+                # Drop far-away maker levels left behind when the price trends
+                while len(book) > 2 * self.levels:
+                    worst = book.worst_price()
+                    if any(order.owner != MAKER for order in book.levels[worst]):
+                        break
+                    book.remove_level(worst)
+
+    def _add_maker(self, book, side, price, rng):
+        size = self.level_notional / price * (0.5 + rng.random())
+        book.add(Order(f"MM-{next(self._ids)}", MAKER, side, price, size))
+
+    def _settle(self, symbol, executions):
+        base, quote = symbol.split("/")
+        with self._lock:
+            for e in executions:
+                for order in (e.taker, e.maker):
+                    if order.owner == MAKER:
+                        continue
+                    account = self._account(order.owner)
+                    sign = 1 if order.side == "Buy" else -1
+                    account[base] = account.get(base, 0.0) + sign * e.amount
+                    account[quote] = account.get(quote, 0.0) - sign * e.amount * e.price
+
+    def _account(self, subaccount):
+        account = self._balances.get(subaccount)
+        if account is None:
+            account = self._balances[subaccount] = self._seed_balances.fetch_balances(self.name, subaccount, None)
+        return account
+
+    def _publish(self, symbol, price, timestamp):
+        with self._lock:
+            listeners = [callback for symbols, callback in self._listeners if symbol in symbols]
+        for callback in listeners:
+            try:
+                callback(self.name, symbol, price, timestamp)
+            except Exception:
+                logger.exception("%s: price listener failed", self.name)
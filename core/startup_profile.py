@@ -0,0 +1,139 @@
+# core/startup_profile.py
+
+import importlib.abc
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_REPORT = "startup_profile.txt"
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module's loader to time its execution (including the imports it triggers)."""
+
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        profiler = self.profiler
+        if threading.get_ident() != profiler.thread_id:
+            return self.loader.exec_module(module)
+        profiler.import_stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            nested = profiler.import_stack.pop()
+            if profiler.import_stack:
+                profiler.import_stack[-1] += total
+            profiler.imports.append((module.__name__, total, total - nested))
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records module import times and named startup phases (constructors, first show, ...)
+    from the moment it is started, then writes a plain-text breakdown.
+    """
+
+    def __init__(self, report_path=DEFAULT_REPORT):
+        self.report_path = report_path
+        self.started = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        self.imports = []  # (module, cumulative seconds, self seconds)
+        self.import_stack = []
+        self.phases = []  # (name, offset seconds, duration seconds)
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.started, time.perf_counter() - start))
+
+    def mark(self, name):
+        """Record a point in time (e.g. "first event loop turn") as a zero-length phase."""
+        self.phases.append((name, time.perf_counter() - self.started, 0.0))
+
+    def finish(self, top=30):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        lines = [f"Startup profile ({(time.perf_counter() - self.started) * 1000:.1f} ms since start)", "",
+                 "Phases:", f"  {'at (ms)':>9}  {'took (ms)':>9}  name"]
+        for name, offset, duration in self.phases:
+            lines.append(f"  {offset * 1000:9.1f}  {duration * 1000:9.1f}  {name}")
+        total_self = sum(own for _, _, own in self.imports)
+        lines += ["", f"Imports: {len(self.imports)} modules, {total_self * 1000:.1f} ms total",
+                  f"  {'cumul (ms)':>10}  {'self (ms)':>9}  module"]
+        for name, cumulative, own in sorted(self.imports, key=lambda i: i[1], reverse=True)[:top]:
+            lines.append(f"  {cumulative * 1000:10.1f}  {own * 1000:9.1f}  {name}")
+        report = "\n".join(lines) + "\n"
+        try:
+            with open(self.report_path, 'w') as f:
+                f.write(report)
+            print(f"[StartupProfile] Wrote {self.report_path}")
+        except OSError as e:
+            print(f"[StartupProfile] Failed to write {self.report_path}: {e}")
+        return report
+
+
+class _NoProfiler:
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def mark(self, name):
+        pass
+
+    def finish(self, top=30):
+        return ""
+
+
+_profiler = _NoProfiler()
+
+
+def get_startup_profiler():
+    """Return the active StartupProfiler, or a no-op stand-in when profiling is off."""
+    return _profiler
+
+
+def start_from_argv(argv):
+    """
+    Start profiling if argv contains --profile-startup[=report_path]; removes the flag from argv.
+    Call before importing the UI so module imports are included.
+    """
+    global _profiler
+    for arg in list(argv):
+        if arg == PROFILE_FLAG or arg.startswith(PROFILE_FLAG + "="):
+            argv.remove(arg)
+            path = arg.partition("=")[2] or DEFAULT_REPORT
+            _profiler = StartupProfiler(path)
+    return _profiler
@@ -1,58 +1,167 @@
-import time
-import logging
-from core.models import TradeRequest
+# core/trade_executor.py
 
-# Set up logging
-import os
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# Ensure external writable directory for logs
-log_dir = os.path.join(os.path.expanduser("~"), "QuickTradeLogs")
-os.makedirs(log_dir, exist_ok=True)
-
-log_file = os.path.join(log_dir, "trade_executor.log")
+from core.basket import BasketResult
+from core.columns import FillSeries
+from core.data_store import copy_api_keys
+from core.exchanges import get_adapter
+from core.log_config import get_logger
+from core.metrics import get_metrics
+from core.models import Fill, TradeRequest
+from core.rate_limiter import PRIORITY_ORDER, get_rate_limiter
+from core.trade_journal import get_trade_journal
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+logger = get_logger("trade")
 
 
 class TradeExecutor:
-    def __init__(self):
-        self.simulated_balances = {}  # You can link this to real data later
+    def __init__(self, max_workers=16, journal=None, rate_limiter=None, adapters=None):
+        self.adapters = adapters or get_adapter  # exchange name -> ExchangeAdapter
+        # Orders run on a worker pool so callers (the UI thread in particular)
+        # never wait on exchange round trips.
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="TradeExecutor")
+        self.fills = FillSeries()  # Columnar history of every fill this session
+        self._fills_lock = threading.Lock()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._journal = journal  # TradeJournal; the shared one is opened on first trade
+
+    @property
+    def journal(self):
+        if self._journal is None:
+            self._journal = get_trade_journal()
+        return self._journal
 
-    def execute_trade(self, trade: TradeRequest):
+    def submit_trade(self, trade: TradeRequest, callback=None):
         """
-        Simulate execution of a trade request.
-        For future integration, this is where you'd call the exchange's API.
+        Queue a trade for execution and return a Future immediately.
+        The Future resolves to the same Fill as execute_trade.
+        If given, callback(future) runs on the worker thread when it completes.
         """
-        trade_info = (
-            f"Exchange: {trade.exchange}, "
-            f"Subaccount: {trade.subaccount}, "
-            f"Symbol: {trade.symbol}, "
-            f"Side: {trade.side}, "
-            f"Order Type: {trade.order_type}, "
-            f"Amount: {trade.amount}, "
-            f"Price: {trade.price or 'Market'}"
+        future = self._pool.submit(self._execute_and_record, trade)
+        self._track_ack(future, trade.exchange)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def submit_trades(self, trades, callback=None):
+        """Queue several trades at once; they run concurrently across exchanges and subaccounts."""
+        return [self.submit_trade(trade, callback) for trade in trades]
+
+    def submit_basket(self, trades, callback=None):
+        """
+        Send the legs of a basket order all at once and return a Future for the BasketResult.
+        Legs for the same account go out in one call when the adapter has a batch endpoint;
+        everything else is dispatched concurrently, so the basket takes about one round trip.
+        """
+        groups = {}
+        for trade in trades:
+            groups.setdefault((trade.exchange, trade.subaccount), []).append(trade)
+
+        calls = []  # (future, trades)
+        for (exchange, _), legs in groups.items():
+            if len(legs) > 1 and self.adapters(exchange).supports_batch:
+                calls.append((self._pool.submit(self._execute_batch, legs), legs))
+            else:
+                calls.extend((self._pool.submit(self._execute_and_record, leg), [leg]) for leg in legs)
+        for future, legs in calls:
+            self._track_ack(future, legs[0].exchange)
+
+        result = BasketResult()
+        done = Future()
+        remaining = [len(calls)]
+        lock = threading.Lock()
+
+        def collect(future, legs):
+            with lock:
+                try:
+                    fills = future.result()
+                    for fill in (fills if isinstance(fills, list) else [fills]):
+                        result.add(fill)
+                except Exception as e:
+                    for leg in legs:
+                        result.add(trade=leg, error=e)
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                done.set_result(result)
+
+        if not calls:
+            done.set_result(result)
+        for future, legs in calls:
+            future.add_done_callback(lambda f, legs=legs: collect(f, legs))
+        if callback is not None:
+            done.add_done_callback(callback)
+        return done
+
+    def cancel_order(self, exchange, subaccount, symbol, order_id):
+        """Cancel a resting order on a worker thread; the Future resolves to True if it was cancelled."""
+        def cancel():
+            self.rate_limiter.acquire(exchange, key=subaccount, priority=PRIORITY_ORDER)
+            return self.adapters(exchange).cancel_order(subaccount, symbol, order_id, self._credentials(exchange, subaccount))
+        return self._pool.submit(cancel)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    @staticmethod
+    def _track_ack(future, exchange):
+        # Submit-to-ack covers queueing, rate-limit waits and the exchange round trip
+        start = time.perf_counter()
+        histogram = get_metrics().histogram("submit_to_ack_seconds", exchange=exchange)
+        future.add_done_callback(lambda _: histogram.record(time.perf_counter() - start))
+
+    def _execute_and_record(self, trade: TradeRequest):
+        try:
+            fill = self.execute_trade(trade)
+        except Exception as e:
+            self.journal.record(trade, error=e)
+            raise
+        self.journal.record(trade, fill)
+        return fill
+
+    def _execute_batch(self, trades):
+        exchange, subaccount = trades[0].exchange, trades[0].subaccount
+        try:
+            self.rate_limiter.acquire(exchange, key=subaccount, weight=len(trades), priority=PRIORITY_ORDER)
+            fills = self.adapters(exchange).place_orders(trades, self._credentials(exchange, subaccount))
+        except Exception as e:
+            for trade in trades:
+                self.journal.record(trade, error=e)
+            raise
+        for trade, fill in zip(trades, fills):
+            self._record_fill(trade, fill)
+            self.journal.record(trade, fill)
+        return fills
+
+    def execute_trade(self, trade: TradeRequest) -> Fill:
+        """Send a trade request to its exchange's adapter and return the resulting Fill."""
+        # Orders share the exchange's budget with polling but are always first in line
+        self.rate_limiter.acquire(trade.exchange, key=trade.subaccount, priority=PRIORITY_ORDER)
+        adapter = self.adapters(trade.exchange)
+        fill = adapter.place_order(trade, self._credentials(trade.exchange, trade.subaccount))
+        self._record_fill(trade, fill)
+        return fill
+
+    def _record_fill(self, trade, fill):
+        if fill.amount > 0:
+            with self._fills_lock:
+                self.fills.append(fill)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        # Only the LogRecord is built here; the message and the Fill's JSON form are produced
+        # on the logging listener thread (see DeferredQueueHandler). Fills are frozen, so sharing one is safe.
+        logger.info(
+            "Trade %s: Exchange: %s, Subaccount: %s, Symbol: %s, Side: %s, "
+            "Order Type: %s, Amount: %s, Price: %s, Filled: %s @ %s",
+            fill.status, trade.exchange, trade.subaccount, trade.symbol, trade.side,
+            trade.order_type, trade.amount, trade.price or "Market", fill.amount, fill.price,
+            extra={"trade": fill},
         )
 
-        print(f"[TRADE] Executing: {trade_info}")
-        logging.info(f"Simulated trade executed: {trade_info}")
-
-        # Simulate processing time
-        time.sleep(1)
-
-        # Return mock result
-        return {
-            "status": "success",
-            "exchange": trade.exchange,
-            "subaccount": trade.subaccount,
-            "symbol": trade.symbol,
-            "side": trade.side,
-            "order_type": trade.order_type,
-            "price": trade.price or "market",
-            "amount": trade.amount,
-            "timestamp": int(time.time())
-        }
+    @staticmethod
+    def _credentials(exchange, subaccount):
+        return copy_api_keys(exchange, subaccount)
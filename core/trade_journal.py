@@ -0,0 +1,193 @@
+# core/trade_journal.py
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from core.models import Fill, TradeRequest
+
+JOURNAL_FILE = os.path.join("data", "trades.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    exchange TEXT NOT NULL,
+    subaccount TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    order_type TEXT NOT NULL,
+    amount REAL NOT NULL,
+    price REAL,
+    status TEXT NOT NULL,
+    filled_amount REAL,
+    fill_price REAL,
+    error TEXT,
+    order_id TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_account_ts ON trades (exchange, subaccount, ts);
+CREATE INDEX IF NOT EXISTS trades_symbol_ts ON trades (symbol, ts);
+CREATE INDEX IF NOT EXISTS trades_ts ON trades (ts);
+"""
+
+INSERT = (
+    "INSERT INTO trades (ts, exchange, subaccount, symbol, side, order_type, amount, price,"
+    " status, filled_amount, fill_price, error, order_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+COLUMNS = ("id", "ts", "exchange", "subaccount", "symbol", "side", "order_type", "amount", "price",
+           "status", "filled_amount", "fill_price", "error", "order_id")
+
+
+class TradeJournal:
+    """
+    Append-only SQLite journal of every trade request and its outcome.
+    record() only queues a row; a writer thread drains the queue and commits whatever
+    has accumulated in one transaction (group commit), so callers never wait on disk.
+    The database runs in WAL mode, so queries read concurrently with the writer.
+    """
+
+    def __init__(self, path=JOURNAL_FILE, batch_size=500, flush_interval=0.2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue = queue.Queue()
+        self._read_conn = self._connect()
+        self._read_conn.executescript(SCHEMA)
+        self._read_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="TradeJournal", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # Durable at each WAL checkpoint; fine for a journal
+        return conn
+
+    # --- Writing ---------------------------------------------------------
+
+    def record(self, trade: TradeRequest, fill: Fill = None, error=None):
+        """Queue one trade and its result (a Fill, or the error that stopped it)."""
+        if self._closed:
+            return
+        if fill is not None:
+            row = (fill.timestamp, trade.exchange, trade.subaccount, trade.symbol, trade.side,
+                   trade.order_type, trade.amount, trade.price, fill.status, fill.amount, fill.price, None,
+                   fill.order_id)
+        else:
+            row = (time.time(), trade.exchange, trade.subaccount, trade.symbol, trade.side,
+                   trade.order_type, trade.amount, trade.price, "error" if error else "submitted",
+                   None, None, str(error) if error else None, None)
+        self._queue.put(row)
+
+    def flush(self):
+        """Block until every queued row has been committed."""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+
+    def _write_loop(self):
+        conn = self._connect()
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch = [] if item is None else [item]
+            stop = item is None
+            deadline = time.monotonic() + self.flush_interval
+            # Gather whatever else arrives within the flush interval, up to batch_size rows
+            while not stop and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            try:
+                if batch:
+                    with conn:
+                        conn.executemany(INSERT, batch)
+            except sqlite3.Error as e:
+                print(f"[TradeJournal] Failed to write {len(batch)} trades: {e}")
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+        conn.close()
+
+    # --- Queries ---------------------------------------------------------
+
+    def query(self, exchange=None, subaccount=None, symbol=None, start=None, end=None, limit=None):
+        """Return trades as dicts, newest first, filtered on any combination of the arguments."""
+        where, params = self._filters(exchange, subaccount, symbol, start, end)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM trades{where} ORDER BY ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._read_lock:
+            rows = self._read_conn.execute(sql, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def positions(self, exchange=None, subaccount=None, symbol=None, start=None, end=None):
+        """
+        Net filled amount and net cost per symbol over the selected trades.
+        Returns {symbol: {"net_amount", "net_cost", "trades"}}; net_cost is positive when money went out.
+        """
+        where, params = self._filters(exchange, subaccount, symbol, start, end)
+        filled = "filled_amount > 0"
+        where = f"{where} AND {filled}" if where else f" WHERE {filled}"
+        sql = (
+            "SELECT symbol,"
+            " SUM(CASE side WHEN 'Buy' THEN filled_amount ELSE -filled_amount END),"
+            " SUM(CASE side WHEN 'Buy' THEN 1 ELSE -1 END * filled_amount * COALESCE(fill_price, 0)),"
+            f" COUNT(*) FROM trades{where} GROUP BY symbol"
+        )
+        with self._read_lock:
+            rows = self._read_conn.execute(sql, params).fetchall()
+        return {sym: {"net_amount": amount, "net_cost": cost, "trades": count} for sym, amount, cost, count in rows}
+
+    @staticmethod
+    def _filters(exchange, subaccount, symbol, start, end):
+        clauses = []
+        params = []
+        for column, value in (("exchange", exchange), ("subaccount", subaccount), ("symbol", symbol)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_trade_journal():
+    """Return the process-wide TradeJournal, opening it on first use."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = TradeJournal()
+            atexit.register(_journal.close)
+        return _journal
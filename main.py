@@ -1,5 +1,7 @@
 # Entry point
-from ui.main_window import run_app
+import sys
+
+from quicktrade import main
 
 if __name__ == '__main__':
-    run_app()
+    sys.exit(main())
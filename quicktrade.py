@@ -1,6 +1,30 @@
 # quicktrade.py
 
-from ui.main_window import run_app
+import sys
+
+from core.startup_profile import start_from_argv
+
+HEADLESS_FLAG = "--headless"
+
+
+def main(argv=None):
+    """
+    Command-line entry point shared by quicktrade.py and main.py.
+    --headless runs the core engine without the GUI; everything else starts the GUI,
+    --profile-startup included.
+    """
+    argv = sys.argv if argv is None else argv
+    if HEADLESS_FLAG in argv:
+        # Core only: PyQt6 is never imported in this mode
+        argv.remove(HEADLESS_FLAG)
+        from core.headless import main as run_headless
+        return run_headless(argv[1:])
+    # Must run before the UI is imported so the profile covers module imports
+    profiler = start_from_argv(argv)
+    with profiler.phase("import ui.main_window"):
+        from ui.main_window import run_app
+    return run_app()
+
 
 if __name__ == "__main__":
-    run_app()
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# tests/conftest.py
+
+import os
+
+import pytest
+
+# Qt must never try to open a display while testing
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from core.config_store import flush_all  # noqa: E402
+from core.market_cache import MarketDataCache  # noqa: E402
+from core.rate_limiter import RateLimiter  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory so config/, data/ and cache/ never touch the real ones."""
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    flush_all()  # Delayed config writes must land here, before the old cwd is restored
+
+
+@pytest.fixture
+def market_cache(tmp_path):
+    cache = MarketDataCache(str(tmp_path / "market_data.db"), flush_interval=0.05)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def unlimited_rate_limiter():
+    """Exchange request budgets are tested on their own; elsewhere they would only slow tests down."""
+    return RateLimiter(limits={}, default_limit=(10 ** 9, 1e9), key_limit=None)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """One offscreen QApplication for every Qt test."""
+    widgets = pytest.importorskip("PyQt6.QtWidgets")
+    return widgets.QApplication.instance() or widgets.QApplication([])
@@ -0,0 +1,81 @@
+# tests/test_balance_model.py
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from ui.balance_model import MAX_REMOVE_RUNS, VALUE_COLUMN, BalanceTableModel, DustFilterProxyModel  # noqa: E402
+
+
+def _row(sub, asset, value):
+    return {"exchange": "Bybit", "subaccount": sub, "asset": asset, "amount": 1.0, "usd_value": value}
+
+
+@pytest.fixture
+def model(qapp):
+    return BalanceTableModel()
+
+
+@pytest.fixture
+def signals(model):
+    """Every change notification the model sends, in order."""
+    seen = []
+    model.rowsInserted.connect(lambda parent, first, last: seen.append(("inserted", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: seen.append(("removed", first, last)))
+    model.dataChanged.connect(lambda top, bottom, roles=(): seen.append(("changed", top.row(), top.column())))
+    model.modelReset.connect(lambda: seen.append(("reset",)))
+    model.totals_changed.connect(lambda: seen.append(("totals",)))
+    return seen
+
+
+def test_new_rows_are_inserted_in_one_block(model, signals):
+    model.upsert([_row("main", "BTC", 100.0), _row("main", "ETH", 50.0), _row("alt", "BTC", 0.5)])
+    assert signals == [("inserted", 0, 2), ("totals",)]
+    assert model.rowCount() == 3 and model.data(model.index(0, VALUE_COLUMN)) == "$100.00"
+
+
+def test_unchanged_values_send_nothing(model, signals):
+    rows = [_row("main", "BTC", 100.0), _row("main", "ETH", 50.0)]
+    model.upsert(rows)
+    signals.clear()
+    model.upsert(rows)
+    model.set_balances(rows)
+    assert signals == []
+
+
+def test_only_changed_cells_are_repainted(model, signals):
+    model.upsert([_row("main", "BTC", 100.0), _row("main", "ETH", 50.0)])
+    signals.clear()
+    model.upsert([_row("main", "BTC", 100.0), _row("main", "ETH", 60.0), _row("main", "SOL", 5.0)])
+    assert signals == [("changed", 1, VALUE_COLUMN), ("inserted", 2, 2), ("totals",)]
+    assert model.visible_total(show_dust=True) == 165.0
+
+
+def test_set_balances_removes_only_missing_rows(model, signals):
+    model.upsert([_row("main", asset, 10.0) for asset in ("BTC", "ETH", "SOL", "XRP")])
+    signals.clear()
+    model.set_balances([_row("main", asset, 10.0) for asset in ("BTC", "SOL", "XRP")])
+    assert signals == [("removed", 1, 1), ("totals",)]
+    assert [model.data(model.index(row, 2)) for row in range(3)] == ["BTC", "SOL", "XRP"]
+
+
+def test_scattered_bulk_removal_resets_once(model, signals):
+    model.upsert([_row("main", f"A{i:03d}", 10.0) for i in range(4 * MAX_REMOVE_RUNS)])
+    signals.clear()
+    model.remove_keys([("Bybit", "main", f"A{i:03d}") for i in range(0, 4 * MAX_REMOVE_RUNS, 2)])
+    assert signals == [("reset",), ("totals",)]
+    assert model.rowCount() == 2 * MAX_REMOVE_RUNS
+
+
+def test_dust_filter_follows_value_updates(model):
+    proxy = DustFilterProxyModel()
+    proxy.setSourceModel(model)
+    model.upsert([_row("main", "BTC", 100.0), _row("main", "DOGE", 0.2)])
+    assert proxy.rowCount() == 1
+    proxy.set_show_dust(True)
+    assert proxy.rowCount() == 2
+    proxy.set_show_dust(False)
+
+    model.upsert([_row("main", "DOGE", 3.0)])  # No longer dust
+    assert proxy.rowCount() == 2
+    assert model.visible_total(show_dust=False) == 103.0
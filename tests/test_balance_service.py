@@ -0,0 +1,157 @@
+# tests/test_balance_service.py
+
+import threading
+import time
+
+import pytest
+
+from core.balance_service import BalanceAggregator, FakeBalanceBackend
+from core.rate_limiter import RateLimiter
+
+
+class StubPrices:
+    """Every asset costs 2; records each lookup so batching can be checked."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_prices(self, bases, quotes=("usd",), timeout=None):
+        with self.lock:
+            self.calls.append(sorted(bases))
+        return {(base, quote): 2.0 for base in bases for quote in quotes}
+
+
+@pytest.fixture
+def prices():
+    return StubPrices()
+
+
+def _aggregator(backend, prices, **kwargs):
+    limiter = RateLimiter(limits={}, default_limit=(10 ** 9, 1e9), key_limit=None)
+    return BalanceAggregator(backend=backend, price_fetcher=prices, rate_limiter=limiter, **kwargs)
+
+
+def _refresh(aggregator, accounts):
+    results, errors = {}, {}
+    rows = aggregator.refresh(
+        [(ex, sub, None) for ex, sub in accounts],
+        on_result=lambda ex, sub, account_rows: results.__setitem__((ex, sub), account_rows),
+        on_error=lambda ex, sub, e: errors.__setitem__((ex, sub), e),
+    ).result(timeout=10)
+    return rows, results, errors
+
+
+def test_rows_are_valued_and_stablecoins_count_at_par(prices):
+    backend = FakeBalanceBackend(balances={("Bybit", "main"): {"BTC": 1.5, "USDT": 10.0}})
+    aggregator = _aggregator(backend, prices)
+    rows, results, errors = _refresh(aggregator, [("Bybit", "main")])
+    aggregator.shutdown()
+
+    values = {row["asset"]: row["usd_value"] for row in rows}
+    assert values == {"BTC": 3.0, "USDT": 10.0}
+    assert list(results) == [("Bybit", "main")] and not errors
+    assert prices.calls == [["BTC"]]
+
+
+def test_partial_failure_keeps_the_other_accounts(prices):
+    backend = FakeBalanceBackend(failing={("Kraken", "bad")})
+    aggregator = _aggregator(backend, prices)
+    rows, results, errors = _refresh(aggregator, [("Kraken", "bad"), ("Kraken", "good"), ("Bybit", "main")])
+    aggregator.shutdown()
+
+    assert set(results) == {("Kraken", "good"), ("Bybit", "main")}
+    assert isinstance(errors[("Kraken", "bad")], ConnectionError)
+    assert {(row["exchange"], row["subaccount"]) for row in rows} == set(results)
+
+
+def test_timeout_reports_slow_accounts_and_frees_their_slots(prices):
+    backend = FakeBalanceBackend(latency=lambda ex, sub: 5.0 if sub.startswith("slow") else 0.01)
+    aggregator = _aggregator(backend, prices, timeout=0.3, max_per_exchange=1)
+    accounts = [("Slow", f"slow{i}") for i in range(3)] + [("Fast", f"fast{i}") for i in range(3)]
+
+    start = time.monotonic()
+    _, results, errors = _refresh(aggregator, accounts)
+    assert time.monotonic() - start < 2
+    assert set(results) == {("Fast", f"fast{i}") for i in range(3)}
+    assert set(errors) == {("Slow", f"slow{i}") for i in range(3)}
+    assert all(isinstance(e, TimeoutError) for e in errors.values())
+
+    # The running request gave up at the deadline and the queued ones never started
+    deadline = time.monotonic() + 2
+    while aggregator._running.get("Slow") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert aggregator._running["Slow"] == 0 and not aggregator._waiting["Slow"]
+    aggregator.shutdown()
+
+
+def test_busy_exchange_does_not_hold_up_others(prices):
+    # One pool thread per exchange slot: a blocked exchange must not starve the queue behind it
+    backend = FakeBalanceBackend(latency=lambda ex, sub: 0.3 if ex == "Busy" else 0.0)
+    aggregator = _aggregator(backend, prices, max_per_exchange=1, max_workers=2, timeout=5)
+    arrived = {}
+    start = time.monotonic()
+    aggregator.refresh(
+        [("Busy", f"b{i}", None) for i in range(4)] + [("Idle", f"i{i}", None) for i in range(4)],
+        on_result=lambda ex, sub, rows: arrived.setdefault(ex, {}).setdefault(sub, time.monotonic() - start),
+    ).result(timeout=10)
+    aggregator.shutdown()
+
+    assert len(arrived["Idle"]) == 4 and max(arrived["Idle"].values()) < 0.3
+    assert len(arrived["Busy"]) == 4
+
+
+def test_price_lookups_are_shared_across_accounts(prices):
+    balances = {("X", f"s{i}"): {"BTC": 1.0, "ETH": 1.0} for i in range(20)}
+    aggregator = _aggregator(FakeBalanceBackend(balances=balances), prices)
+    rows, _, _ = _refresh(aggregator, list(balances))
+    aggregator.shutdown()
+
+    assert len(rows) == 40
+    priced = [asset for call in prices.calls for asset in call]
+    assert sorted(priced) == ["BTC", "ETH"]  # Each asset looked up once per refresh
+
+
+class GatedPrices(StubPrices):
+    """Lookups block until released (or their timeout runs out)."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def get_prices(self, bases, quotes=("usd",), timeout=None):
+        if not self.release.wait(timeout):
+            return {}
+        return super().get_prices(bases, quotes)
+
+
+def test_rows_arrive_before_prices_and_are_revalued():
+    prices = GatedPrices()
+    backend = FakeBalanceBackend(balances={("Bybit", "main"): {"BTC": 1.0, "USDT": 5.0}})
+    aggregator = _aggregator(backend, prices, timeout=5)
+    emitted = []
+    future = aggregator.refresh([("Bybit", "main", None)],
+                                on_result=lambda ex, sub, rows: emitted.append({r["asset"]: r["usd_value"] for r in rows}))
+
+    deadline = time.monotonic() + 2
+    while not emitted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert emitted == [{"BTC": 0.0, "USDT": 5.0}]  # Unpriced, but shown without waiting for the lookup
+    prices.release.set()
+    rows = future.result(timeout=5)
+    aggregator.shutdown()
+
+    assert emitted[-1] == {"BTC": 2.0, "USDT": 5.0}
+    assert {row["asset"]: row["usd_value"] for row in rows} == {"BTC": 2.0, "USDT": 5.0}
+
+
+def test_price_lookup_is_bounded_by_the_refresh_deadline():
+    prices = GatedPrices()
+    backend = FakeBalanceBackend(balances={("Bybit", "main"): {"BTC": 1.0}})
+    aggregator = _aggregator(backend, prices, timeout=0.3)
+
+    start = time.monotonic()
+    rows, results, errors = _refresh(aggregator, [("Bybit", "main")])
+    assert time.monotonic() - start < 2
+    assert rows == results[("Bybit", "main")] and rows[0]["usd_value"] == 0.0 and not errors
+    aggregator.shutdown()
@@ -0,0 +1,66 @@
+# tests/test_config_store.py
+
+import json
+import threading
+
+from core.config_store import JsonStore
+
+
+def test_saves_are_serialized_once_on_flush(tmp_path, monkeypatch):
+    store = JsonStore(str(tmp_path / "keys.json"), write_delay=60)
+    payloads = []
+    monkeypatch.setattr(store, "_write", payloads.append)
+
+    for i in range(100):
+        with store.edit() as data:
+            data[f"Sub{i}"] = {"api_key": str(i)}
+    assert payloads == []  # Saving only marks the store dirty
+
+    store.flush()
+    store.flush()
+    assert len(payloads) == 1 and len(json.loads(payloads[0])) == 100
+
+
+def test_flush_writes_the_file_atomically(tmp_path):
+    path = tmp_path / "config" / "prefs.json"
+    store = JsonStore(str(path), write_delay=60)
+    store.save({"enabled_exchanges": ["Bybit"]})
+    assert not path.exists()
+
+    store.flush()
+    assert json.loads(path.read_text()) == {"enabled_exchanges": ["Bybit"]}
+    assert [p.name for p in path.parent.iterdir()] == ["prefs.json"]
+    assert JsonStore(str(path)).load() == {"enabled_exchanges": ["Bybit"]}
+
+
+def test_snapshots_are_copies_taken_under_the_lock(tmp_path):
+    store = JsonStore(str(tmp_path / "keys.json"), write_delay=60)
+    store.save({"Bybit": {"main": {"api_key": "a"}}})
+
+    creds = store.snapshot("Bybit", "main")
+    creds["api_key"] = "changed"
+    assert store.load()["Bybit"]["main"]["api_key"] == "a"
+    assert store.snapshot("Bybit", "missing") is None
+
+    # A writer inside edit() holds the lock, so a snapshot never sees a half-made change
+    entered, release = threading.Event(), threading.Event()
+
+    def writer():
+        with store.edit() as data:
+            data["Kraken"] = {}
+            entered.set()
+            release.wait(5)
+            data["Kraken"]["sub"] = {"api_key": "b"}
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    entered.wait(5)
+    snapshots = []
+    reader = threading.Thread(target=lambda: snapshots.append(store.snapshot("Kraken")))
+    reader.start()
+    reader.join(0.1)
+    assert snapshots == []
+    release.set()
+    thread.join(5)
+    reader.join(5)
+    assert snapshots == [{"sub": {"api_key": "b"}}]
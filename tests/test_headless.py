@@ -0,0 +1,124 @@
+# tests/test_headless.py
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from core.balance_service import BalanceAggregator, FakeBalanceBackend
+from core.headless import HeadlessEngine, LineClient
+from core.market_catalog import MarketCatalog
+from core.order_validation import RuleCache
+from core.price_feed import PriceFeed
+from core.sim_exchange import SimulatedExchange
+from core.trade_executor import TradeExecutor
+from core.trade_journal import TradeJournal
+
+
+class StubPrices:
+    def get_prices(self, bases, quotes=("usd",), timeout=None):
+        return {(base, quote): 2.0 for base in bases for quote in quotes}
+
+
+class CountingAggregator(BalanceAggregator):
+    """Counts refreshes; each one takes a little while, so requests can overlap."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.refreshes = 0
+
+    def refresh(self, accounts=None, on_result=None, on_error=None):
+        self.refreshes += 1
+        return super().refresh(accounts, on_result, on_error)
+
+    def accounts(self):
+        return [("Bybit", "main", None), ("Bybit", "bad", None)]
+
+
+@pytest.fixture
+def engine(tmp_path, market_cache, unlimited_rate_limiter):
+    exchange = SimulatedExchange("Bybit", seed=1)
+    journal = TradeJournal(str(tmp_path / "trades.db"))
+    executor = TradeExecutor(journal=journal, rate_limiter=unlimited_rate_limiter, adapters=lambda name: exchange)
+    aggregator = CountingAggregator(
+        backend=FakeBalanceBackend(latency=0.1, failing={("Bybit", "bad")}),
+        price_fetcher=StubPrices(), rate_limiter=unlimited_rate_limiter,
+    )
+    catalog = MarketCatalog(http=object(), loaders={}, store=market_cache)
+    engine = HeadlessEngine(executor=executor, price_feed=PriceFeed(exchanges=[], cache=market_cache),
+                            aggregator=aggregator, rule_cache=RuleCache(catalog), cache=market_cache)
+    yield engine
+    asyncio.run(engine.stop())
+    journal.close()
+
+
+def _session(engine, requests):
+    """Send each request as one JSON line (strings are sent verbatim); return the replies by id."""
+    output = []
+
+    async def lines():
+        for request in requests:
+            yield request if isinstance(request, str) else json.dumps(request)
+
+    async def run():
+        await engine.start()
+        await LineClient(output.append).serve(engine, lines())
+
+    asyncio.run(run())
+    replies = [json.loads(data) for data in output]
+    return {reply.get("id"): reply for reply in replies if "event" not in reply}
+
+
+ORDER = {"op": "order", "exchange": "Bybit", "subaccount": "main", "symbol": "BTC/USDT", "side": "Buy"}
+
+
+def test_market_order_fills(engine):
+    replies = _session(engine, [dict(ORDER, id=1, amount="0.01")])
+    assert replies[1]["ok"] is True
+    assert replies[1]["fill"]["status"] == "filled"
+    assert replies[1]["fill"]["amount"] == pytest.approx(0.01)
+
+
+def test_resting_limit_order_can_be_cancelled(engine):
+    replies = _session(engine, [dict(ORDER, id=1, amount="0.01", order_type="Limit", price="1000")])
+    fill = replies[1]["fill"]
+    assert fill["status"] == "open" and fill["order_id"]
+
+    cancel = {"op": "cancel", "exchange": "Bybit", "subaccount": "main", "symbol": "BTC/USDT"}
+    replies = _session(engine, [dict(cancel, id=2, order_id=fill["order_id"]),
+                                dict(cancel, id=3, order_id=fill["order_id"])])
+    # Requests in a session run concurrently: either cancel may win, the other finds the order gone
+    assert replies[2]["ok"] and replies[3]["ok"]
+    assert sorted([replies[2]["cancelled"], replies[3]["cancelled"]]) == [False, True]
+
+
+def test_bad_input_is_reported_to_the_client(engine):
+    replies = _session(engine, [
+        "{not json",
+        {"id": 1, "op": "nope"},
+        {"id": 2, "op": "order", "exchange": "Bybit", "symbol": "BTC/USDT"},
+        dict(ORDER, id=3, exchange="Nope", amount="1"),
+        dict(ORDER, id=4, amount="-1"),
+        dict(ORDER, id=5, amount="1", side="Sideways"),
+    ])
+    assert replies[None]["error"].startswith("Invalid JSON")
+    assert replies[1]["error"] == "Unknown op 'nope'."
+    assert replies[2]["error"] == "Missing field 'subaccount'."
+    assert replies[3]["error"] == "Unknown exchange 'Nope'."
+    assert replies[4]["error"] == "Amount must be greater than zero."
+    assert "Unknown side" in replies[5]["error"]
+    assert not any(reply["ok"] for reply in replies.values())
+
+
+def test_overlapping_refreshes_share_one_fetch(engine):
+    start = time.monotonic()
+    replies = _session(engine, [{"id": 1, "op": "balances", "refresh": True},
+                                {"id": 2, "op": "balances", "refresh": True}])
+    assert time.monotonic() - start < 5
+    assert engine.aggregator.refreshes == 1
+    for reply in replies.values():
+        assert reply["ok"] is True
+        assert {row["subaccount"] for row in reply["rows"]} == {"main"}
+        assert reply["failed"][0]["subaccount"] == "bad"
+    assert replies[1]["total"] == replies[2]["total"] > 0
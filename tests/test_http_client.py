@@ -0,0 +1,196 @@
+# tests/test_http_client.py
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from core.http_client import HttpClient, SingleFlight
+from core.price_fetcher import PriceFetcher
+from core.rate_limiter import RateLimiter
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local CoinGecko stand-in. /api/v3/simple/price answers like the real endpoint after
+    `delay` seconds, or with 429 and Retry-After while `throttled`; /flaky fails with 503
+    `failures` times first; /slow never answers in time.
+    Counts requests and the client ports they came from (one per pooled connection).
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.requests = []
+        self.ports = set()
+        self.delay = 0.0
+        self.failures = 0
+        self.throttled = False
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse can be observed
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.ports.add(self.client_address[1])
+        url = urlparse(self.path)
+        if url.path == "/flaky":
+            with server.lock:
+                fail = server.failures > 0
+                server.failures -= 1
+            return self._reply(503, {"error": "busy"}) if fail else self._reply(200, {"ok": True})
+        if url.path == "/slow":
+            time.sleep(1.0)
+            return self._reply(200, {})
+        if server.throttled:
+            return self._reply(429, {"error": "slow down"}, {"Retry-After": "7"})
+        query = parse_qs(url.query)
+        time.sleep(server.delay)
+        ids = query["ids"][0].split(",")
+        quotes = query["vs_currencies"][0].split(",")
+        self._reply(200, {coin: {quote: 100.0 + len(coin) for quote in quotes} for coin in ids})
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http():
+    client = HttpClient(backoff_factor=0)
+    yield client
+    client.close()
+
+
+def test_connections_are_reused(server, http):
+    for _ in range(5):
+        assert http.get_json(server.url + "/api/v3/simple/price", {"ids": "bitcoin", "vs_currencies": "usd"})
+    assert len(server.requests) == 5
+    assert len(server.ports) == 1
+
+
+def test_transient_errors_are_retried(server, http):
+    server.failures = 2
+    assert http.get_json(server.url + "/flaky") == {"ok": True}
+    assert len(server.requests) == 3
+
+
+def test_backoff_is_capped(server):
+    client = HttpClient(backoff_factor=30, backoff_max=0.05)
+    server.failures = 2
+    start = time.monotonic()
+    try:
+        assert client.get_json(server.url + "/flaky") == {"ok": True}
+    finally:
+        client.close()
+    assert time.monotonic() - start < 1
+
+
+def test_throttling_is_left_to_the_rate_limiter(server, http, market_cache):
+    class RecordingLimiter(RateLimiter):
+        def penalize(self, exchange, retry_after, key=None):
+            penalties.append((exchange, retry_after))
+
+    penalties = []
+    server.throttled = True
+    fetcher = PriceFetcher(base_url=server.url + "/api/v3", http=http, store=market_cache,
+                           rate_limiter=RecordingLimiter(limits={}, default_limit=(10 ** 9, 1e9), key_limit=None))
+    start = time.monotonic()
+    assert fetcher.get_prices(["BTC"]) == {("BTC", "usd"): 0.0}
+
+    assert len(server.requests) == 1  # No retry, and no sleeping through Retry-After inside urllib3
+    assert time.monotonic() - start < 1
+    assert penalties == [("CoinGecko", 7.0)]
+
+
+def test_every_request_has_a_timeout(server):
+    client = HttpClient(timeout=(1, 0.2), retries=0)
+    start = time.monotonic()
+    try:
+        with pytest.raises(requests.RequestException):
+            client.get_json(server.url + "/slow")
+    finally:
+        client.close()
+    assert time.monotonic() - start < 0.9
+
+
+def test_single_flight_shares_one_fetch():
+    flight = SingleFlight()
+    owned, waiting = flight.claim(["a", "b"])
+    assert sorted(owned) == ["a", "b"] and not waiting
+    owned_again, waiting_again = flight.claim(["b", "c"])
+    assert owned_again == ["c"] and list(waiting_again) == ["b"]
+
+    flight.resolve(owned, {"a": 1.0})  # b had no result
+    flight.resolve(owned_again, {"c": 3.0})
+    assert waiting_again["b"].result(timeout=1) is None
+    assert flight.claim(["a"]) == (["a"], {})  # Resolved keys are free to fetch again
+
+
+def test_single_flight_coalesces_concurrent_misses():
+    flight = SingleFlight()
+    barrier = threading.Barrier(8)
+    fetches = []
+    waiters = threading.Semaphore(0)
+
+    def lookup(_):
+        barrier.wait()  # Every caller misses at the same moment
+        owned, waiting = flight.claim(["btc"])
+        if owned:
+            fetches.append(owned)
+            for _ in range(7):  # Stay in flight until everyone else has claimed
+                assert waiters.acquire(timeout=5)
+            flight.resolve(owned, {"btc": 42.0})
+            return 42.0
+        waiters.release()
+        return waiting["btc"].result(timeout=5)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lookup, range(8)))
+    assert fetches == [["btc"]]
+    assert results == [42.0] * 8
+
+
+def test_concurrent_price_lookups_make_one_request(server, http, market_cache):
+    server.delay = 0.2  # Long enough for every caller to arrive while the first fetch is in flight
+    fetcher = PriceFetcher(base_url=server.url + "/api/v3", http=http, store=market_cache,
+                           rate_limiter=RateLimiter(limits={}, default_limit=(10 ** 9, 1e9), key_limit=None))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: fetcher.get_prices(["BTC", "ETH"]), range(8)))
+
+    assert len(server.requests) == 1
+    assert all(result == {("BTC", "usd"): 107.0, ("ETH", "usd"): 108.0} for result in results)
+    assert fetcher.get_price("BTC") == 107.0 and len(server.requests) == 1  # Served from the cache
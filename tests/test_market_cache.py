@@ -0,0 +1,71 @@
+# tests/test_market_cache.py
+
+from core.market_cache import MarketDataCache
+
+
+def _row(sub, amount):
+    return {"exchange": "Bybit", "subaccount": sub, "asset": "BTC", "amount": amount, "usd_value": amount * 2}
+
+
+def test_balances_returns_the_snapshot_just_saved(tmp_path):
+    # A writer flushing constantly must never leave balances() reading an older snapshot
+    cache = MarketDataCache(str(tmp_path / "cache.db"), flush_interval=0.0001)
+    try:
+        for i in range(200):
+            cache.save_balances([_row("main", i)], ts=1.0)
+            rows, _ = cache.balances()
+            assert [row["amount"] for row in rows] == [i]
+    finally:
+        cache.close()
+
+
+def test_balances_are_read_without_writing(tmp_path):
+    # balances() runs on the GUI thread: it must not do the writer thread's work
+    path = str(tmp_path / "cache.db")
+    cache = MarketDataCache(path, flush_interval=60)
+    cache.save_balances([_row("main", 3.0)], ts=1.0)
+    rows, _ = cache.balances()
+    assert [row["amount"] for row in rows] == [3.0]
+    assert cache._query("SELECT COUNT(*) FROM balances") == [(0,)]
+    cache.close()
+
+    cache = MarketDataCache(path)
+    try:
+        rows, as_of = cache.balances()
+        assert [row["amount"] for row in rows] == [3.0] and as_of == {("Bybit", "main"): 1.0}
+    finally:
+        cache.close()
+
+
+def test_kept_accounts_keep_their_own_timestamp(market_cache):
+    market_cache.save_balances([_row("main", 1.0), _row("old", 2.0)], ts=500.0, as_of={("Bybit", "old"): 100.0})
+    rows, as_of = market_cache.balances()
+    assert len(rows) == 2
+    assert as_of == {("Bybit", "main"): 500.0, ("Bybit", "old"): 100.0}
+
+
+def test_values_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = MarketDataCache(path)
+    cache.put_prices("CoinGecko", {"bitcoin_usd": 50000.0}, ts=10.0)
+    cache.save_markets("Bybit", [{"symbol": "BTC/USDT"}], fetched_at=20.0)
+    cache.close()
+
+    cache = MarketDataCache(path)
+    try:
+        assert cache.price("CoinGecko", "bitcoin_usd") == (50000.0, 10.0)
+        assert cache.load_markets("Bybit") == ([{"symbol": "BTC/USDT"}], 20.0)
+    finally:
+        cache.close()
+
+
+def test_ticks_fold_into_candles(market_cache):
+    start = 1_800_000_000.0 - 1_800_000_000.0 % 60
+    market_cache.max_candles = 10 ** 9  # Keep the fixed timestamps from being pruned
+    for offset, price in ((1, 10.0), (2, 12.0), (3, 9.0), (61, 11.0)):
+        market_cache.record_tick("Bybit", "BTC/USDT", price, start + offset)
+    market_cache.flush()
+    assert market_cache.candles("Bybit", "BTC/USDT") == [
+        (start, 10.0, 12.0, 9.0, 9.0, 3),
+        (start + 60, 11.0, 11.0, 11.0, 11.0, 1),
+    ]
@@ -0,0 +1,90 @@
+# tests/test_matching_engine.py
+
+import itertools
+
+import pytest
+
+from core.matching_engine import MatchingEngine, Order
+from core.models import TradeRequest
+from core.sim_exchange import SimulatedExchange
+
+_ids = itertools.count(1)
+
+
+def _order(owner, side, price, amount):
+    return Order(f"O{next(_ids)}", owner, side, price, amount)
+
+
+@pytest.fixture
+def engine():
+    return MatchingEngine("BTC/USDT")
+
+
+def test_equal_prices_fill_oldest_first(engine):
+    first, second, third = (_order(owner, "Sell", 100.0, 1.0) for owner in ("a", "b", "c"))
+    for order in (first, second, third):
+        engine.submit(order)
+
+    executions = engine.submit(_order("taker", "Buy", None, 1.5))
+    assert [(e.maker.owner, e.amount) for e in executions] == [("a", 1.0), ("b", 0.5)]
+    assert first.remaining == 0 and second.remaining == 0.5 and third.remaining == 1.0
+    assert first.order_id not in engine.orders and second.order_id in engine.orders
+
+
+def test_market_order_walks_levels_and_partially_fills(engine):
+    for price, amount in ((102.0, 1.0), (100.0, 1.0), (101.0, 2.0)):
+        engine.submit(_order("maker", "Sell", price, amount))
+
+    taker = _order("taker", "Buy", None, 5.0)
+    executions = engine.submit(taker)
+    assert [(e.price, e.amount) for e in executions] == [(100.0, 1.0), (101.0, 2.0), (102.0, 1.0)]
+    assert taker.remaining == 1.0  # The book ran out; market orders never rest
+    assert engine.best_ask() is None and not engine.orders
+    assert engine.last_price == 102.0
+
+
+def test_limit_order_fills_what_crosses_and_rests_the_rest(engine):
+    engine.submit(_order("maker", "Sell", 100.0, 1.0))
+    engine.submit(_order("maker", "Sell", 105.0, 1.0))
+
+    bid = _order("taker", "Buy", 101.0, 3.0)
+    executions = engine.submit(bid)
+    assert [(e.price, e.amount) for e in executions] == [(100.0, 1.0)]
+    assert engine.best_bid() == 101.0 and engine.best_ask() == 105.0
+    assert engine.depth(5) == {"bids": [(101.0, 2.0)], "asks": [(105.0, 1.0)]}
+    assert engine.orders[bid.order_id] is bid
+
+
+def test_cancel_removes_the_order_and_empty_levels(engine):
+    keep = _order("a", "Buy", 99.0, 1.0)
+    gone = _order("b", "Buy", 100.0, 1.0)
+    engine.submit(keep)
+    engine.submit(gone)
+
+    assert engine.cancel(gone.order_id) is gone
+    assert engine.cancel(gone.order_id) is None
+    assert engine.best_bid() == 99.0
+    assert engine.depth(5)["bids"] == [(99.0, 1.0)]
+    assert engine.submit(_order("taker", "Sell", None, 2.0))[0].maker is keep
+
+
+def _run(seed):
+    exchange = SimulatedExchange("Bybit", seed=seed, jitter=0.0)
+    fills = []
+    for i, side in enumerate(["Buy", "Sell", "Buy", "Buy", "Sell"]):
+        trade = TradeRequest("Bybit", f"s{i % 2}", "ETH/USDT", side, 5.0 + i, "Market")
+        fill = exchange.place_order(trade)
+        fills.append((fill.status, fill.amount, fill.price))
+    return fills, exchange.fetch_balances("s0")
+
+
+def test_same_seed_same_fills():
+    first, second = _run(seed=7), _run(seed=7)
+    assert first == second
+    assert all(status == "filled" for status, _, _ in first[0])
+
+
+def test_market_order_with_no_liquidity_is_rejected():
+    exchange = SimulatedExchange("Bybit", seed=1, levels=0)
+    fill = exchange.place_order(TradeRequest("Bybit", "main", "BTC/USDT", "Buy", 1.0, "Market"))
+    assert fill.status == "rejected" and fill.amount == 0 and fill.price is None
@@ -0,0 +1,67 @@
+# tests/test_metrics.py
+
+import random
+
+import pytest
+
+from core.metrics import SUB_BUCKET_BITS, Histogram, Metrics
+
+
+def test_small_values_are_exact_and_buckets_widen_at_powers_of_two():
+    sub_buckets = 1 << SUB_BUCKET_BITS
+    assert [Histogram._index(m) for m in range(sub_buckets)] == list(range(sub_buckets))
+    # From 128us on, each power of two is split into 64 buckets of twice the previous width
+    assert Histogram._index(128) == Histogram._index(129) != Histogram._index(130)
+    assert Histogram._index(255) != Histogram._index(256) == Histogram._index(259) != Histogram._index(260)
+
+    indexes = [Histogram._index(m) for m in range(0, 5_000_000, 997)]
+    assert indexes == sorted(indexes)
+
+
+def test_bucket_values_stay_within_one_percent():
+    rng = random.Random(7)
+    for micros in [rng.randrange(1, 10 ** 9) for _ in range(2000)] + [1, 127, 128, 2 ** 20, 2 ** 20 - 1]:
+        value = Histogram._value(Histogram._index(micros)) * 1e6
+        assert abs(value - micros) <= micros / (1 << (SUB_BUCKET_BITS - 1))
+
+
+def test_percentiles():
+    histogram = Histogram()
+    assert histogram.percentile(50) is None and histogram.mean() is None
+
+    samples = [i / 1000 for i in range(1, 1001)]  # 1ms .. 1s
+    random.Random(3).shuffle(samples)
+    for sample in samples:
+        histogram.record(sample)
+
+    p50, p90, p99, p100 = histogram.percentiles([50, 90, 99, 100])
+    assert p50 == pytest.approx(0.5, rel=0.01)
+    assert p90 == pytest.approx(0.9, rel=0.01)
+    assert p99 == pytest.approx(0.99, rel=0.01)
+    assert p100 == 1.0  # Clamped to the recorded max rather than the bucket's midpoint
+    assert histogram.percentile(0) == pytest.approx(0.001, rel=0.01)
+    assert histogram.count == 1000 and histogram.mean() == pytest.approx(0.5005)
+
+    histogram.reset()
+    assert histogram.count == 0 and histogram.percentile(99) is None
+
+
+def test_prometheus_text():
+    metrics = Metrics()
+    for seconds in (0.010, 0.020, 0.030):
+        metrics.record("submit_to_ack_seconds", seconds, exchange="Bybit")
+    metrics.record("submit_to_ack_seconds", 0.5, exchange='Bad "name"')
+    metrics.record("startup_seconds", 1.25)
+
+    lines = metrics.prometheus_text().splitlines()
+    assert lines.count("# TYPE quicktrade_submit_to_ack_seconds summary") == 1
+    assert lines.count("# TYPE quicktrade_startup_seconds summary") == 1
+    samples = dict(line.rsplit(" ", 1) for line in lines if not line.startswith("#"))
+    bybit = 'quicktrade_submit_to_ack_seconds{exchange="Bybit",quantile="%s"}'
+    assert float(samples[bybit % "0.5"]) == pytest.approx(0.02, rel=0.01)  # Bucket midpoint
+    assert samples[bybit % "0.999"] == "0.030000"
+    assert 'quicktrade_submit_to_ack_seconds_sum{exchange="Bybit"} 0.060000' in lines
+    assert 'quicktrade_submit_to_ack_seconds_count{exchange="Bybit"} 3' in lines
+    assert 'quicktrade_submit_to_ack_seconds_count{exchange="Bad \\"name\\""} 1' in lines
+    assert 'quicktrade_startup_seconds{quantile="0.9"} 1.250000' in lines
+    assert "quicktrade_startup_seconds_count 1" in lines  # No labels, no braces
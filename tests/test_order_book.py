@@ -0,0 +1,49 @@
+# tests/test_order_book.py
+
+import os
+
+import pytest
+
+from core.order_book import OrderBook, OrderBookManager, SequenceGapError
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def test_replay_applies_deltas_and_recovers_from_a_gap(capsys):
+    books = OrderBookManager()
+    # The duplicate 102 and both deltas after the gap (105, 106) are dropped
+    applied = books.replay(os.path.join(FIXTURES, "bybit_btcusdt_book.jsonl"))
+    bybit, kraken = 3 + 2, 2  # snapshot 100 + 101 + 102, snapshot 200 + 201; snapshot + delta
+    assert applied == bybit + kraken
+
+    book = books.get("Bybit", "BTC/USDT")
+    assert book.synced and book.sequence == 201
+    assert book.depth(5) == {"bids": [(59950.0, 0.25), (59900.0, 1.0)], "asks": [(60100.0, 1.0)]}
+    assert "expected sequence 103, got 105" in capsys.readouterr().out
+
+    # Books without sequence numbers take every delta
+    eth = books.get("Kraken", "ETH/USD")
+    assert eth.best_bid() == (2999.0, 1.0)
+    assert eth.spread() == 1.5
+
+
+def test_gap_unsyncs_until_the_next_snapshot():
+    book = OrderBook("Bybit", "BTC/USDT")
+    assert book.apply_delta([(1.0, 1.0)], [], sequence=1) is False  # Nothing to apply to yet
+    book.apply_snapshot([(100.0, 1.0)], [(101.0, 1.0)], sequence=10)
+    with pytest.raises(SequenceGapError):
+        book.apply_delta([(99.0, 1.0)], [], sequence=12)
+    assert not book.synced
+    assert book.apply_delta([(99.0, 1.0)], [], sequence=13) is False
+    assert book.best_bid() == (100.0, 1.0)
+
+
+def test_levels_stay_sorted_and_vwap_walks_the_book():
+    book = OrderBook("X", "BTC/USDT")
+    book.apply_snapshot([], [])
+    for price in (105.0, 101.0, 103.0, 102.0, 104.0):
+        book.apply_delta([], [(price, 1.0)])
+    book.apply_delta([], [(103.0, 0)])
+    assert [price for price, _ in book.asks.levels()] == [101.0, 102.0, 104.0, 105.0]
+    assert book.vwap("Buy", 2.5) == pytest.approx(((101.0 + 102.0 + 104.0 * 0.5) / 2.5, 2.5))
+    assert book.vwap("Buy", 10)[1] == 4.0
@@ -0,0 +1,49 @@
+# tests/test_order_validation.py
+
+import pytest
+
+from core.market_catalog import MarketCatalog, make_market
+from core.order_validation import MarketRules, OrderValidationError, RuleCache, build_trade_request
+
+
+@pytest.mark.parametrize("tick, price, side, expected", [
+    (0.125, 0.40, "Buy", 0.375),
+    (0.125, 0.40, "Sell", 0.5),
+    (0.25, 1.30, "Buy", 1.25),
+    (0.25, 1.30, "Sell", 1.5),
+    (5, 12, "Buy", 10),
+    (5, 12, "Sell", 15),
+    (0.01, 1.234, "Buy", 1.23),
+])
+def test_round_price_stays_on_grid(tick, price, side, expected):
+    assert MarketRules(tick_size=tick).round_price(price, side) == expected
+
+
+@pytest.mark.parametrize("lot, amount, expected", [
+    (0.125, 1.3, 1.25),
+    (5, 12, 10),
+    (0.001, 0.0019, 0.001),
+])
+def test_round_amount_rounds_down_to_lots(lot, amount, expected):
+    assert MarketRules(lot_size=lot).round_amount(amount) == expected
+
+
+def test_min_notional_rejects_small_orders():
+    rules = MarketRules(tick_size=0.01, lot_size=0.001, min_notional=5)
+    with pytest.raises(OrderValidationError, match="below the minimum"):
+        build_trade_request("X", "", "BTC/USDT", "Buy", "Limit", "0.001", "100", rules=rules)
+
+
+@pytest.fixture
+def catalog(market_cache):
+    loaders = {"X": lambda http: [make_market("BTC", "USDT", "0.5", "0.001", "5")]}
+    return MarketCatalog(http=object(), loaders=loaders, store=market_cache)
+
+
+def test_unknown_symbol_is_rejected_once_markets_are_loaded(catalog):
+    rules = RuleCache(catalog)
+    assert rules.get("X", "ETH/USDT").tick_size is None  # Only defaults known: nothing to check against
+    catalog.refresh("X")
+    assert rules.get("X", "BTC/USDT").tick_size == 0.5
+    with pytest.raises(OrderValidationError, match="Unknown market"):
+        rules.get("X", "BTCUSDT")
@@ -0,0 +1,155 @@
+# tests/test_price_feed.py
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+import core.price_feed as price_feed
+from core.price_feed import BybitTicker, PriceFeed
+
+
+class FakeTickerServer:
+    """
+    Local stand-in for Bybit's public ticker socket.
+    Records every subscribe message and answers each one with a tick per symbol;
+    drop() closes every open connection, as an exchange does during maintenance.
+    """
+
+    def __init__(self):
+        self.subscriptions = []  # One list of native symbols per subscribe message
+        self.connections = 0
+        self._sockets = set()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._start())
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _start(self):
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, ws):
+        self.connections += 1
+        self._sockets.add(ws)
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("op") != "subscribe":
+                    continue
+                natives = [arg.split(".", 1)[1] for arg in message["args"]]
+                self.subscriptions.append(natives)
+                for native in natives:
+                    await ws.send(json.dumps({"topic": f"tickers.{native}",
+                                              "data": {"symbol": native, "lastPrice": "100.5"}}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._sockets.discard(ws)
+
+    def drop(self):
+        async def close_all():
+            for ws in list(self._sockets):
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close_all(), self._loop).result(5)
+
+    def close(self):
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server():
+    server = FakeTickerServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def feed_factory(market_cache):
+    feeds = []
+
+    def make(**kwargs):
+        feed = PriceFeed(reconnect_min=0.05, reconnect_max=0.1, cache=market_cache, **kwargs)
+        feeds.append(feed)
+        return feed
+
+    yield make
+    for feed in feeds:
+        feed.stop()
+
+
+def test_ticks_reach_listeners_and_latest(server, feed_factory):
+    feed = feed_factory(protocols={"Bybit": BybitTicker(url=server.url)})
+    ticks = []
+    feed.add_listener(lambda *tick: ticks.append(tick))
+    feed.subscribe("Bybit", "BTC/USDT")
+    feed.start()
+
+    _wait_for(lambda: ticks)
+    assert ticks[0][:3] == ("Bybit", "BTC/USDT", 100.5)
+    assert feed.latest("Bybit", "BTC/USDT")[0] == 100.5
+    assert feed.last_known("Bybit", "BTC/USDT")[2] is True
+
+
+def test_reconnects_and_resubscribes_after_a_drop(server, feed_factory):
+    feed = feed_factory(protocols={"Bybit": BybitTicker(url=server.url)})
+    feed.start()
+    feed.subscribe("Bybit", "BTC/USDT")
+    feed.subscribe("Bybit", "ETH/USDT")
+    _wait_for(lambda: {s for sub in server.subscriptions for s in sub} == {"BTCUSDT", "ETHUSDT"})
+    feed.unsubscribe("Bybit", "ETH/USDT")
+    subscribed_before = len(server.subscriptions)
+
+    server.drop()
+    _wait_for(lambda: server.connections >= 2 and len(server.subscriptions) > subscribed_before)
+    # Only what is still subscribed comes back, in one message
+    assert server.subscriptions[-1] == ["BTCUSDT"]
+
+
+def test_exchange_enabled_later_starts_streaming(server, feed_factory, monkeypatch):
+    enabled = []
+    monkeypatch.setattr(price_feed, "load_enabled_exchanges", lambda: list(enabled))
+    monkeypatch.setitem(price_feed.TICKER_PROTOCOLS, "Bybit", lambda: BybitTicker(url=server.url))
+    feed = feed_factory()
+    feed.start()
+    assert feed.subscribe("Bybit", "BTC/USDT") is False
+
+    enabled.append("Bybit")  # e.g. ticked in Settings while the app runs
+    assert feed.subscribe("Bybit", "BTC/USDT") is True
+    _wait_for(lambda: feed.latest("Bybit", "BTC/USDT") is not None)
+
+
+def test_stop_returns_promptly_with_no_exchanges(feed_factory):
+    feed = feed_factory(exchanges=[])
+    feed.start()
+    start = time.monotonic()
+    feed.stop()
+    assert time.monotonic() - start < 1
+    assert not feed._thread.is_alive()
@@ -0,0 +1,106 @@
+# tests/test_rate_limiter.py
+
+import logging
+import threading
+import time
+
+import pytest
+
+from core.rate_limiter import PRIORITY_BALANCE, PRIORITY_ORDER, PRIORITY_PRICE, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _limiter(clock, limit=(2, 1.0), key_limit=None):
+    return RateLimiter(limits={"Bybit": limit}, key_limit=key_limit, clock=clock)
+
+
+def _try(limiter, exchange="Bybit", key=None, priority=PRIORITY_PRICE):
+    # timeout=0 grants what fits right now and never waits, so the fake clock alone decides
+    return limiter.acquire(exchange, key=key, priority=priority, timeout=0)
+
+
+def test_bucket_refills_at_its_rate(clock):
+    limiter = _limiter(clock)
+    assert _try(limiter) and _try(limiter)
+    assert not _try(limiter)  # Burst of 2 used up
+    clock.advance(0.5)
+    assert not _try(limiter)
+    clock.advance(0.5)
+    assert _try(limiter)
+    clock.advance(100)
+    assert _try(limiter) and _try(limiter) and not _try(limiter)  # Never more than the burst
+
+
+def test_key_buckets_are_per_exchange_and_subaccount(clock):
+    limiter = RateLimiter(limits={}, default_limit=(100, 100.0), key_limit=(1, 1.0), clock=clock)
+    assert _try(limiter, "Bybit", key="main")
+    assert not _try(limiter, "Bybit", key="main")
+    assert _try(limiter, "Binance", key="main")  # Same subaccount name, different API key
+    assert _try(limiter, "Bybit", key="alt")
+    assert set(limiter._key_buckets) == {("Bybit", "main"), ("Binance", "main"), ("Bybit", "alt")}
+
+
+def test_waiters_are_served_by_priority_lane(clock):
+    limiter = _limiter(clock, limit=(1, 1.0))
+    assert _try(limiter)
+    granted = []
+
+    def waiter(name, priority):
+        limiter.acquire("Bybit", priority=priority, timeout=30)
+        granted.append(name)
+
+    threads = []
+    for name, priority in (("price", PRIORITY_PRICE), ("balance", PRIORITY_BALANCE), ("order", PRIORITY_ORDER)):
+        thread = threading.Thread(target=waiter, args=(name, priority), daemon=True)
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 5
+        while limiter.pending("Bybit") < len(threads) and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    # One token at a time; a zero-timeout request from the lowest lane triggers the grant and steps aside
+    for expected in (["order"], ["order", "balance"], ["order", "balance", "price"]):
+        clock.advance(1.0)
+        assert not _try(limiter, priority=PRIORITY_PRICE + 1)
+        deadline = time.monotonic() + 5
+        while len(granted) < len(expected) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert granted == expected
+    for thread in threads:
+        thread.join(5)
+
+
+def test_penalize_blocks_until_retry_after(clock, caplog):
+    limiter = _limiter(clock, limit=(10, 10.0))
+    with caplog.at_level(logging.WARNING, logger="quicktrade.rate_limiter"):
+        limiter.penalize("Bybit", 5.0)
+    assert "Bybit throttled; pausing 5.0s" in caplog.text
+
+    clock.advance(4.9)
+    assert not _try(limiter)  # Tokens have refilled, but the pause is not over
+    clock.advance(0.2)
+    assert _try(limiter)
+
+
+def test_penalized_key_does_not_block_other_keys(clock):
+    limiter = RateLimiter(limits={}, default_limit=(100, 100.0), key_limit=(5, 5.0), clock=clock)
+    limiter.penalize("Bybit", 3.0, key="main")
+    assert not _try(limiter, key="main")
+    assert _try(limiter, key="alt")
+    clock.advance(3.0)
+    assert _try(limiter, key="main")
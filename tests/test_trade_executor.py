@@ -0,0 +1,48 @@
+# tests/test_trade_executor.py
+
+import pytest
+
+from core.models import TradeRequest
+from core.sim_exchange import SimulatedExchange
+from core.trade_executor import TradeExecutor
+from core.trade_journal import TradeJournal
+
+
+class FlakyExchange(SimulatedExchange):
+    """Simulated exchange whose "broken" subaccount never gets an answer."""
+
+    def place_order(self, trade, credentials=None):
+        if trade.subaccount == "broken":
+            raise ConnectionError("Bybit did not respond")
+        return super().place_order(trade, credentials)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TradeJournal(str(tmp_path / "trades.db"))
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def executor(journal, unlimited_rate_limiter):
+    exchange = FlakyExchange("Bybit", seed=1)
+    executor = TradeExecutor(journal=journal, rate_limiter=unlimited_rate_limiter, adapters=lambda name: exchange)
+    yield executor
+    executor.shutdown()
+
+
+def test_basket_with_a_failing_leg_reports_it_and_keeps_the_rest(executor, journal):
+    trades = [TradeRequest("Bybit", sub, "BTC/USDT", "Buy", 0.01, "Market") for sub in ("a", "broken", "b")]
+    result = executor.submit_basket(trades).result(timeout=5)
+
+    assert result.legs == 3
+    assert sorted(fill.subaccount for fill in result.fills) == ["a", "b"]
+    assert all(fill.status == "filled" for fill in result.fills)
+    [(trade, error)] = result.errors
+    assert trade is trades[1] and isinstance(error, ConnectionError)
+    assert "2/3 filled" in result.summary() and "1 failed" in result.summary()
+
+    journal.flush()
+    assert journal.query(subaccount="broken")[0]["error"] == "Bybit did not respond"
+    assert len(journal.query(exchange="Bybit")) == 3
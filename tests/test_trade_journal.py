@@ -0,0 +1,90 @@
+# tests/test_trade_journal.py
+
+import pytest
+
+from core.models import Fill, TradeRequest
+from core.trade_journal import COLUMNS, TradeJournal
+
+
+class CountingJournal(TradeJournal):
+    """Records every COMMIT the writer thread issues."""
+
+    def __init__(self, *args, **kwargs):
+        self.commits = []
+        super().__init__(*args, **kwargs)
+
+    def _connect(self):
+        conn = super()._connect()
+        conn.set_trace_callback(lambda sql: self.commits.append(sql) if sql.upper().startswith("COMMIT") else None)
+        return conn
+
+
+def _fill(exchange="Bybit", subaccount="main", symbol="BTC/USDT", side="Buy", amount=1.0, price=100.0, ts=0.0,
+          status="filled"):
+    trade = TradeRequest(exchange, subaccount, symbol, side, amount, "Limit", price)
+    return trade, Fill.from_trade(trade, status=status, price=price, amount=amount, timestamp=ts)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = CountingJournal(str(tmp_path / "trades.db"), batch_size=500, flush_interval=0.5)
+    yield journal
+    journal.close()
+
+
+def test_burst_is_written_in_one_transaction(journal):
+    journal.commits.clear()
+    for i in range(300):
+        journal.record(*_fill(ts=float(i)))
+    journal.flush()
+
+    assert len(journal.query()) == 300
+    assert len(journal.commits) <= 2  # The first row may be committed before the rest arrive
+
+
+def test_batches_are_capped_at_batch_size(tmp_path):
+    journal = CountingJournal(str(tmp_path / "trades.db"), batch_size=50, flush_interval=0.5)
+    try:
+        journal.commits.clear()
+        for i in range(300):
+            journal.record(*_fill(ts=float(i)))
+        journal.flush()
+        assert len(journal.query()) == 300
+        assert len(journal.commits) >= 6
+    finally:
+        journal.close()
+
+
+def test_range_queries_filter_and_use_the_index(journal):
+    for i in range(10):
+        journal.record(*_fill(subaccount="main" if i % 2 else "alt", ts=float(i)))
+    journal.record(TradeRequest("Bybit", "main", "ETH/USDT", "Sell", 1.0, "Market"), error=ValueError("rejected"))
+    journal.flush()
+
+    rows = journal.query(exchange="Bybit", subaccount="main", start=2.0, end=7.0)
+    assert [row["ts"] for row in rows] == [7.0, 5.0, 3.0]  # Newest first
+    assert journal.query(symbol="ETH/USDT")[0]["error"] == "rejected"
+    assert [row["ts"] for row in journal.query(subaccount="alt", limit=2)] == [8.0, 6.0]
+
+    where, params = journal._filters("Bybit", "main", None, 2.0, 7.0)
+    plan = journal._read_conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT {', '.join(COLUMNS)} FROM trades{where} ORDER BY ts DESC", params
+    ).fetchall()
+    assert "trades_account_ts" in " ".join(row[-1] for row in plan)
+
+
+def test_positions_net_fills_per_symbol(journal):
+    journal.record(*_fill(side="Buy", amount=2.0, price=100.0, ts=1.0))
+    journal.record(*_fill(side="Sell", amount=0.5, price=120.0, ts=2.0))
+    journal.record(*_fill(symbol="ETH/USDT", side="Sell", amount=3.0, price=10.0, ts=3.0))
+    journal.record(*_fill(side="Buy", amount=0.0, price=90.0, ts=4.0, status="open"))  # Nothing filled
+    journal.record(TradeRequest("Bybit", "main", "BTC/USDT", "Buy", 1.0, "Market"), error="rejected")
+    journal.flush()
+
+    assert journal.positions() == {
+        "BTC/USDT": {"net_amount": 1.5, "net_cost": 140.0, "trades": 2},
+        "ETH/USDT": {"net_amount": -3.0, "net_cost": -30.0, "trades": 1},
+    }
+    assert journal.positions(start=2.0, symbol="BTC/USDT") == {
+        "BTC/USDT": {"net_amount": -0.5, "net_cost": -60.0, "trades": 1},
+    }
@@ -0,0 +1,40 @@
+# tests/test_ttl_cache.py
+
+from core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("btc", 1.0)
+    cache.set("eth", 2.0, ttl=5)  # Per-entry ttl, e.g. what is left of a persisted price
+
+    clock.now = 4.9
+    assert cache.get_many(["btc", "eth"]) == {"btc": 1.0, "eth": 2.0}
+    clock.now = 5.0
+    assert "eth" not in cache and cache.get("eth", "gone") == "gone"
+    clock.now = 60.0
+    assert cache.get("btc") is None
+    assert len(cache) == 0  # Expired entries are dropped when looked up
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=3, ttl=60, clock=FakeClock())
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") == "a"  # "b" is now the least recently used
+    cache.set("d", "d")
+    assert "b" not in cache and len(cache) == 3
+
+    cache.set("c", "c2")  # Updating counts as a use too
+    cache.set("e", "e")
+    assert sorted(cache.get_many("acde")) == ["c", "d", "e"]
+    assert cache.get("c") == "c2"
@@ -0,0 +1,84 @@
+# tests/test_update_scheduler.py
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from ui.update_scheduler import UpdateScheduler  # noqa: E402
+
+
+def _process_until(qapp, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = UpdateScheduler(rate=20)
+    yield scheduler
+    scheduler.deleteLater()
+
+
+def test_burst_is_delivered_once_with_the_latest_values(qapp, scheduler):
+    calls = []
+    scheduler.subscribe("price", calls.append)
+    for i in range(1000):
+        scheduler.post("price", ("Bybit", "BTC/USDT"), i)
+        scheduler.post("price", ("Bybit", "ETH/USDT"), -i)
+
+    assert _process_until(qapp, lambda: calls)
+    _process_until(qapp, lambda: False, timeout=0.1)  # Nothing else is coming
+    assert calls == [{("Bybit", "BTC/USDT"): 999, ("Bybit", "ETH/USDT"): -999}]
+
+
+def test_posts_from_other_threads_are_coalesced_and_rate_limited(qapp, scheduler):
+    calls = []
+    scheduler.subscribe("price", lambda updates: calls.append((time.monotonic(), updates)))
+
+    def produce():
+        for i in range(2000):
+            scheduler.post("price", "BTC", i)
+            if i % 200 == 0:
+                time.sleep(0.01)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while producer.is_alive():
+        qapp.processEvents()
+        time.sleep(0.001)
+    assert _process_until(qapp, lambda: calls and calls[-1][1] == {"BTC": 1999})
+
+    assert len(calls) < 20  # ~100ms of posting, at most 20 flushes per second
+    gaps = [later - earlier for (earlier, _), (later, _) in zip(calls, calls[1:])]
+    assert all(gap >= scheduler.interval * 0.9 for gap in gaps)
+
+
+def test_paused_owner_catches_up_on_resume(qapp, scheduler):
+    owner = object()
+    calls = []
+    scheduler.subscribe("balances", calls.append, owner=owner)
+    scheduler.pause(owner)
+    for i in range(10):
+        scheduler.post("balances", ("Bybit", "main"), i)
+    _process_until(qapp, lambda: False, timeout=0.1)
+    assert calls == []
+
+    scheduler.resume(owner)
+    assert _process_until(qapp, lambda: calls)
+    assert calls == [{("Bybit", "main"): 9}]
+
+
+def test_posts_without_subscribers_are_dropped(qapp, scheduler):
+    calls = []
+    subscription = scheduler.subscribe("price", calls.append)
+    scheduler.unsubscribe(subscription)
+    scheduler.post("price", "BTC", 1)
+    assert not scheduler._scheduled and not scheduler._timer.isActive()
+    _process_until(qapp, lambda: False, timeout=0.1)
+    assert calls == []
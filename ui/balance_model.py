@@ -0,0 +1,155 @@
+# balance_model.py
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+
+from core.columns import BalanceColumns
+
+DUST_THRESHOLD = 1.0  # USD
+COLUMNS = ["Exchange", "Subaccount", "Asset", "Balance (USD)"]
+VALUE_COLUMN = 3
+MAX_REMOVE_RUNS = 32  # Beyond this many separate row ranges, removals reset the model instead
+
+
+class BalanceTableModel(QAbstractTableModel):
+    """
+    Balances keyed by (exchange, subaccount, asset).
+    Updates are diffed against the current rows so views only repaint what changed.
+    Rows are stored column-wise in a BalanceColumns, so the dust mask and totals are
+    single passes over a value array rather than per-row Python work.
+    """
+
+    totals_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = BalanceColumns()
+        self._dust_mask = None  # Cached mask of rows >= DUST_THRESHOLD; reset on every change
+
+    # --- Qt model API ----------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._value(index.row(), column)
+            return f"${value:,.2f}" if column == VALUE_COLUMN else value
+        if role == Qt.ItemDataRole.UserRole:
+            return self._value(index.row(), column)  # Raw value, used for sorting and filtering
+        if role == Qt.ItemDataRole.TextAlignmentRole and column == VALUE_COLUMN:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    # --- Updates ---------------------------------------------------------
+
+    def set_balances(self, balances):
+        """Replace the full balance list (dicts or a BalanceColumns); rows that are not in it are removed."""
+        if not isinstance(balances, BalanceColumns):
+            balances = BalanceColumns.from_rows(balances)
+        self.remove_keys([key for key in self.columns.keys() if balances.find(key) is None])
+        self.upsert(balances)
+
+    def upsert(self, balances):
+        """Insert or update rows without touching anything else."""
+        columns = self.columns
+        new_rows = []
+        changed = []
+        for b in balances:
+            key = self._key(b)
+            value = float(b["usd_value"])
+            row = columns.find(key)
+            if row is None:
+                new_rows.append((key, value, b.get("amount", 0.0)))
+            elif columns.usd_value[row] != value:
+                columns.upsert(*key, value, b.get("amount", 0.0))
+                changed.append(row)
+
+        if changed:
+            self._dust_mask = None
+            for row in changed:
+                cell = self.index(row, VALUE_COLUMN)
+                self.dataChanged.emit(cell, cell)
+
+        if new_rows:
+            first = len(columns)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            for key, value, amount in new_rows:
+                columns.upsert(*key, value, amount)
+            self._dust_mask = None
+            self.endInsertRows()
+
+        if changed or new_rows:
+            self.totals_changed.emit()
+
+    def remove_keys(self, keys):
+        rows = sorted(row for row in map(self.columns.find, keys) if row is not None)
+        if not rows:
+            return
+        # Remove contiguous runs from the bottom up so earlier row numbers stay valid
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        if len(runs) > MAX_REMOVE_RUNS:
+            # Scattered bulk removal: one compaction pass and a reset beats thousands of row signals
+            self.beginResetModel()
+            self.columns.remove_rows(rows)
+            self._dust_mask = None
+            self.endResetModel()
+        else:
+            for first, last in reversed(runs):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                self.columns.remove_rows(range(first, last + 1))
+                self._dust_mask = None
+                self.endRemoveRows()
+        self.totals_changed.emit()
+
+    def dust_mask(self):
+        """Bytes mask with 1 for rows worth at least DUST_THRESHOLD."""
+        if self._dust_mask is None:
+            self._dust_mask = self.columns.mask_at_least(DUST_THRESHOLD)
+        return self._dust_mask
+
+    def visible_total(self, show_dust):
+        return self.columns.total(None if show_dust else DUST_THRESHOLD)
+
+    def _value(self, row, column):
+        if column == VALUE_COLUMN:
+            return self.columns.usd_value[row]
+        return (self.columns.exchange, self.columns.subaccount, self.columns.asset)[column][row]
+
+    @staticmethod
+    def _key(balance):
+        return (balance["exchange"], balance["subaccount"], balance["asset"])
+
+
+class DustFilterProxyModel(QSortFilterProxyModel):
+    """Hides rows worth less than DUST_THRESHOLD unless show_dust is on; sorts on raw values."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.show_dust = False
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+        self.setDynamicSortFilter(True)
+
+    def set_show_dust(self, show_dust):
+        if show_dust != self.show_dust:
+            self.show_dust = show_dust
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.show_dust:
+            return True
+        return bool(self.sourceModel().dust_mask()[source_row])
@@ -1,9 +1,32 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QCheckBox, QHBoxLayout, QTableWidget, QTableWidgetItem
-from PyQt6.QtCore import Qt
+import time
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QCheckBox, QHBoxLayout, QTableView, QAbstractItemView
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from core.balance_service import BalanceAggregator
+from core.columns import BalanceColumns
+from core.market_cache import format_age, get_market_cache
+from core.metrics import get_metrics
+from ui.balance_model import BalanceTableModel, DustFilterProxyModel
+from ui.update_scheduler import get_update_scheduler
+from ui.workers import get_io_executor
+
+BALANCES_TOPIC = "balances"
 
 class DashboardTab(QWidget):
-    def __init__(self):
+    # Emitted from aggregator threads; Qt queues them onto the GUI thread.
+    account_failed = pyqtSignal(str, str, str)  # (exchange, subaccount, error)
+
+    def __init__(self, aggregator=None, scheduler=None, cache=None):
         super().__init__()
+        self.aggregator = aggregator or BalanceAggregator()
+        self.cache = cache or get_market_cache()
+        self.as_of = {}  # (exchange, subaccount) -> when the rows shown for it were fetched
+        self.stale = {}  # The subset not confirmed by the latest refresh (cached or failed to answer)
+        # Accounts answering in a burst are merged into one model update per frame
+        self.scheduler = scheduler or get_update_scheduler()
+        self.balance_subscription = self.scheduler.subscribe(BALANCES_TOPIC, self.on_accounts_loaded, owner=self)
+        self.account_failed.connect(self.on_account_failed)
         layout = QVBoxLayout()
         self.setLayout(layout)
 
@@ -13,40 +36,110 @@ class DashboardTab(QWidget):
 
         controls_layout = QHBoxLayout()
         self.dust_filter = QCheckBox("Show Dust (<$1)")
-        self.dust_filter.stateChanged.connect(self.update_table)
+        self.dust_filter.stateChanged.connect(self.apply_dust_filter)
         self.refresh_button = QPushButton("🔁 Refresh Assets")
         self.refresh_button.clicked.connect(self.load_balances)
         controls_layout.addWidget(self.dust_filter)
         controls_layout.addWidget(self.refresh_button)
         controls_layout.addStretch()
+        self.status_label = QLabel("")
+        controls_layout.addWidget(self.status_label)
         layout.addLayout(controls_layout)
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Exchange", "Subaccount", "Asset", "Balance (USD)"])
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.model = BalanceTableModel(self)
+        self.model.totals_changed.connect(self.update_total)
+        self.proxy = DustFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Keep insertion order until the user clicks a header; sorting thousands of rows isn't free
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
         layout.addWidget(self.table)
 
-        self.balances = []
+        self.balances = BalanceColumns()
+        self.show_cached_balances()
         self.load_balances()
 
+    def show_cached_balances(self):
+        """Render the last saved snapshot straight away; load_balances() replaces it as accounts answer."""
+        rows, as_of = self.cache.balances()
+        if not rows:
+            return
+        self.as_of = dict(as_of)
+        self.stale = dict(as_of)
+        self.balances = BalanceColumns.from_rows(rows)
+        self.update_table()
+
     def load_balances(self):
-        self.balances = [
-            {"exchange": "Binance", "subaccount": "Main", "asset": "BTC", "usd_value": 23450.12},
-            {"exchange": "Kraken", "subaccount": "Bot1", "asset": "ETH", "usd_value": 1345.33},
-            {"exchange": "KuCoin", "subaccount": "Main", "asset": "DOGE", "usd_value": 0.52},
-            {"exchange": "Bybit", "subaccount": "Alt", "asset": "SOL", "usd_value": 85.22}
-        ]
+        """Refresh every configured account in the background; rows stream in as accounts answer."""
+        self.refresh_button.setEnabled(False)
+        self.status_label.setText("Showing cached balances, refreshing..." if self.stale else "Refreshing...")
+        self.failed_accounts = []
+
+        future = self.aggregator.refresh(
+            on_result=lambda ex, sub, rows: self.scheduler.post(BALANCES_TOPIC, (ex, sub), rows),
+            on_error=lambda ex, sub, e: self.account_failed.emit(ex, sub, str(e)),
+        )
+        get_io_executor().watch(future, on_result=self.on_refresh_finished)
+
+    def on_accounts_loaded(self, accounts):
+        """Scheduler callback: {(exchange, subaccount): rows} for every account that answered since the last frame."""
+        rows = [row for account_rows in accounts.values() for row in account_rows]
+        for account in accounts:
+            self.stale.pop(account, None)
+        with get_metrics().timer("ui_refresh_seconds", view="dashboard"):
+            self.model.upsert(rows)
+
+    def on_account_failed(self, exchange, subaccount, error):
+        self.failed_accounts.append((exchange, subaccount))
+        print(f"[Dashboard] Balance refresh failed for {exchange} ({subaccount}): {error}")
+
+    def on_refresh_finished(self, rows):
+        # The full table replaces any per-account updates still waiting for a frame.
+        self.scheduler.clear(self.balance_subscription)
+        # Keep the previous rows of accounts that failed; drop anything no longer held or configured.
+        # Kept rows stay marked with the time they were really fetched, on screen and on disk.
+        now = time.time()
+        failed = set(self.failed_accounts)
+        kept = list(self.balances.select(self.balances.accounts_mask(failed)))
+        kept_accounts = {(row["exchange"], row["subaccount"]) for row in kept}
+        self.stale = {account: self.as_of.get(account, now) for account in kept_accounts}
+        self.as_of = {(row["exchange"], row["subaccount"]): now for row in rows}
+        self.as_of.update(self.stale)
+        self.balances = BalanceColumns.from_rows(rows + kept)
         self.update_table()
+        self.cache.save_balances(self.balances, now, as_of=self.stale)
+
+        self.refresh_button.setEnabled(True)
+        if failed:
+            names = ", ".join(f"{ex} ({sub})" for ex, sub in sorted(failed))
+            self.status_label.setText(f"⚠️ No answer from {names}")
+        else:
+            self.status_label.setText("")
 
     def update_table(self):
-        show_dust = self.dust_filter.isChecked()
-        filtered = [b for b in self.balances if show_dust or b["usd_value"] >= 1.0]
-        self.table.setRowCount(len(filtered))
-        total = 0.0
-        for i, b in enumerate(filtered):
-            self.table.setItem(i, 0, QTableWidgetItem(b["exchange"]))
-            self.table.setItem(i, 1, QTableWidgetItem(b["subaccount"]))
-            self.table.setItem(i, 2, QTableWidgetItem(b["asset"]))
-            self.table.setItem(i, 3, QTableWidgetItem(f"${b['usd_value']:.2f}"))
-            total += b["usd_value"]
-        self.total_label.setText(f"💰 Total Asset Value: USD ${total:,.2f}")
+        # Only rows whose values changed are repainted; the dust mask and total are
+        # computed over the value column in one pass each.
+        with get_metrics().timer("ui_refresh_seconds", view="dashboard"):
+            self.model.set_balances(self.balances)
+            self.apply_dust_filter()
+
+    def apply_dust_filter(self):
+        self.proxy.set_show_dust(self.dust_filter.isChecked())
+        self.update_total()
+
+    def update_total(self):
+        total = self.model.visible_total(self.dust_filter.isChecked())
+        stale = ""
+        if self.stale:
+            age = format_age(min(self.stale.values()))
+            if len(self.stale) < len(self.as_of):
+                stale = f" ({len(self.stale)} of {len(self.as_of)} accounts cached, oldest {age})"
+            else:
+                stale = f" (cached {age})"
+        self.total_label.setText(f"💰 Total Asset Value: USD ${total:,.2f}{stale}")
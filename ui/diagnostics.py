@@ -0,0 +1,82 @@
+# diagnostics.py
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QFileDialog, QHeaderView
+)
+from PyQt6.QtCore import Qt, QTimer
+
+from core.metrics import get_metrics
+
+COLUMNS = ["Metric", "Labels", "Count", "p50 (ms)", "p90 (ms)", "p99 (ms)", "p99.9 (ms)", "Max (ms)"]
+REFRESH_MS = 1000
+
+
+class DiagnosticsTab(QWidget):
+    """Live latency percentiles from core.metrics; only refreshes while visible."""
+
+    def __init__(self, metrics=None):
+        super().__init__()
+        self.metrics = metrics or get_metrics()
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        controls = QHBoxLayout()
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset)
+        self.export_button = QPushButton("Export Prometheus File...")
+        self.export_button.clicked.connect(self.export)
+        controls.addWidget(self.reset_button)
+        controls.addWidget(self.export_button)
+        controls.addStretch()
+        self.status_label = QLabel("")
+        controls.addWidget(self.status_label)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.table)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        rows = self.metrics.snapshot()
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            labels = ", ".join(f"{k}={v}" for k, v in row["labels"].items())
+            values = [row["name"], labels, str(row["count"])]
+            for key in ("p50", "p90", "p99", "p99.9", "max"):
+                value = row[key]
+                values.append("--" if value is None else f"{value * 1000:,.2f}")
+            for c, text in enumerate(values):
+                item = self.table.item(r, c)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if c >= 2:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.table.setItem(r, c, item)
+                if item.text() != text:
+                    item.setText(text)
+
+    def reset(self):
+        self.metrics.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Metrics", "quicktrade.prom", "Prometheus text (*.prom)")
+        if path:
+            self.metrics.dump(path)
+            self.status_label.setText(f"Saved {path}")
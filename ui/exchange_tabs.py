@@ -2,18 +2,48 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit,
     QHBoxLayout, QMessageBox, QSpacerItem, QSizePolicy
 )
-from PyQt6.QtCore import Qt
-import json
-import os
+import time
 
-CONFIG_PATH = "config"
-API_KEYS_FILE = os.path.join(CONFIG_PATH, "api_keys.json")
-USER_PREFS_FILE = os.path.join(CONFIG_PATH, "user_prefs.json")
+from core.basket import MIRROR, SPLIT, BasketOrder, expand_basket
+from core.data_store import load_api_keys, load_user_prefs, save_user_prefs
+from core.market_cache import format_age
+from core.metrics import get_metrics
+from core.order_validation import OrderValidationError, build_trade_request, get_rule_cache, parse_number
+from core.trade_executor import TradeExecutor
+from ui.market_selector import MarketSelector
+from ui.update_scheduler import get_update_scheduler
+from ui.workers import get_io_executor
+
+# Order routing choices: None sends to the selected subaccount only
+BASKET_MODES = {
+    "Selected subaccount": None,
+    "Mirror to all subaccounts": MIRROR,
+    "Split across subaccounts": SPLIT,
+}
+
+# Status line icon per Fill.status; a rejected order is a failure like any other
+FILL_STATUS_ICONS = {
+    "filled": "✅",
+    "partially_filled": "⚠️",
+    "open": "🕒",
+    "rejected": "❌",
+}
 
 class ExchangeTab(QWidget):
-    def __init__(self, exchange_name):
+    def __init__(self, exchange_name, executor=None, price_feed=None, scheduler=None):
         super().__init__()
         self.exchange = exchange_name
+        self.executor = executor or TradeExecutor()
+        self.price_feed = price_feed
+        # Ticks reach the price label through the scheduler: at most one repaint per frame
+        self.scheduler = scheduler or get_update_scheduler()
+        self.price_topic = ("price", exchange_name)
+
+        # Widgets, subaccounts and feed subscriptions are built on first activation (see build())
+        self.content = None
+        self.subscribed_pairs = set()
+        self.listening = False
+        self.price_subscription = None
 
         # Main layout with margin for top spacing
         layout = QVBoxLayout()
@@ -21,23 +51,49 @@ class ExchangeTab(QWidget):
         layout.setSpacing(6)
         self.setLayout(layout)
 
+    @property
+    def is_built(self):
+        return self.content is not None
+
+    def showEvent(self, event):
+        self.ensure_built()
+        self.start_listening()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.stop_listening()
+        super().hideEvent(event)
+
+    def ensure_built(self):
+        if not self.is_built:
+            self.build()
+
+    def build(self):
+        self.content = QWidget()
+        layout = QVBoxLayout(self.content)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+        self.layout().addWidget(self.content)
+
         # Load user preferences
         self.user_prefs = self.load_user_prefs()
 
-        # Load subaccounts for this exchange
-        self.subaccount_selector = QComboBox()
-        self.subaccount_selector.currentTextChanged.connect(self.update_pair_selection)
-        self.load_subaccounts()
-
-        # Line 1: Subaccount and Trading Pair
+        # Line 1: Subaccount, Trading Pair and last price
         top_row = QHBoxLayout()
+        self.subaccount_selector = QComboBox()
         top_row.addWidget(self.subaccount_selector)
 
-        self.market_selector = QComboBox()
-        self.market_selector.addItems(["BTC/USDT", "ETH/USDT", "SOL/USDT"])
+        self.price_label = QLabel("Last: --")
+        self.market_selector = MarketSelector(self.exchange)
+        self.market_selector.market_selected.connect(self.on_market_changed)
         top_row.addWidget(self.market_selector)
+        top_row.addWidget(self.price_label)
         layout.addLayout(top_row)
 
+        # Load subaccounts for this exchange (needs market_selector for the last used pair)
+        self.subaccount_selector.currentTextChanged.connect(self.update_pair_selection)
+        self.load_subaccounts()
+
         # Line 2: Order Type, Price (if Limit), and Amount
         mid_row = QHBoxLayout()
 
@@ -54,6 +110,10 @@ class ExchangeTab(QWidget):
         self.amount_input.setPlaceholderText("Amount")
         mid_row.addWidget(self.amount_input)
 
+        self.basket_selector = QComboBox()
+        self.basket_selector.addItems(BASKET_MODES)
+        mid_row.addWidget(self.basket_selector)
+
         layout.addLayout(mid_row)
 
         # Line 3: Buy/Sell Buttons
@@ -68,73 +128,153 @@ class ExchangeTab(QWidget):
 
         layout.addLayout(btn_row)
 
+        # Line 4: Last order status
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
         # Spacer to push everything to the top
         layout.addSpacerItem(QSpacerItem(0, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
 
         # Initial toggle state
         self.toggle_price_input("Market")
+        self.price_subscription = self.scheduler.subscribe(self.price_topic, self.on_prices_updated, owner=self)
+        self.on_market_changed(self.market_selector.currentText())
+
+    def release(self):
+        """Tear down widgets and feed subscriptions; the tab rebuilds itself when shown again."""
+        self.stop_listening()
+        if self.price_subscription is not None:
+            self.scheduler.unsubscribe(self.price_subscription)
+            self.price_subscription = None
+        if self.price_feed is not None:
+            for pair in self.subscribed_pairs:
+                self.price_feed.unsubscribe(self.exchange, pair)
+        self.subscribed_pairs.clear()
+        if self.content is not None:
+            self.content.setParent(None)
+            self.content.deleteLater()
+            self.content = None
+
+    def start_listening(self):
+        if self.price_feed is not None and not self.listening:
+            self.price_feed.add_listener(self.on_feed_tick)
+            self.listening = True
+            # Catch up on ticks missed while hidden
+            self.on_market_changed(self.market_selector.currentText())
+
+    def stop_listening(self):
+        if self.price_feed is not None and self.listening:
+            self.price_feed.remove_listener(self.on_feed_tick)
+            self.listening = False
 
     def toggle_price_input(self, order_type):
         self.price_input.setVisible(order_type == "Limit")
 
+    def on_market_changed(self, pair):
+        self.price_label.setText("Last: --")
+        if self.price_feed is None or not pair:
+            return
+        # Only the selected market streams; browsing the selector must not pile up subscriptions
+        for previous in self.subscribed_pairs - {pair}:
+            self.price_feed.unsubscribe(self.exchange, previous)
+        self.price_feed.subscribe(self.exchange, pair)
+        self.subscribed_pairs = {pair}
+        # Until the first tick arrives, show the last price from an earlier run, marked as such
+        known = self.price_feed.last_known(self.exchange, pair)
+        if known is not None:
+            price, ts, live = known
+            if live:
+                self.on_price_updated(pair, price)
+            else:
+                self.price_label.setText(f"Last: {price:,.8g} (cached {format_age(ts)})")
+
+    def on_feed_tick(self, exchange, symbol, price, timestamp):
+        # Runs on the feed thread; the scheduler keeps only the latest price per symbol
+        if exchange == self.exchange:
+            self.scheduler.post(self.price_topic, symbol, price)
+
+    def on_prices_updated(self, prices):
+        if self.is_built:
+            price = prices.get(self.market_selector.currentText())
+            if price is not None:
+                self.on_price_updated(self.market_selector.currentText(), price)
+
+    def on_price_updated(self, symbol, price):
+        if self.is_built and symbol == self.market_selector.currentText():
+            self.price_label.setText(f"Last: {price:,.8g}")
+
     def load_user_prefs(self):
-        if os.path.exists(USER_PREFS_FILE):
-            try:
-                with open(USER_PREFS_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        return load_user_prefs()
 
     def save_user_prefs(self):
-        with open(USER_PREFS_FILE, 'w') as f:
-            json.dump(self.user_prefs, f, indent=2)
+        save_user_prefs(self.user_prefs)
 
     def load_subaccounts(self):
         self.subaccount_selector.clear()
-        self.subaccount_to_last_pair = {}
-        if os.path.exists(USER_PREFS_FILE):
-            try:
-                with open(USER_PREFS_FILE, 'r') as f:
-                    prefs = json.load(f)
-                    last_used = prefs.get("last_used", {}).get(self.exchange, {})
-                    default_sub = last_used.get("subaccount", "")
-                    self.user_prefs = prefs
-            except:
-                last_used = {}
-                default_sub = ""
-
-        if os.path.exists(API_KEYS_FILE):
-            try:
-                with open(API_KEYS_FILE, 'r') as f:
-                    api_data = json.load(f)
-                    subaccounts = list(api_data.get(self.exchange, {}).keys())
-                    self.subaccount_selector.addItems(subaccounts)
-                    for sub in subaccounts:
-                        self.subaccount_to_last_pair[sub] = self.user_prefs.get("last_used", {}).get(self.exchange + ":" + sub, {}).get("pair", "BTC/USDT")
-                    if default_sub in subaccounts:
-                        self.subaccount_selector.setCurrentText(default_sub)
-            except Exception as e:
-                print(f"Error loading API keys: {e}")
+        self.user_prefs = load_user_prefs()
+        last_used = self.user_prefs.get("last_used", {})
+        default_sub = last_used.get(self.exchange, {}).get("subaccount", "")
+
+        subaccounts = list(load_api_keys().get(self.exchange, {}).keys())
+        self.subaccount_to_last_pair = {
+            sub: last_used.get(self.exchange + ":" + sub, {}).get("pair", "BTC/USDT")
+            for sub in subaccounts
+        }
+        self.subaccount_selector.addItems(subaccounts)
+        if default_sub in subaccounts:
+            self.subaccount_selector.setCurrentText(default_sub)
+
+    def refresh_subaccounts(self):
+        """Pick up subaccount changes from settings without disturbing the current selection."""
+        if not self.is_built:
+            return  # Loaded fresh on first activation
+        subaccounts = list(load_api_keys().get(self.exchange, {}).keys())
+        current = [self.subaccount_selector.itemText(i) for i in range(self.subaccount_selector.count())]
+        if subaccounts == current:
+            return
+
+        selected = self.subaccount_selector.currentText()
+        last_used = self.user_prefs.get("last_used", {})
+        for sub in subaccounts:
+            self.subaccount_to_last_pair.setdefault(
+                sub, last_used.get(self.exchange + ":" + sub, {}).get("pair", "BTC/USDT")
+            )
+
+        self.subaccount_selector.blockSignals(True)
+        self.subaccount_selector.clear()
+        self.subaccount_selector.addItems(subaccounts)
+        if selected in subaccounts:
+            self.subaccount_selector.setCurrentText(selected)
+        self.subaccount_selector.blockSignals(False)
+
+        if self.subaccount_selector.currentText() != selected:
+            self.update_pair_selection(self.subaccount_selector.currentText())
 
     def update_pair_selection(self, subaccount):
         default_pair = self.subaccount_to_last_pair.get(subaccount, "BTC/USDT")
-        if default_pair in ["BTC/USDT", "ETH/USDT", "SOL/USDT"]:
+        if default_pair:
             self.market_selector.setCurrentText(default_pair)
 
     def place_order(self, side):
+        clicked = time.perf_counter()
+        if BASKET_MODES.get(self.basket_selector.currentText()) is not None:
+            self.place_basket_order(side, clicked)
+            return
         subaccount = self.subaccount_selector.currentText()
         pair = self.market_selector.currentText()
         order_type = self.order_type_selector.currentText()
-        price = self.price_input.text() if order_type == "Limit" else "Market"
-        amount = self.amount_input.text()
+        latest = self.price_feed.latest(self.exchange, pair) if self.price_feed is not None else None
 
-        if order_type == "Limit" and not price:
-            QMessageBox.warning(self, "Input Error", "Please enter a price for limit orders.")
-            return
-
-        if not amount:
-            QMessageBox.warning(self, "Input Error", "Please enter an amount.")
+        # Parse, round to the market's tick/lot sizes and check min notional before anything is sent
+        try:
+            trade = build_trade_request(
+                self.exchange, subaccount, pair, side, order_type,
+                self.amount_input.text(), self.price_input.text(),
+                rules=get_rule_cache().get(self.exchange, pair),
+                reference_price=latest[0] if latest else None,
+            )
+        except OrderValidationError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
             return
 
         # Save last used preferences
@@ -143,8 +283,72 @@ class ExchangeTab(QWidget):
         self.user_prefs["last_used"][self.exchange + ":" + subaccount] = {"pair": pair}
         self.save_user_prefs()
 
-        QMessageBox.information(
-            self,
-            f"{side} Order",
-            f"{side}ing {amount} of {pair} as a {order_type} order on {self.exchange} ({subaccount})."
+        # Hand the order to the executor and return straight away; the result
+        # is delivered back on the GUI thread.
+        get_io_executor().watch(
+            self.executor.submit_trade(trade),
+            on_result=self.on_order_completed,
+            on_error=lambda e: self.on_order_failed(trade, e),
+        )
+        get_metrics().record("click_to_submit_seconds", time.perf_counter() - clicked, exchange=self.exchange)
+        self.status_label.setText(
+            f"⏳ {side}ing {trade.amount:g} of {pair} as a {order_type} order on {self.exchange} ({subaccount})..."
+        )
+
+    def place_basket_order(self, side, clicked=None):
+        """Send one order per subaccount of this exchange, mirrored or split, in a single dispatch."""
+        mode = BASKET_MODES[self.basket_selector.currentText()]
+        pair = self.market_selector.currentText()
+        order_type = self.order_type_selector.currentText()
+        subaccounts = [self.subaccount_selector.itemText(i) for i in range(self.subaccount_selector.count())]
+        latest = self.price_feed.latest(self.exchange, pair) if self.price_feed is not None else None
+        try:
+            amount = parse_number(self.amount_input.text(), "amount", "Please enter an amount.")
+            price = None
+            if order_type == "Limit":
+                price = parse_number(self.price_input.text(), "price", "Please enter a price for limit orders.")
+            basket = BasketOrder(pair, side, order_type, amount,
+                                 tuple((self.exchange, sub) for sub in subaccounts), price, mode)
+            trades = expand_basket(basket, reference_price=latest[0] if latest else None)
+        except OrderValidationError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return
+
+        get_io_executor().watch(
+            self.executor.submit_basket(trades),
+            on_result=lambda result: self.on_basket_completed(basket, result),
+            on_error=lambda e: self.on_order_failed(basket, e),
+        )
+        if clicked is not None:
+            get_metrics().record("click_to_submit_seconds", time.perf_counter() - clicked, exchange=self.exchange)
+        self.status_label.setText(
+            f"⏳ {side}ing {pair} on {len(trades)} {self.exchange} subaccounts ({mode})..."
+        )
+
+    def on_order_failed(self, trade, error):
+        """trade is the TradeRequest, or the BasketOrder when a whole basket failed."""
+        if self.is_built:
+            self.status_label.setText(f"❌ {trade.side} {trade.amount} {trade.symbol} failed: {error}")
+
+    def on_basket_completed(self, basket, result):
+        if not self.is_built:
+            return
+        if result.errors or result.count("rejected"):
+            icon = "⚠️" if result.filled_amount else "❌"
+        else:
+            icon = "✅"
+        text = f"{icon} {basket.side} {basket.symbol} on {result.legs} subaccounts: {result.summary()}"
+        if result.errors:
+            trade, error = result.errors[0]
+            text += f" — {trade.subaccount}: {error}"
+        self.status_label.setText(text)
+
+    def on_order_completed(self, fill):
+        if not self.is_built:
+            return  # Released while the order was in flight
+        icon = FILL_STATUS_ICONS.get(fill.status, "ℹ️")
+        filled = f" {fill.amount:g} @ {fill.price:,.8g}" if fill.amount else ""
+        self.status_label.setText(
+            f"{icon} {fill.side} {fill.symbol} {fill.status.replace('_', ' ')}{filled} "
+            f"on {fill.exchange} ({fill.subaccount})."
         )
@@ -1,12 +1,22 @@
 from PyQt6.QtWidgets import QMainWindow, QApplication, QTabWidget
+from PyQt6.QtCore import QEvent, QTimer
 from ui.dashboard import DashboardTab
-from ui.settings import SettingsTab
 from ui.exchange_tabs import ExchangeTab
+from core.trade_executor import TradeExecutor
+from core.price_feed import PriceFeed
+from core.data_store import load_enabled_exchanges
+from core.log_config import setup_logging, shutdown_logging
+from core.metrics import start_exporters_from_env
+from core.startup_profile import get_startup_profiler
+from ui.update_scheduler import get_update_scheduler
+from ui.workers import get_io_executor, start_watchdog_if_debug
 import sys
-import json
-import os
 
-CONFIG_PATH = "config/user_prefs.json"
+# Exchange tabs keep their widgets while they are among the most recently used;
+# older ones are released and rebuilt on their next activation.
+MAX_LIVE_EXCHANGE_TABS = 4
+# How long to wait at exit for background jobs (closing the price feed's sockets among them)
+SHUTDOWN_TIMEOUT = 6.0
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -16,41 +26,130 @@ class MainWindow(QMainWindow):
 
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
+        self.recent_exchange_tabs = []  # most recently activated last
 
-        self.dashboard_tab = DashboardTab()
-        self.exchange_tabs = {}  # FIX: Must be defined before settings
-        self.settings = SettingsTab(on_exchanges_updated=self.refresh_exchanges)
-        self.refresh_exchanges()
+        profiler = get_startup_profiler()
+        # Only the tab on screen receives streamed updates; the others catch up when shown
+        self.scheduler = get_update_scheduler()
+        self.visible_tab = None
+        self.trade_executor = TradeExecutor()
+        self.price_feed = PriceFeed()
+        with profiler.phase("DashboardTab()"):
+            self.dashboard_tab = DashboardTab()
+        self.exchange_tabs = {}  # name -> ExchangeTab, filled by refresh_exchanges()
+        with profiler.phase("exchange tab placeholders"):
+            self.refresh_exchanges()
 
         self.tabs.insertTab(0, self.dashboard_tab, "Dashboard")
-        self.tabs.insertTab(999, self.settings, "Settings")  # Always last
         self.tabs.setCurrentIndex(0)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.set_visible_tab(self.tabs.currentWidget())
+
+        # Settings, diagnostics and the price feed are set up once the window is on screen
+        self.settings = None
+        self.diagnostics = None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.settings is None:
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Second startup stage, run from the event loop after the window has been shown."""
+        if self.settings is not None:
+            return
+        profiler = get_startup_profiler()
+        profiler.mark("window interactive")
+        with profiler.phase("price feed start"):
+            self.price_feed.start()
+        with profiler.phase("secondary tabs"):
+            from ui.diagnostics import DiagnosticsTab
+            from ui.settings import SettingsTab
+            self.diagnostics = DiagnosticsTab()
+            self.settings = SettingsTab(on_exchanges_updated=self.refresh_exchanges)
+            self.tabs.addTab(self.diagnostics, "Diagnostics")
+            self.tabs.addTab(self.settings, "Settings")  # Always last
+        profiler.finish()
 
     def refresh_exchanges(self):
-        for name, tab in self.exchange_tabs.items():
+        """Add and remove exchange tabs to match the enabled set; surviving tabs keep their state."""
+        enabled = load_enabled_exchanges()
+
+        for name in [name for name in self.exchange_tabs if name not in enabled]:
+            tab = self.exchange_tabs.pop(name)
             index = self.tabs.indexOf(tab)
             if index != -1:
                 self.tabs.removeTab(index)
-        self.exchange_tabs.clear()
-
-        if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, 'r') as f:
-                config = json.load(f)
-                enabled_exchanges = config.get("enabled_exchanges", [])
-        else:
-            enabled_exchanges = []
+            if tab in self.recent_exchange_tabs:
+                self.recent_exchange_tabs.remove(tab)
+            tab.release()
+            tab.deleteLater()
 
-        for ex in enabled_exchanges:
-            tab = ExchangeTab(ex)
+        # Exchange tabs sit after the dashboard in reverse order of the enabled list
+        order = list(reversed(enabled))
+        for position, ex in enumerate(order):
+            tab = self.exchange_tabs.get(ex)
+            if tab is not None:
+                tab.refresh_subaccounts()
+                continue
+            tab = ExchangeTab(ex, executor=self.trade_executor, price_feed=self.price_feed)
+            anchor = self.exchange_tabs.get(order[position - 1]) if position else None
+            if anchor is not None:
+                index = self.tabs.indexOf(anchor) + 1
+            else:
+                index = self.tabs.indexOf(self.dashboard_tab) + 1
             self.exchange_tabs[ex] = tab
-            self.tabs.insertTab(1, tab, ex)
+            self.tabs.insertTab(index, tab, ex)
+
+    def set_visible_tab(self, tab):
+        if self.visible_tab is not None and self.visible_tab is not tab:
+            self.scheduler.pause(self.visible_tab)
+        self.visible_tab = tab
+        if tab is not None and not self.isMinimized():
+            self.scheduler.resume(tab)
+
+    def on_tab_changed(self, index):
+        tab = self.tabs.widget(index)
+        self.set_visible_tab(tab)
+        if not isinstance(tab, ExchangeTab):
+            return
+        if tab in self.recent_exchange_tabs:
+            self.recent_exchange_tabs.remove(tab)
+        self.recent_exchange_tabs.append(tab)
+        while len(self.recent_exchange_tabs) > MAX_LIVE_EXCHANGE_TABS:
+            self.recent_exchange_tabs.pop(0).release()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.WindowStateChange and self.visible_tab is not None:
+            self.scheduler.set_visible(self.visible_tab, not self.isMinimized())
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        # Closing sockets can take a moment; the window goes away meanwhile and run_app()
+        # waits for it after the event loop ends
+        get_io_executor().submit(self.price_feed.stop)
+        super().closeEvent(event)
 
 # ✅ Standalone run function
 def run_app():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    setup_logging()
+    profiler = get_startup_profiler()
+    with profiler.phase("QApplication()"):
+        app = QApplication(sys.argv)
+    watchdog = start_watchdog_if_debug()
+    stop_exporters = start_exporters_from_env()
+    with profiler.phase("MainWindow()"):
+        window = MainWindow()
+    with profiler.phase("window.show()"):
+        window.show()
+    exit_code = app.exec()
+    if not get_io_executor().wait(SHUTDOWN_TIMEOUT):
+        print(f"[MainWindow] Background jobs still running after {SHUTDOWN_TIMEOUT:g}s; exiting anyway")
+    if watchdog is not None:
+        watchdog.stop()
+    stop_exporters()
+    shutdown_logging()
+    sys.exit(exit_code)
 
 # ✅ Entry point
 if __name__ == "__main__":
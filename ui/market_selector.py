@@ -0,0 +1,63 @@
+# market_selector.py
+from PyQt6.QtWidgets import QComboBox, QCompleter
+from PyQt6.QtCore import Qt, QStringListModel, pyqtSignal
+
+from core.market_catalog import get_market_catalog
+from ui.workers import get_io_executor
+
+
+class MarketSelector(QComboBox):
+    """
+    Editable trading-pair picker backed by the market catalog.
+    Typing narrows a completer popup through the catalog's search index instead of
+    scanning the combo's items, and market_selected only fires for real symbols.
+    """
+
+    market_selected = pyqtSignal(str)
+
+    def __init__(self, exchange, catalog=None, parent=None):
+        super().__init__(parent)
+        self.exchange = exchange
+        self.catalog = catalog or get_market_catalog()
+
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.setMaxVisibleItems(20)
+        self.view().setUniformItemSizes(True)
+        self.symbol_model = QStringListModel(self)
+        self.setModel(self.symbol_model)
+
+        self.matches = QStringListModel(self)
+        completer = QCompleter(self.matches, self)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        # Results are already filtered by the catalog; show them as they are
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.activated.connect(self.setCurrentText)
+        self.setCompleter(completer)
+
+        self.lineEdit().textEdited.connect(self.update_matches)
+        self.currentTextChanged.connect(self.on_text_changed)
+        self.load_symbols()
+
+        if self.catalog.needs_refresh(exchange):
+            get_io_executor().watch(self.catalog.refresh_async(exchange), on_result=lambda _: self.load_symbols())
+
+    def load_symbols(self):
+        current = self.currentText()
+        self.symbols = set(self.catalog.symbols(self.exchange))
+        self.blockSignals(True)
+        self.symbol_model.setStringList(sorted(self.symbols))
+        if current:
+            self.setCurrentText(current)
+        else:
+            self.setCurrentIndex(0)
+        self.blockSignals(False)
+
+    def update_matches(self, text):
+        self.matches.setStringList(self.catalog.search(self.exchange, text))
+        if text:
+            self.completer().complete()
+
+    def on_text_changed(self, text):
+        if text in self.symbols:
+            self.market_selected.emit(text)
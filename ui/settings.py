@@ -4,15 +4,11 @@ from PyQt6.QtWidgets import (
     QDialogButtonBox, QGroupBox, QToolButton, QSizePolicy, QFrame, QCheckBox
 )
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
-import json
-import os
 
-CONFIG_PATH = "config/user_prefs.json"
-API_KEYS_PATH = "config/api_keys.json"
-SUPPORTED_EXCHANGES = [
-    "Bybit", "Kraken", "Binance", "KuCoin", "Coinbase", "MEXC",
-    "Bitget", "Crypto.com", "Hyperliquid"
-]
+from core import api_manager
+from core.data_store import load_api_keys, load_user_prefs, save_user_prefs
+from core.exchanges import SUPPORTED_EXCHANGES
+
 
 class ExchangeSelectionDialog(QDialog):
     def __init__(self, selected_exchanges):
@@ -51,7 +47,7 @@ class CollapsibleBox(QWidget):
         self.toggle_button.setCheckable(True)
         self.toggle_button.setChecked(True)
         self.toggle_button.setArrowType(Qt.ArrowType.DownArrow)
-        self.toggle_button.setToolButtonStyle(QToolButton.ToolButtonStyle.ToolButtonTextBesideIcon)
+        self.toggle_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
         self.toggle_button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.toggle_button.clicked.connect(self.toggle)
 
@@ -194,11 +190,8 @@ class SettingsTab(QWidget):
             if not new_sub or not key or not secret:
                 return
 
-            if new_sub != subaccount:
-                self.api_data[exchange].pop(subaccount, None)
-            self.api_data[exchange][new_sub] = {"api_key": key, "api_secret": secret}
-            with open(API_KEYS_PATH, 'w') as f:
-                json.dump(self.api_data, f, indent=2)
+            # self.api_data is the store's live dict: change it through api_manager, under the store lock
+            api_manager.update_api_credentials(exchange, new_sub, key, secret, rename_from=subaccount)
 
             if "subaccount_settings" not in self.user_prefs:
                 self.user_prefs["subaccount_settings"] = {}
@@ -208,8 +201,7 @@ class SettingsTab(QWidget):
                 self.user_prefs["subaccount_settings"][exchange][new_sub] = {
                     "last_pair": "BTC/USDT"
                 }
-            with open(CONFIG_PATH, 'w') as f:
-                json.dump(self.user_prefs, f, indent=2)
+            save_user_prefs(self.user_prefs)
 
             self.active_edit = None
             self.set_controls_enabled(True)
@@ -232,9 +224,7 @@ class SettingsTab(QWidget):
             )
             if confirm == QMessageBox.StandardButton.Yes:
                 if exchange in self.api_data and subaccount in self.api_data[exchange]:
-                    del self.api_data[exchange][subaccount]
-                    with open(API_KEYS_PATH, 'w') as f:
-                        json.dump(self.api_data, f, indent=2)
+                    api_manager.delete_subaccount(exchange, subaccount)
                     self.active_edit = None
                     self.set_controls_enabled(True)
                     self.render_exchange_sections()
@@ -275,30 +265,18 @@ class SettingsTab(QWidget):
         if dialog.exec():
             selected = dialog.get_selected()
             self.selected_exchanges = selected
-            os.makedirs("config", exist_ok=True)
-            with open(CONFIG_PATH, 'w') as f:
-                json.dump({"enabled_exchanges": selected}, f, indent=2)
+            self.user_prefs["enabled_exchanges"] = selected
+            save_user_prefs(self.user_prefs)
             self.render_exchange_sections()
 
     def add_subaccount(self, exchange):
         if self.active_edit is not None:
             return
-        subaccount = f"Sub{len(self.api_data.get(exchange, {})) + 1}"
-        if exchange not in self.api_data:
-            self.api_data[exchange] = {}
-        self.api_data[exchange][subaccount] = {"api_key": "", "api_secret": ""}
-        with open(API_KEYS_PATH, 'w') as f:
-            json.dump(self.api_data, f, indent=2)
+        api_manager.add_subaccount(exchange)
         self.render_exchange_sections()
 
     def load_config(self):
-        if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, 'r') as f:
-                return json.load(f)
-        return {}
+        return load_user_prefs()
 
     def load_api_keys(self):
-        if os.path.exists(API_KEYS_PATH):
-            with open(API_KEYS_PATH, 'r') as f:
-                return json.load(f)
-        return {}
+        return load_api_keys()
@@ -5,6 +5,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from core.order_validation import OrderValidationError, build_trade_request, get_rule_cache
+from ui.market_selector import MarketSelector
+
 class TradeTab(QWidget):
     def __init__(self, exchange_name):
         super().__init__()
@@ -12,8 +15,7 @@ class TradeTab(QWidget):
         self.setLayout(QVBoxLayout())
 
         # Market Selector
-        self.market_selector = QComboBox()
-        self.market_selector.addItems(["BTC/USDT", "ETH/USDT", "SOL/USDT"])
+        self.market_selector = MarketSelector(self.exchange_name)
         self.layout().addWidget(QLabel("Select Pair:"))
         self.layout().addWidget(self.market_selector)
 
@@ -53,16 +55,16 @@ class TradeTab(QWidget):
     def submit_order(self, side):
         pair = self.market_selector.currentText()
         order_type = self.order_type.currentText()
-        price = self.price_input.text().strip()
-        amount = self.amount_input.text().strip()
-
-        if not amount:
-            QMessageBox.warning(self, "Missing Input", "Please enter amount.")
-            return
 
-        if order_type == "Limit" and not price:
-            QMessageBox.warning(self, "Missing Input", "Please enter price for Limit order.")
+        try:
+            trade = build_trade_request(
+                self.exchange_name, "", pair, side, order_type,
+                self.amount_input.text(), self.price_input.text(),
+                rules=get_rule_cache().get(self.exchange_name, pair),
+            )
+        except OrderValidationError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
             return
 
         QMessageBox.information(self, f"{side} Order",
-                                f"{side} {amount} {pair} as a {order_type} order on {self.exchange_name}.")
+                                f"{side} {trade.amount:g} {pair} as a {order_type} order on {self.exchange_name}.")
@@ -0,0 +1,160 @@
+# update_scheduler.py
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from core.metrics import get_metrics
+
+DEFAULT_RATE = 20  # flushes per second
+
+
+class Subscription:
+    """One callback's interest in a topic; holds the latest value per key until the next flush."""
+
+    __slots__ = ("topic", "callback", "owner", "paused", "pending")
+
+    def __init__(self, topic, callback, owner):
+        self.topic = topic
+        self.callback = callback
+        self.owner = owner
+        self.paused = False
+        self.pending = {}  # key -> latest value
+
+
+class UpdateScheduler(QObject):
+    """
+    Coalesces streaming data on its way to widgets.
+    Producers on any thread call post(topic, key, value); each subscription of the topic keeps
+    only the latest value per key. A single-shot QTimer then flushes everything pending at most
+    `rate` times a second, calling callback({key: value}) on the GUI thread once per subscription,
+    so a burst of ticks costs one repaint. Nothing runs while no updates arrive.
+    Subscriptions are paused per owner (e.g. a tab that isn't showing): they keep collecting
+    the latest values without calling back, and catch up on the first flush after resume().
+    """
+
+    _wake = pyqtSignal()
+
+    def __init__(self, rate=DEFAULT_RATE, parent=None):
+        super().__init__(parent)
+        self.interval = 1.0 / rate
+        self._topics = {}  # topic -> [Subscription]
+        self._dirty = {}  # Subscriptions with pending values to deliver (insertion-ordered set)
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._scheduled = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self._schedule)  # Queued when posted from another thread
+        self._frame_time = get_metrics().histogram("ui_flush_seconds", view="scheduler")
+
+    def subscribe(self, topic, callback, owner=None):
+        subscription = Subscription(topic, callback, owner)
+        with self._lock:
+            self._topics.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._topics.get(subscription.topic, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+                if not subscriptions:
+                    del self._topics[subscription.topic]
+            self._dirty.pop(subscription, None)
+            subscription.pending.clear()
+
+    def remove_owner(self, owner):
+        for subscription in self._owned(owner):
+            self.unsubscribe(subscription)
+
+    def post(self, topic, key, value):
+        """Offer a new value; thread-safe and cheap, dropped at once if nobody subscribes to the topic."""
+        with self._lock:
+            subscriptions = self._topics.get(topic)
+            if not subscriptions:
+                return
+            wake = False
+            for subscription in subscriptions:
+                subscription.pending[key] = value
+                if not subscription.paused:
+                    self._dirty[subscription] = None
+                    wake = True
+            if not wake or self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def clear(self, subscription):
+        """Drop values not yet delivered (e.g. superseded by a full reload)."""
+        with self._lock:
+            subscription.pending.clear()
+            self._dirty.pop(subscription, None)
+
+    def pause(self, owner):
+        with self._lock:
+            for subscription in self._owned_locked(owner):
+                subscription.paused = True
+                self._dirty.pop(subscription, None)
+
+    def resume(self, owner):
+        with self._lock:
+            woken = False
+            for subscription in self._owned_locked(owner):
+                subscription.paused = False
+                if subscription.pending:
+                    self._dirty[subscription] = None
+                    woken = True
+            if not woken or self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule()
+
+    def set_visible(self, owner, visible):
+        if visible:
+            self.resume(owner)
+        else:
+            self.pause(owner)
+
+    def flush(self):
+        """Deliver everything pending now (GUI thread only)."""
+        with self._lock:
+            batches = []
+            for subscription in self._dirty:
+                batches.append((subscription, subscription.pending))
+                subscription.pending = {}
+            self._dirty.clear()
+            self._scheduled = False
+        self._last_flush = start = time.monotonic()
+        for subscription, updates in batches:
+            try:
+                subscription.callback(updates)
+            except Exception as e:
+                print(f"[UpdateScheduler] Subscriber for {subscription.topic!r} failed: {e}")
+        if batches:
+            self._frame_time.record(time.monotonic() - start)
+
+    def _schedule(self):
+        if self._timer.isActive():
+            return
+        wait = self._last_flush + self.interval - time.monotonic()
+        self._timer.start(max(0, int(wait * 1000)))
+
+    def _owned(self, owner):
+        with self._lock:
+            return self._owned_locked(owner)
+
+    def _owned_locked(self, owner):
+        return [s for subscriptions in self._topics.values() for s in subscriptions if s.owner is owner]
+
+
+_scheduler = None
+
+
+def get_update_scheduler():
+    """Return the process-wide UpdateScheduler (create it on the GUI thread)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = UpdateScheduler()
+    return _scheduler
@@ -0,0 +1,147 @@
+# workers.py
+import os
+import sys
+import threading
+import time
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+class _JobSignals(QObject):
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class _Job(QRunnable):
+    def __init__(self, fn, args, kwargs, signals):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+            return
+        self.signals.succeeded.emit(result)
+
+
+class IoExecutor:
+    """
+    Shared background pool for disk and network work started from the UI.
+    Results come back on the GUI thread through queued signals, so callbacks
+    may touch widgets directly.
+    """
+
+    def __init__(self, max_threads=4):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._live = set()  # Keeps signal objects alive until their job reports back
+
+    def submit(self, fn, *args, on_result=None, on_error=None, **kwargs):
+        """Run fn(*args, **kwargs) on the pool; call on_result(result) or on_error(exc) on the GUI thread."""
+        signals = self._signals(on_result, on_error)
+        self.pool.start(_Job(fn, args, kwargs, signals))
+
+    def wait(self, timeout):
+        """Block until every submitted job has finished, or timeout seconds; returns True if they all did."""
+        return self.pool.waitForDone(int(timeout * 1000))
+
+    def watch(self, future, on_result=None, on_error=None):
+        """Deliver a concurrent.futures.Future's outcome to the GUI thread."""
+        signals = self._signals(on_result, on_error)
+
+        def done(f):
+            try:
+                result = f.result()
+            except Exception as e:
+                signals.failed.emit(e)
+                return
+            signals.succeeded.emit(result)
+
+        future.add_done_callback(done)
+
+    def _signals(self, on_result, on_error):
+        # Created on the calling (GUI) thread, so emissions from workers are queued back to it.
+        signals = _JobSignals()
+        if on_result is not None:
+            signals.succeeded.connect(on_result)
+        signals.failed.connect(on_error or self._report_error)
+        signals.succeeded.connect(lambda _: self._live.discard(signals))
+        signals.failed.connect(lambda _: self._live.discard(signals))
+        self._live.add(signals)
+        return signals
+
+    @staticmethod
+    def _report_error(error):
+        print(f"[IoExecutor] Background job failed: {error}")
+
+
+_io_executor = None
+
+
+def get_io_executor():
+    """Return the process-wide IoExecutor."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = IoExecutor()
+    return _io_executor
+
+
+class GuiWatchdog:
+    """
+    Debug aid that reports when the GUI thread stops processing events for longer than threshold_ms.
+    A QTimer on the GUI thread records heartbeats; a monitor thread prints the GUI thread's
+    stack once per stall so the blocking call can be found.
+    """
+
+    def __init__(self, threshold_ms=100, heartbeat_ms=20):
+        self.threshold = threshold_ms / 1000
+        self.last_beat = None  # Armed by the first heartbeat, once the event loop is running
+        self.gui_thread_id = threading.get_ident()
+        self.timer = QTimer()
+        self.timer.setInterval(heartbeat_ms)
+        self.timer.timeout.connect(self.beat)
+        self._running = False
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+    def start(self):
+        self._running = True
+        self.timer.start()
+        threading.Thread(target=self._monitor, name="GuiWatchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+        self.timer.stop()
+
+    def _monitor(self):
+        reported = False
+        while self._running:
+            time.sleep(self.threshold / 2)
+            if self.last_beat is None:
+                continue
+            stalled_for = time.monotonic() - self.last_beat
+            if stalled_for < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            frame = sys._current_frames().get(self.gui_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>\n"
+            print(f"[GuiWatchdog] GUI thread blocked for {stalled_for * 1000:.0f} ms:\n{stack}", file=sys.stderr)
+
+
+def start_watchdog_if_debug():
+    """Start a GuiWatchdog when QUICKTRADE_DEBUG is set; QUICKTRADE_WATCHDOG_MS sets the threshold."""
+    if not os.environ.get("QUICKTRADE_DEBUG"):
+        return None
+    watchdog = GuiWatchdog(threshold_ms=int(os.environ.get("QUICKTRADE_WATCHDOG_MS", "100")))
+    watchdog.start()
+    return watchdog